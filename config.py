@@ -26,6 +26,7 @@ ESSENCE_REGEN_BASE_PER_SEC = 0.001
 ESSENCE_REGEN_AURA_MULTIPLIER = 0.003
 NODE_REGEN_MULTIPLIER = 2.0
 MEDITATE_REGEN_MULTIPLIER = 3.0
+VITALS_ENGINE = True  # Run regen/hunger/XP ticks as NumPy array ops when numpy is installed
 
 BASE_CARRY_WEIGHT = 20.0
 CARRY_WEIGHT_MIGHT_MULTIPLIER = 1.5
@@ -37,8 +38,56 @@ STARTING_COINAGE = 125
 
 # --- Input ---
 MAX_INPUT_LENGTH = 512
+SLOW_COMMAND_THRESHOLD_MS = 100.0  # Commands slower than this are written to the slow-command log
+MCCP_ENABLED = True          # Offer MCCP2 (zlib) output compression to telnet clients
+MCCP_COMPRESSION_LEVEL = 6   # zlib level 1-9; see tools/bench_mccp.py for the bytes/CPU trade-off
+
+# Command queue (game/command_queue.py)
+COMMAND_QUEUE_MAX = 20          # Typed-ahead lines held per connection; more are dropped
+COMMAND_RATE_PER_SECOND = 10.0  # Sustained commands per second per connection
+COMMAND_BURST = 20              # Commands a connection may send at once before being throttled
+COMMAND_CONCURRENCY = 64        # Commands running at once across all connections
+
+# --- Connections (game/admission.py) ---
+MAX_PRE_AUTH_SESSIONS = 64      # Connections still logging in at once; more are refused
+CONNECT_RATE_PER_IP = 0.2       # New connections per second per IP, sustained (12/minute)
+CONNECT_BURST_PER_IP = 10       # New connections an IP may open at once
+ADMISSION_TRUSTED_IPS = ("127.0.0.1", "::1")  # Skip the per-IP limit (local load tests; remove if behind a local proxy)
+LOGIN_TIMEOUT_SECONDS = 120     # From connect to a verified password
+IDLE_TIMEOUT_SECONDS = 1800     # Authenticated connections with no input this long are closed
+LINKDEAD_TIMEOUT_SECONDS = 120  # Connections whose pending output hasn't moved this long are dropped
+REAPER_SLOT_SECONDS = 1.0       # Timer wheel resolution
+REAPER_SLOTS = 256              # Timer wheel size; longer deadlines are refiled each revolution
 
 # Item cleanup
 ITEM_DECAY_TIME_SECONDS = 1800
 
-AMBIENT_SCRIPT_CHANCE_PER_TICK = 0.01
\ No newline at end of file
+# Recheck cached carried/container weights against a full recount on every lookup (debug builds)
+WEIGHT_CONSISTENCY_CHECKS = False
+
+AMBIENT_SCRIPT_CHANCE_PER_TICK = 0.01
+
+# Stealth detection (game/perception.py)
+PERCEPTION_CHECK_INTERVAL_SECONDS = 5.0  # Recheck a room this often while it holds hiders and observers
+PERCEPTION_MAX_ROLLS_PER_TICK = 200      # Further due rooms wait for the next tick
+
+# --- Randomness ---
+RNG_SEED = None  # Set an int to make combat/AI/weather/loot rolls reproducible (benchmarks, replays)
+
+# --- Logging ---
+LOG_FILE = "server.log"
+LOG_MAX_BYTES = 10 * 1024 * 1024  # Rotate server.log at 10 MB
+LOG_BACKUP_COUNT = 5              # Keep server.log.1 .. server.log.5
+LOG_QUEUE_SIZE = 10000            # Records buffered for the writer thread before dropping
+# Max INFO/DEBUG records per second for chatty loggers (warnings and errors are never limited)
+LOG_RATE_LIMITS = {
+    "game.perception": 20.0,   # A debug line per mob perception roll while anyone is hidden
+    "game.commands.handler": 50.0,
+}
+
+# --- Diagnostics ---
+DIAGNOSTICS_DIR = "diagnostics"   # Where @profile and @heap reports and @capture files are written
+CAPTURE_ON_STARTUP = False        # Capture anonymized client input from boot (see tools/replay_capture.py)
+METRICS_ENABLED = True            # Serve Prometheus-text metrics on a local HTTP port
+METRICS_HOST = "127.0.0.1"        # Keep this local; put a proxy in front if it must be remote
+METRICS_PORT = 9464
@@ -0,0 +1,75 @@
+# game/ability_catalog.py
+"""
+Lookup indexes over the loaded ability templates.
+Built from world.abilities so command parsing and level-up learning
+don't have to scan every template.
+"""
+import bisect
+import logging
+from typing import Dict, List, Optional, Tuple, Any
+
+log = logging.getLogger(__name__)
+
+# Marks a trie node that completes an ability key.
+_KEY = "\0"
+
+
+class AbilityCatalog:
+    """
+    Prefix tries per ability type plus a per-class index sorted by level_req.
+    """
+    def __init__(self):
+        self._tries: Dict[str, Dict[str, Any]] = {}
+        self._class_levels: Dict[str, List[int]] = {}
+        self._class_keys: Dict[str, List[str]] = {}
+
+    def rebuild(self, abilities: Dict[str, Dict[str, Any]]):
+        """Rebuilds every index from the given internal_name -> template dict."""
+        tries: Dict[str, Dict[str, Any]] = {}
+        by_class: Dict[str, List[Tuple[int, str]]] = {}
+
+        for key, data in abilities.items():
+            ability_type = (data.get("ability_type") or "").upper()
+            node = tries.setdefault(ability_type, {})
+            for ch in key:
+                node = node.setdefault(ch, {})
+            node[_KEY] = key
+
+            level_req = data.get("level_req") or 0
+            for class_name in data.get("class_req") or []:
+                by_class.setdefault(class_name.lower(), []).append((level_req, key))
+
+        self._tries = tries
+        self._class_levels = {}
+        self._class_keys = {}
+        for class_name, entries in by_class.items():
+            entries.sort()
+            self._class_levels[class_name] = [level for level, _ in entries]
+            self._class_keys[class_name] = [key for _, key in entries]
+
+        log.info("Ability catalog built: %d types, %d classes.", len(tries), len(by_class))
+
+    def match_prefix(self, ability_type: str, text: str) -> Optional[str]:
+        """
+        Returns the longest ability key of the given type that text starts with,
+        or None. Cost is bounded by len(text), not the catalog size.
+        """
+        node = self._tries.get(ability_type.upper())
+        found: Optional[str] = None
+        if node is None:
+            return None
+        for ch in text:
+            node = node.get(ch)
+            if node is None:
+                break
+            if _KEY in node:
+                found = node[_KEY]
+        return found
+
+    def learnable_for(self, class_name: str, level: int) -> List[str]:
+        """Returns keys of every ability the class may know at or below the given level."""
+        class_name = class_name.lower()
+        levels = self._class_levels.get(class_name)
+        if not levels:
+            return []
+        return self._class_keys[class_name][:bisect.bisect_right(levels, level)]
@@ -0,0 +1,234 @@
+# game/admission.py
+"""
+Connection admission control and reaping.
+server.handle_connection asks this module before building a
+ConnectionHandler:
+
+  - At most MAX_PRE_AUTH_SESSIONS connections may be logging in (connected,
+    password not yet verified) at once. Further connections are refused
+    rather than queued, so a scanner or reconnect storm cannot pile up
+    handlers, database lookups and Argon2 verifications.
+  - Each remote IP has a token bucket (CONNECT_RATE_PER_IP, burst
+    CONNECT_BURST_PER_IP) of new connections. ADMISSION_TRUSTED_IPS skip it.
+
+Every admitted connection is then watched by a reaper that closes it when:
+
+  - login_timeout: its password hasn't been verified LOGIN_TIMEOUT_SECONDS
+    after it connected;
+  - idle: it has been authenticated but sent no input for IDLE_TIMEOUT_SECONDS;
+  - link_dead: output is waiting to be sent but none of it has reached the
+    client for LINKDEAD_TIMEOUT_SECONDS (the client stopped reading). Peers
+    that vanished without sending anything are found by TCP keepalive, and
+    their handler sees a reset.
+
+The reaper is a hashed timer wheel with one slot per REAPER_SLOT_SECONDS.
+A connection sits in exactly one slot. When that slot comes round, the
+connection's deadlines are checked against its current timestamps, and it
+is reaped or filed again. Input only updates a timestamp, so handling
+input costs nothing here. Each slot step looks only at the connections
+that fall due in it.
+"""
+import asyncio
+import logging
+import math
+import socket
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Set, TYPE_CHECKING
+
+import config
+from .command_queue import TokenBucket
+
+if TYPE_CHECKING:
+    from .handlers.connection import ConnectionHandler
+
+log = logging.getLogger(__name__)
+
+# How often a connection's output progress is sampled for link-dead detection
+LINKDEAD_CHECK_SECONDS = config.LINKDEAD_TIMEOUT_SECONDS / 4
+
+_REFUSAL_MESSAGES = {
+    "busy": "The realm is busy with other logins. Please try again shortly.",
+    "rate_limited": "Too many connections from your address. Please wait a minute and try again.",
+}
+_REAP_MESSAGES = {
+    "login_timeout": "Login timed out. Goodbye.",
+    "idle": "You have been idle too long. Goodbye.",
+}
+
+
+class TimerWheel:
+    """Hashed timer wheel. Delays beyond its horizon land in the last slot and are refiled when it fires."""
+    def __init__(self, slot_seconds: float, slot_count: int):
+        self.slot_seconds = slot_seconds
+        self._slots: List[list] = [[] for _ in range(slot_count)]
+        self._cursor = 0
+        self._count = 0
+
+    def schedule(self, entry, delay: float):
+        ticks = max(1, min(len(self._slots) - 1, math.ceil(delay / self.slot_seconds)))
+        self._slots[(self._cursor + ticks) % len(self._slots)].append(entry)
+        self._count += 1
+
+    def advance(self) -> list:
+        """Moves on one slot and returns the entries filed in it."""
+        self._cursor = (self._cursor + 1) % len(self._slots)
+        due, self._slots[self._cursor] = self._slots[self._cursor], []
+        self._count -= len(due)
+        return due
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class _Watch:
+    """The reaper's record of one connection."""
+    __slots__ = ("handler", "delivered", "stalled_since")
+
+    def __init__(self, handler: 'ConnectionHandler'):
+        self.handler = handler
+        self.delivered = 0
+        self.stalled_since: Optional[float] = None
+
+
+class Admission:
+    def __init__(self):
+        self._pre_auth: Set['ConnectionHandler'] = set()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self.wheel = TimerWheel(config.REAPER_SLOT_SECONDS, config.REAPER_SLOTS)
+        self.refused: Counter = Counter()
+        self.reaped: Counter = Counter()
+
+    @property
+    def pre_auth_sessions(self) -> int:
+        return len(self._pre_auth)
+
+    def check(self, ip: str) -> Optional[str]:
+        """Returns the reason to refuse a new connection from ip, or None to admit it."""
+        if len(self._pre_auth) >= config.MAX_PRE_AUTH_SESSIONS:
+            reason = "busy"
+        elif ip not in config.ADMISSION_TRUSTED_IPS and not self._bucket(ip).take():
+            reason = "rate_limited"
+        else:
+            return None
+        self.refused[reason] += 1
+        return reason
+
+    def _bucket(self, ip: str) -> TokenBucket:
+        bucket = self._buckets.get(ip)
+        if bucket is None:
+            bucket = self._buckets[ip] = TokenBucket(config.CONNECT_RATE_PER_IP, config.CONNECT_BURST_PER_IP)
+        return bucket
+
+    def admit(self, handler: 'ConnectionHandler'):
+        """Counts an admitted connection as logging in and starts watching it."""
+        self._pre_auth.add(handler)
+        self.wheel.schedule(_Watch(handler), min(config.LOGIN_TIMEOUT_SECONDS, LINKDEAD_CHECK_SECONDS))
+
+    def leave_pre_auth(self, handler: 'ConnectionHandler'):
+        """Frees the handler's login slot once it authenticates or disconnects."""
+        self._pre_auth.discard(handler)
+
+    def reap_due(self, now: Optional[float] = None):
+        """Checks the connections filed in the next wheel slot."""
+        now = time.monotonic() if now is None else now
+        for watch in self.wheel.advance():
+            handler = watch.handler
+            if handler.writer.is_closing():
+                continue  # Already on its way out; cleanup will release it
+            if not handler.authenticated:
+                deadline, reason = handler.connected_at + config.LOGIN_TIMEOUT_SECONDS, "login_timeout"
+            else:
+                deadline, reason = handler.last_input_at + config.IDLE_TIMEOUT_SECONDS, "idle"
+            if now >= deadline:
+                self._reap(handler, reason)
+            elif self._is_link_dead(watch, now):
+                self._reap(handler, "link_dead")
+            else:
+                self.wheel.schedule(watch, min(deadline - now, LINKDEAD_CHECK_SECONDS))
+
+    def _is_link_dead(self, watch: _Watch, now: float) -> bool:
+        writer = watch.handler.writer
+        transport = writer.transport
+        buffered = transport.get_write_buffer_size() if transport else 0
+        delivered = writer.wire_bytes - buffered
+        if buffered and delivered == watch.delivered:
+            if watch.stalled_since is None:
+                watch.stalled_since = now
+            elif now - watch.stalled_since >= config.LINKDEAD_TIMEOUT_SECONDS:
+                return True
+        else:
+            watch.stalled_since = None
+        watch.delivered = delivered
+        return False
+
+    def _reap(self, handler: 'ConnectionHandler', reason: str):
+        self.reaped[reason] += 1
+        log.info("Closing connection from %s: %s.", handler.addr, reason)
+        writer = handler.writer
+        if reason == "link_dead":
+            # Nothing more will reach this client; don't wait on its buffer.
+            if writer.transport:
+                writer.transport.abort()
+            return
+        try:
+            writer.write(f"\r\n{_REAP_MESSAGES[reason]}\r\n".encode(config.ENCODING))
+            writer.close()
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        transport = writer.transport
+        if transport and transport.get_write_buffer_size():
+            # close() waits for the buffer to flush; don't let a client that stopped reading hold it open.
+            asyncio.get_running_loop().call_later(LINKDEAD_CHECK_SECONDS, transport.abort)
+
+    def prune_buckets(self):
+        """Forgets IPs whose buckets have refilled, so the table only holds recent connectors."""
+        for ip in [ip for ip, bucket in self._buckets.items() if bucket.is_full()]:
+            del self._buckets[ip]
+
+
+control = Admission()
+
+
+async def refuse(writer: asyncio.StreamWriter, reason: str):
+    """Tells a refused client why and closes the socket."""
+    try:
+        writer.write(f"{_REFUSAL_MESSAGES[reason]}\r\n".encode(config.ENCODING))
+        writer.close()
+        await writer.wait_closed()
+    except (ConnectionResetError, BrokenPipeError):
+        pass
+
+
+def enable_keepalive(writer: asyncio.StreamWriter):
+    """Turns on TCP keepalive so peers that vanish silently are detected by the kernel."""
+    sock = writer.get_extra_info('socket')
+    if sock is None:
+        return
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        # Probe after a quiet LINKDEAD_TIMEOUT_SECONDS, then give up after 4 missed probes (Linux/macOS names)
+        idle = int(config.LINKDEAD_TIMEOUT_SECONDS)
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle)
+        if hasattr(socket, "TCP_KEEPINTVL"):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, max(1, idle // 4))
+        if hasattr(socket, "TCP_KEEPCNT"):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 4)
+    except OSError:
+        log.debug("Could not enable keepalive on %s.", writer.get_extra_info('peername'))
+
+
+async def run_reaper():
+    """Background task: advances the reaper wheel one slot per REAPER_SLOT_SECONDS."""
+    log.info("Connection reaper started.")
+    steps = 0
+    while True:
+        await asyncio.sleep(config.REAPER_SLOT_SECONDS)
+        try:
+            control.reap_due()
+            steps += 1
+            if steps % config.REAPER_SLOTS == 0:
+                control.prune_buckets()
+        except Exception:
+            log.exception("Connection reaper: unexpected error.")
@@ -0,0 +1,64 @@
+# game/broadcast.py
+"""
+Encode-once message fan-out.
+Character.send colorizes and encodes its message for the one client it
+writes to. When the same message goes to a whole room, group or the
+world, fan_out builds an EncodedMessage instead: the text is colorized
+(or stripped, for clients with color off) and encoded once per mode
+actually in use, and every recipient's writer is handed the same bytes
+object.
+"""
+import asyncio
+import re
+from typing import Iterable, Optional, Set, TYPE_CHECKING
+
+import config
+from . import utils
+from .definitions import colors as color_defs
+
+if TYPE_CHECKING:
+    from .character import Character
+
+_COLOR_CODE_RE = re.compile("|".join(re.escape(code) for code in color_defs.COLOR_MAP))
+
+
+def strip_colors(text: str) -> str:
+    """Removes the color codes colorize would have replaced."""
+    return _COLOR_CODE_RE.sub("", text)
+
+
+def encode(message: str, add_newline: bool = True, use_color: bool = True) -> bytes:
+    """Formats a message the way Character.send does and returns the bytes to write."""
+    text = utils.colorize(message) if use_color else strip_colors(message)
+    if add_newline and not text.endswith('\r\n'):
+        text += '\r\n'
+    return text.encode(config.ENCODING)
+
+
+class EncodedMessage:
+    """A message encoded at most once per client color mode."""
+    __slots__ = ("message", "add_newline", "_color", "_plain")
+
+    def __init__(self, message: str, add_newline: bool = True):
+        self.message = message
+        self.add_newline = add_newline
+        self._color: Optional[bytes] = None
+        self._plain: Optional[bytes] = None
+
+    def for_client(self, use_color: bool) -> bytes:
+        if use_color:
+            if self._color is None:
+                self._color = encode(self.message, self.add_newline, True)
+            return self._color
+        if self._plain is None:
+            self._plain = encode(self.message, self.add_newline, False)
+        return self._plain
+
+
+async def fan_out(recipients: Iterable['Character'], message: str, add_newline: bool = True,
+                  exclude: Optional[Set] = None):
+    """Sends one message to many characters, encoding it once per color mode."""
+    encoded = EncodedMessage(message, add_newline)
+    tasks = [char.send_encoded(encoded) for char in recipients if not exclude or char not in exclude]
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,162 @@
+# game/capture.py
+"""
+Anonymized capture of live client input for replay against test builds.
+While a capture is active, ConnectionHandler._read_line hands every line it
+reads to record_line. Each entry carries a per-capture connection number
+(never the address), milliseconds since the capture began and the
+connection state the line arrived in, so tools/replay_capture.py can drive
+a test server with the same interleavings.
+
+Anonymization happens before anything is queued: lines typed before the
+character is in play (account names, passwords, emails, character names)
+are reduced to their length, and the free text of speech commands is
+masked character for character. Writing and gzip compression happen on a
+background thread, off the event loop.
+"""
+import gzip
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+import weakref
+from typing import Optional, Dict, Any, List, TYPE_CHECKING
+
+import config
+
+if TYPE_CHECKING:
+    from .handlers.connection import ConnectionHandler
+
+log = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+# Commands whose arguments are things players said, by CommandSpec name; the first N words are kept.
+# Aliases and abbreviations ("'", "whisp", "/m") resolve to these names through the command table.
+SPEECH_COMMANDS = {"say": 0, "/me": 0, "pose": 0, "whisper": 1}
+_NON_SPACE_RE = re.compile(r"\S")
+_STOP = object()
+
+
+def anonymize(state_name: str, line: str) -> Optional[str]:
+    """Returns the line as it may be stored, or None if it must not be stored at all."""
+    # Imported here: the command modules import this one (for @capture).
+    from .commands import handler
+
+    if state_name != "PLAYING":
+        return None
+    if line.startswith("'"):
+        return "'" + _NON_SPACE_RE.sub("x", line[1:])
+    verb, _, rest = line.partition(" ")
+    spec = handler.find_command(verb.lower())
+    keep_words = SPEECH_COMMANDS.get(spec.name) if spec else None
+    if keep_words is None or not rest:
+        return line
+    words = rest.split(" ", keep_words)
+    spoken = _NON_SPACE_RE.sub("x", words[-1]) if len(words) > keep_words else ""
+    return " ".join([verb, *words[:keep_words], spoken]).rstrip()
+
+
+def check_anonymizer() -> List[str]:
+    """
+    Anonymizes a secret through every verb and abbreviation that reaches a
+    speech command and returns a description of each leak (empty when none).
+    """
+    from .commands import handler
+
+    problems = [f"SPEECH_COMMANDS entry '{name}' is not a command" for name in SPEECH_COMMANDS
+                if not handler.find_command(name) or handler.find_command(name).name != name]
+    secret = "hunter2 is my password"
+    for verb, spec in sorted(handler.COMMAND_TABLE.items()):
+        if spec.name not in SPEECH_COMMANDS:
+            continue
+        kept = " bob" * SPEECH_COMMANDS[spec.name]
+        for line in (f"{verb}{kept} {secret}", f"{verb.upper()}{kept} {secret}"):
+            stored = anonymize("PLAYING", line)
+            if stored is None or "hunter2" in stored or "password" in stored:
+                problems.append(f"{line!r} is stored as {stored!r}")
+    return problems
+
+
+class StreamCapture:
+    """One capture file. Entries are gzip-compressed JSON lines with short keys."""
+    def __init__(self, path: str):
+        self.path = path
+        self.started = time.monotonic()
+        self.count = 0
+        self.connections = 0
+        self._ids: "weakref.WeakKeyDictionary[ConnectionHandler, int]" = weakref.WeakKeyDictionary()
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._write_loop, name="capture-writer", daemon=True)
+        self._queue.put({"type": "header", "version": FORMAT_VERSION,
+                         "started": time.strftime("%Y-%m-%dT%H:%M:%S")})
+        self._thread.start()
+
+    def _write_loop(self):
+        with gzip.open(self.path, "wt", encoding="utf-8") as f:
+            while (entry := self._queue.get()) is not _STOP:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def _conn_id(self, handler: 'ConnectionHandler') -> int:
+        conn_id = self._ids.get(handler)
+        if conn_id is None:
+            self.connections += 1
+            conn_id = self._ids[handler] = self.connections
+            self._queue.put({"c": conn_id, "t": self._elapsed_ms(), "e": "open"})
+        return conn_id
+
+    def _elapsed_ms(self) -> int:
+        return int((time.monotonic() - self.started) * 1000)
+
+    def record_line(self, handler: 'ConnectionHandler', line: str):
+        state_name = handler.state.name
+        entry: Dict[str, Any] = {"c": self._conn_id(handler), "t": self._elapsed_ms(), "s": state_name}
+        stored = anonymize(state_name, line)
+        if stored is None:
+            entry["n"] = len(line)
+        else:
+            entry["l"] = stored
+        self._queue.put(entry)
+        self.count += 1
+
+    def record_close(self, handler: 'ConnectionHandler'):
+        conn_id = self._ids.pop(handler, None)
+        if conn_id is not None:
+            self._queue.put({"c": conn_id, "t": self._elapsed_ms(), "e": "close"})
+
+    def close(self):
+        """Flushes and closes the file. Blocks until the writer thread is done."""
+        self._queue.put(_STOP)
+        self._thread.join()
+
+
+active: Optional[StreamCapture] = None
+
+
+def start_capture(path: Optional[str] = None) -> StreamCapture:
+    global active
+    stop_capture()
+    if path is None:
+        os.makedirs(config.DIAGNOSTICS_DIR, exist_ok=True)
+        path = os.path.join(config.DIAGNOSTICS_DIR, f"capture_{time.strftime('%Y%m%d_%H%M%S')}.jsonl.gz")
+    active = StreamCapture(path)
+    log.info("Capturing client input to %s.", path)
+    return active
+
+
+def stop_capture() -> Optional[StreamCapture]:
+    global active
+    capture, active = active, None
+    if capture:
+        capture.close()
+        log.info("Stopped capture: %d lines from %d connections written to %s.",
+                 capture.count, capture.connections, capture.path)
+    return capture
+
+
+def load_capture(path: str):
+    """Yields capture entries in order, header first."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for raw in f:
+            yield json.loads(raw)
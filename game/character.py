@@ -14,6 +14,10 @@ from .item import Item
 from .definitions import skills as skill_defs, abilities as ability_defs, classes as class_defs, item_defs
 from .definitions import slots as slot_defs
 from . import utils
+from . import command_trace
+from . import broadcast
+from .vitals import EngineField, MirroredField
+from .roundtime import RoundtimeField
 
 if TYPE_CHECKING:
     from .room import Room
@@ -25,6 +29,23 @@ log = logging.getLogger(__name__)
 
 class Character:
     """Represents a character, now aware of unique item instances."""
+
+    # Held in the World's vitals engine while the character is active (see game/vitals.py).
+    _vitals = None
+    _vital_slot: Optional[int] = None
+    hp = EngineField()
+    essence = EngineField()
+    hunger = EngineField()
+    thirst = EngineField()
+    xp_pool = EngineField()
+    xp_total = EngineField()
+    can_advance_notified = EngineField(bool)
+    max_hp = MirroredField()
+    max_essence = MirroredField()
+    status = MirroredField()
+    level = MirroredField()
+    # Seconds left until a deadline on the shared roundtime clock (see game/roundtime.py).
+    roundtime = RoundtimeField()
     
     @property
     def might_mod(self) -> int:
@@ -249,6 +270,9 @@ class Character:
         self.roundtime: float = 0.0
         self.is_fighting: bool = False
         self.is_hidden: bool = False
+        self.carries_light: bool = False  # Cached is_holding_light_source(); see refresh_light()
+        self._carried_weight: float = 0.0  # Cached get_current_weight(); see track_carried()
+        self.use_color: bool = True  # False sends messages with color codes stripped; see the color command
         self.detected_traps: set = set()
         self.known_abilities: Set[str] = set()
 
@@ -300,7 +324,7 @@ class Character:
 
         for item in all_owned_items.values():
             if item.container_id and (container := all_owned_items.get(item.container_id)):
-                container.contents[item.id] = item
+                container.add_content(item)
 
         if equipment_record:
             for slot, item_id in dict(equipment_record).items():
@@ -310,9 +334,13 @@ class Character:
         for item in all_owned_items.values():
             if not item.is_equipped(self) and not item.is_in_container():
                 self._inventory_items[item.id] = item
+        for item in list(self._inventory_items.values()) + list(self._equipped_items.values()):
+            self.track_carried(item)
+        self.refresh_light()
         await self.check_and_learn_new_abilities()
         # --------------------------------------------------------------------------
 
+    @command_trace.timed_send
     async def send(self, message: str, add_newline: bool = True):
         """
         Formats and sends a message to the character's client.
@@ -322,13 +350,19 @@ class Character:
             # Avoid trying to write to a closed stream
             return
 
-        # Apply color codes and ensure proper line endings for MUD clients
-        message_to_send = utils.colorize(message)
-        if add_newline and not message_to_send.endswith('\r\n'):
-            message_to_send += '\r\n'
-        
+        # Apply color codes (or strip them) and ensure proper line endings for MUD clients
+        await self._write(broadcast.encode(message, add_newline, self.use_color))
+
+    @command_trace.timed_send
+    async def send_encoded(self, encoded: 'broadcast.EncodedMessage'):
+        """Sends a message already encoded for many recipients (see game/broadcast.py)."""
+        if self.writer.is_closing():
+            return
+        await self._write(encoded.for_client(self.use_color))
+
+    async def _write(self, data: bytes):
         try:
-            self.writer.write(message_to_send.encode(config.ENCODING))
+            self.writer.write(data)
             await self.writer.drain()
         except (ConnectionResetError, BrokenPipeError) as e:
             # This is expected if the player disconnects abruptly.
@@ -427,13 +461,11 @@ class Character:
         char_class_name = self.world.get_class_name(self.class_id).lower()
         
         new_abilities_learned = False
-        # Use world.abilities which is the pre-loaded dictionary of all ability templates
-        for key, ability in self.world.abilities.items():
+        # The catalog indexes abilities by class and level_req, so only candidates are visited
+        for key in self.world.ability_catalog.learnable_for(char_class_name, self.level):
             # Character learns any ability they meet the level for that they don't already know.
-            if (self.level >= ability['level_req'] and
-                    char_class_name in ability['class_req'] and
-                    key not in self.known_abilities):
-                
+            if key not in self.known_abilities:
+                ability = self.world.abilities[key]
                 self.known_abilities.add(key)
                 await self.send(f"<g>You have learned a new {ability['ability_type'].lower()}: {ability['name']}!<x>")
                 log.info(f"Character {self.name} learned new ability: {ability['name']}")
@@ -460,16 +492,12 @@ class Character:
         if not self.location:
             return False
         
-        # If the room has the LIT flag (permanent lighting), everyone can see
-        if "LIT" in self.location.flags:
-            return True
-        
-        # If the room is not flagged as DARK, anyone can see
-        if "DARK" not in self.location.flags:
+        # LIT rooms, and outdoor rooms by day, need no light (see game/lighting.py)
+        if not self.location.is_dark(self.world):
             return True
         
         # If the room IS dark, check if ANYONE has a light source
-        return self.location.has_light_source()
+        return self.location.light_sources > 0
 
     def update_regen(self, dt: float, is_in_node: bool):
         """Applies HP and essence regeneration using config-driven values."""
@@ -503,6 +531,8 @@ class Character:
         self.location = new_location
         if new_location:
             self.location_id = new_location.dbid
+        if self._vitals is not None:
+            self._vitals.set_in_node(self._vital_slot, bool(new_location and "NODE" in new_location.flags))
 
     def recalculate_max_vitals(self):
         """
@@ -642,13 +672,52 @@ class Character:
         """Checks if the character knows a specific ability by its internal key."""
         return ability_key.lower() in self.known_abilities
     
-    def _get_item_weight_recursively(self, item: Item) -> float:
-        """Helper to calculate the weight of an item and its contents."""
-        total_weight = item.weight
-        if item.contents:
-            for content_item in item.contents.values():
-                total_weight += self._get_item_weight_recursively(content_item)
-        return total_weight
+    def track_carried(self, item: Item):
+        """
+        Adds a top-level item (inventory or equipment) to the cached carried weight.
+        Call when an item comes into the character's possession; moving it between
+        hands, slots and containers the character already carries needs no call.
+        """
+        if item.parent is self:
+            return  # Already counted, e.g. a two-hander filling both hand slots
+        item.parent = self
+        self._carried_weight += item.get_total_weight()
+
+    def untrack_carried(self, item: Item):
+        """Removes a top-level item from the cached carried weight when it leaves the character."""
+        if item.parent is not self:
+            return
+        item.parent = None
+        self._carried_weight -= item.get_total_weight()
+
+    def _adjust_weight(self, delta: float):
+        # Called by Item when the contents of a carried container change.
+        self._carried_weight += delta
+
+    def check_weight_consistency(self) -> bool:
+        """
+        Recomputes carried and container weights from scratch and compares them with
+        the cached values, logging and repairing any difference. Returns True if they
+        matched. Runs on every weight lookup when config.WEIGHT_CONSISTENCY_CHECKS is set.
+        """
+        consistent = True
+        carried = {id(item): item for item in list(self._inventory_items.values()) + list(self._equipped_items.values())}
+        pending = list(carried.values())
+        while pending:
+            item = pending.pop()
+            actual = item.compute_total_weight() - item.weight
+            if abs(item.get_total_contents_weight() - actual) > 1e-6:
+                log.error("Cached contents weight of %s (%s) is %s, expected %s.", item.name, item.id,
+                          item.get_total_contents_weight(), actual)
+                item._contents_weight = actual
+                consistent = False
+            pending.extend(item.contents.values())
+        expected = sum(item.compute_total_weight() for item in carried.values())
+        if abs(self._carried_weight - expected) > 1e-6:
+            log.error("Cached carried weight of %s is %s, expected %s.", self.name, self._carried_weight, expected)
+            self._carried_weight = expected
+            consistent = False
+        return consistent
 
     def hands_are_full(self) -> bool:
         """Checks if the character can pick up or receive another item."""
@@ -667,16 +736,10 @@ class Character:
         return hand_slots_used >= 2
 
     def get_current_weight(self) -> float:
-        """Calculates the total weight of all carried and equipped items."""
-        total_weight = 0.0
-        # Add weight of items in top-level inventory
-        for item in self._inventory_items.values():
-            total_weight += self._get_item_weight_recursively(item)
-        # Add weight of equipped items
-        for item in self._equipped_items.values():
-            total_weight += self._get_item_weight_recursively(item)
-        
-        return round(total_weight, 2)
+        """Returns the total weight of all carried and equipped items, containers' contents included."""
+        if config.WEIGHT_CONSISTENCY_CHECKS:
+            self.check_weight_consistency()
+        return round(self._carried_weight, 2)
 
     def get_stat_bonus_from_effects(self, stat_name: str) -> int:
         """
@@ -702,6 +765,18 @@ class Character:
             return True
         return False
 
+    def refresh_light(self):
+        """
+        Re-checks is_holding_light_source() and updates the room's light count.
+        Call after anything that can light, snuff, take or remove a light source.
+        """
+        carries_light = self.is_holding_light_source()
+        if carries_light == self.carries_light:
+            return
+        self.carries_light = carries_light
+        if self.location and self in self.location.characters:
+            self.location.light_sources += 1 if carries_light else -1
+
     def get_stat_bonus_from_equipment(self, stat_name: str) -> int:
         """
         Calculate the total bonus for a given stat from all equipped items.
@@ -723,12 +798,17 @@ class Character:
         armor_penalty = self.total_av // 5
 
         # Penalty for carying a light source
-        light_penalty = 10 if self.is_holding_light_source() else 0
+        light_penalty = 10 if self.carries_light else 0
 
         final_dc = max(5, base_dc - armor_penalty - light_penalty)
 
         return final_dc
 
+    def __hash__(self) -> int:
+        # Stable across runs (unlike the default id()-based hash), so iterating
+        # room.characters - and the RNG draws made along the way - is reproducible.
+        return self.dbid
+
     def __repr__(self) -> str:
         return f"<Character {self.dbid}: '{self.name}'>"
 
@@ -3,10 +3,10 @@
 Handles all damage calculation and mitigation logic.
 """
 import random
-import math
 from dataclasses import dataclass
 from typing import Union, Dict, Any, Optional
 
+from . import evaluation
 from ..character import Character
 from ..mob import Mob
 from ..item import Item
@@ -20,22 +20,11 @@ class DamageInfo:
     is_crit: bool
     attack_name: str = "an attack" # Add a default value
 
-def _roll_exploding_dice(max_roll: int) -> int:
-    """Rolls a die, exploding on the maximum result up to 10 times."""
-    if max_roll <= 0: return 0
-    total, rolls, max_explosions = 0, 0, 10
-    while rolls < max_explosions:
-        roll = random.randint(1, max_roll)
-        total += roll
-        if roll < max_roll:
-            break
-        rolls += 1
-    return total
-
 def calculate_physical_damage(
     attacker: Union[Character, Mob],
     attack_source: Optional[Union[Item, Dict[str, Any]]],
     is_crit: bool,
+    rng: random.Random,
     ability_mods: Optional[Dict[str, Any]] = None # <-- FIX 1: Add the new argument
 ) -> DamageInfo:
     """Calculates the pre-mitigation damage for a physical attack."""
@@ -59,12 +48,8 @@ def calculate_physical_damage(
     bonus_damage = ability_mods.get("bonus_damage", 0)
     # -------------------------------------------------
 
-    rng_roll_result = random.randint(1, rng_dmg) if rng_dmg > 0 else 0
-    if is_crit:
-        rng_roll_result += _roll_exploding_dice(rng_dmg)
-
     # --- FIX 3: Add the bonus damage to the final calculation ---
-    pre_mitigation_damage = max(0, base_dmg + rng_roll_result + stat_modifier + bonus_damage)
+    pre_mitigation_damage = evaluation.roll_damage(base_dmg, rng_dmg, stat_modifier, is_crit, bonus_damage, rng)
     
     return DamageInfo(
         pre_mitigation_damage=pre_mitigation_damage,
@@ -75,62 +60,22 @@ def calculate_physical_damage(
 
 def mitigate_damage(target: Union[Character, Mob], damage_info: DamageInfo) -> int:
     """Applies mitigation to pre-calculated damage and returns the final amount."""
-    pre_mitigation_damage = damage_info.pre_mitigation_damage
-    
-    # --- NEW MITIGATION LOGIC ---
-    # Base mitigation from PDS is always applied.
-    mit_pds = target.pds
-    post_pds_damage = max(0, pre_mitigation_damage - mit_pds)
-
-    # Determine the best defense: Armor Value (AV) or a less effective Barrier Value (BV).
-    effective_av = target.total_av
-    effective_bv = math.floor(target.barrier_value / 2) # Barriers are half as effective vs. physical.
-
-    # Use the greater of the two values for the final mitigation step.
-    best_defense_value = max(effective_av, effective_bv)
-    post_armor_damage = max(0, post_pds_damage - best_defense_value)
-    # --- END NEW LOGIC ---
-
-    # Apply resistances/vulnerabilities
-    resistance = target.resistances.get(damage_info.damage_type, 0.0)
-    if resistance != 0:
-        multiplier = 1.0 - (resistance / 100.0)
-        final_damage = int(post_armor_damage * multiplier)
-    else:
-        final_damage = post_armor_damage
-        
-    return max(0, final_damage)
+    # PDS always applies; then the better of Armor Value or (half-strength vs. physical) Barrier Value.
+    return evaluation.mitigate_physical(
+        damage_info.pre_mitigation_damage, target.pds, target.total_av, target.barrier_value,
+        target.resistances.get(damage_info.damage_type, 0.0),
+    )
 
 def mitigate_magical_damage(target: Union[Character, Mob], damage_info: DamageInfo) -> int:
     """Applies mitigation to pre-calculated magical damage."""
-    pre_mitigation_damage = damage_info.pre_mitigation_damage
-    
-    # --- NEW MITIGATION LOGIC ---
-    # Base mitigation from SDS is always applied.
-    mit_sds = target.sds
-    post_sds_damage = max(0, pre_mitigation_damage - mit_sds)
-    
-    # Determine the best defense: Barrier Value (BV) or a less effective Armor Value (AV).
-    effective_bv = target.barrier_value
-    effective_av = math.floor(target.total_av / 2) # Armor is half as effective vs. magical.
-
-    # Use the greater of the two values for the final mitigation step.
-    best_defense_value = max(effective_bv, effective_av)
-    post_mitigation_damage = max(0, post_sds_damage - best_defense_value)
-    # --- END NEW LOGIC ---
-
-    # Apply resistances/vulnerabilities
-    resistance = target.resistances.get(damage_info.damage_type, 0.0)
-    # The multiplier for magical resistance might be different; ensure this matches your design.
-    if resistance != 0:
-        multiplier = 1.0 - resistance
-        final_damage = int(post_mitigation_damage * multiplier)
-    else:
-        final_damage = post_mitigation_damage
-        
-    return max(0, final_damage)
+    # SDS always applies; then the better of Barrier Value or (half-strength vs. magic) Armor Value.
+    return evaluation.mitigate_magical(
+        damage_info.pre_mitigation_damage, target.sds, target.barrier_value, target.total_av,
+        target.resistances.get(damage_info.damage_type, 0.0),
+    )
 
-def calculate_magical_damage(caster: Union[Character, Mob], spell_data: Dict[str, Any], is_crit: bool) -> DamageInfo:
+def calculate_magical_damage(caster: Union[Character, Mob], spell_data: Dict[str, Any], is_crit: bool,
+                             rng: random.Random) -> DamageInfo:
     """Calculates the pre-mitigation damage for a magical attack."""
     effect_details = spell_data.get("effect_details", {})
     school = effect_details.get("school", "Arcane")
@@ -140,12 +85,7 @@ def calculate_magical_damage(caster: Union[Character, Mob], spell_data: Dict[str
     dmg_type = effect_details.get("damage_type", "arcane")
     
     stat_power = caster.apr if school == "Arcane" else caster.dpr
-    stat_modifier = math.floor(stat_power / 4) if stat_power <= 0 else max(1, math.floor(stat_power / 4))
-
-    rng_roll_result = random.randint(1, rng_dmg) if rng_dmg > 0 else 0
-    if is_crit:
-        rng_roll_result += _roll_exploding_dice(rng_dmg)
-
-    pre_mitigation_damage = max(0, base_dmg + rng_roll_result + stat_modifier)
+    stat_modifier = evaluation.magical_stat_modifier(stat_power)
+    pre_mitigation_damage = evaluation.roll_damage(base_dmg, rng_dmg, stat_modifier, is_crit, rng=rng)
     
     return DamageInfo(pre_mitigation_damage=pre_mitigation_damage, damage_type=dmg_type, is_crit=is_crit)
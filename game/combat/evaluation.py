@@ -0,0 +1,83 @@
+# game/combat/evaluation.py
+"""
+Pure combat math: hit, damage and mitigation rules with no I/O and no
+dependence on Character/Mob objects. The live resolvers extract ratings from
+entities and call into these; the offline balance simulator calls them (or
+their vectorized equivalents) directly. Every function that rolls dice takes
+an optional rng (anything with randint/random) so results can be seeded.
+"""
+import math
+import random
+from typing import Tuple
+
+CRIT_ROLL = 20
+FUMBLE_ROLL = 1
+MAX_EXPLOSIONS = 10
+
+
+def roll_d20(rng=random) -> int:
+    return rng.randint(1, 20)
+
+
+def physical_hit_outcome(roll: int, hit_modifier: int, attacker_rating: int, target_dv: int) -> Tuple[bool, bool]:
+    """Returns (is_hit, is_crit) for d20 + modifier + MAR/RAR vs DV."""
+    modified_roll = roll + hit_modifier
+    if modified_roll <= FUMBLE_ROLL:
+        return False, False
+    if modified_roll >= CRIT_ROLL:
+        return True, True
+    return (modified_roll + attacker_rating) > target_dv, False
+
+
+def magical_hit_outcome(roll: int, attacker_rating: int, target_dv: int) -> Tuple[bool, bool]:
+    """Returns (is_hit, is_crit) for d20 + APR/DPR vs DV. Natural 20 hits, natural 1 misses."""
+    is_crit = roll == CRIT_ROLL
+    is_hit = is_crit or (roll != FUMBLE_ROLL and (attacker_rating + roll) >= target_dv)
+    return is_hit, is_crit
+
+
+def roll_exploding_dice(max_roll: int, rng=random) -> int:
+    """Rolls a die, exploding on the maximum result up to 10 times."""
+    if max_roll <= 0: return 0
+    total, rolls = 0, 0
+    while rolls < MAX_EXPLOSIONS:
+        roll = rng.randint(1, max_roll)
+        total += roll
+        if roll < max_roll:
+            break
+        rolls += 1
+    return total
+
+
+def roll_damage(base_dmg: int, rng_dmg: int, stat_modifier: int, is_crit: bool,
+                bonus_damage: int = 0, rng=random) -> int:
+    """Pre-mitigation damage: base + d(rng) (+ exploding d(rng) on crit) + modifiers, floored at 0."""
+    rng_roll_result = rng.randint(1, rng_dmg) if rng_dmg > 0 else 0
+    if is_crit:
+        rng_roll_result += roll_exploding_dice(rng_dmg, rng)
+    return max(0, base_dmg + rng_roll_result + stat_modifier + bonus_damage)
+
+
+def magical_stat_modifier(stat_power: int) -> int:
+    """Spell damage bonus from APR/DPR: a quarter of the rating, at least 1 when positive."""
+    return math.floor(stat_power / 4) if stat_power <= 0 else max(1, math.floor(stat_power / 4))
+
+
+def mitigate_physical(pre_mitigation_damage: int, pds: int, av: int, bv: int, resistance_pct: float) -> int:
+    """PDS, then the better of AV or half BV, then percentage resistance."""
+    post_pds_damage = max(0, pre_mitigation_damage - pds)
+    best_defense_value = max(av, math.floor(bv / 2))
+    post_armor_damage = max(0, post_pds_damage - best_defense_value)
+    if resistance_pct != 0:
+        return max(0, int(post_armor_damage * (1.0 - (resistance_pct / 100.0))))
+    return max(0, post_armor_damage)
+
+
+def mitigate_magical(pre_mitigation_damage: int, sds: int, bv: int, av: int, resistance: float) -> int:
+    """SDS, then the better of BV or half AV, then fractional resistance."""
+    post_sds_damage = max(0, pre_mitigation_damage - sds)
+    best_defense_value = max(bv, math.floor(av / 2))
+    post_mitigation_damage = max(0, post_sds_damage - best_defense_value)
+    if resistance != 0:
+        return max(0, int(post_mitigation_damage * (1.0 - resistance)))
+    return max(0, post_mitigation_damage)
@@ -6,6 +6,7 @@ import random
 from dataclasses import dataclass
 from typing import Union
 
+from . import evaluation
 from ..character import Character
 from ..mob import Mob
 
@@ -18,7 +19,8 @@ class HitResult:
     attacker_rating: int
     target_dv: int
 
-def check_physical_hit(attacker: Union[Character, Mob], target: Union[Character, Mob], use_rar: bool = False, hit_modifier: int = 0) -> HitResult:
+def check_physical_hit(attacker: Union[Character, Mob], target: Union[Character, Mob], rng: random.Random,
+                       use_rar: bool = False, hit_modifier: int = 0) -> HitResult:
     """
     Performs a physical hit check (d20 + MAR vs DV).
 
@@ -50,17 +52,8 @@ def check_physical_hit(attacker: Union[Character, Mob], target: Union[Character,
         target_dv = max(0, target_dv - target.total_av)
 
 
-    # target_dv = target.dv
-    roll = random.randint(1, 20)
-    modified_roll = roll + hit_modifier
-
-    if modified_roll <= 1:
-        is_hit, is_crit = False, False  # Critical miss
-    elif modified_roll >= 20:
-        is_hit, is_crit = True, True   # Critical hit
-    else:
-        is_hit = (modified_roll + attacker_rating) > target_dv
-        is_crit = False
+    roll = evaluation.roll_d20(rng)
+    is_hit, is_crit = evaluation.physical_hit_outcome(roll, hit_modifier, attacker_rating, target_dv)
 
     return HitResult(
         is_hit=is_hit,
@@ -70,7 +63,8 @@ def check_physical_hit(attacker: Union[Character, Mob], target: Union[Character,
         target_dv=target_dv
     )
 
-def check_magical_hit(caster: Union[Character, Mob], target: Union[Character, Mob], school: str) -> HitResult:
+def check_magical_hit(caster: Union[Character, Mob], target: Union[Character, Mob], school: str,
+                      rng: random.Random) -> HitResult:
     """
     Performs a magical hit check (d20 + APR/DPR vs DV).
 
@@ -82,12 +76,8 @@ def check_magical_hit(caster: Union[Character, Mob], target: Union[Character, Mo
     """
     attacker_rating = caster.apr if school == "Arcane" else caster.dpr
     target_dv = target.dv
-    roll = random.randint(1, 20)
-
-    is_crit = (roll == 20)
-    is_fumble = (roll == 1)
-
-    is_hit = is_crit or (not is_fumble and (attacker_rating + roll) >= target_dv)
+    roll = evaluation.roll_d20(rng)
+    is_hit, is_crit = evaluation.magical_hit_outcome(roll, attacker_rating, target_dv)
 
     return HitResult(
         is_hit=is_hit,
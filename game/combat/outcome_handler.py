@@ -4,9 +4,9 @@ Handles the consequences of combat actions: applying damage, durability,
 messaging, and processing defeat.
 """
 import json
-import random
 import asyncio
 import math
+import random
 import logging
 import time
 from typing import Union, List, Tuple, Dict, Any, TYPE_CHECKING
@@ -39,19 +39,19 @@ def apply_damage(target: Union[Character, Mob], final_damage: int):
     
     target.hp = max(0.0, target.hp - final_damage)
 
-def _determine_loot(mob_template: Dict[str, Any]) -> Tuple[int, List[int]]:
+def _determine_loot(mob_template: Dict[str, Any], rng: random.Random) -> Tuple[int, List[int]]:
     """Calculates loot from a normalized mob template."""
     dropped_coinage = 0
     dropped_item_ids = []
 
     # Get coinage directly from the template
     if max_coinage := mob_template.get("max_coinage", 0):
-        dropped_coinage = random.randint(0, max_coinage)
+        dropped_coinage = rng.randint(0, max_coinage)
 
     # Roll for each item in the loot table
     if item_list := mob_template.get("loot_table", []):
         for item_rule in item_list:
-            if random.random() < item_rule.get('drop_chance', 0.0):
+            if rng.random() < item_rule.get('drop_chance', 0.0):
                 # For now, we'll just drop one. We can add min/max quantity later.
                 dropped_item_ids.append(item_rule['item_template_id'])
     
@@ -77,7 +77,7 @@ async def handle_durability(attacker: Union[Character, Mob], target: Union[Chara
     """Handles random durability loss for attacker's weapon and target's armor."""
     # Attacker weapon durability
     if isinstance(attacker, Character) and isinstance(attack_source, Item) and attack_source.item_type == "WEAPON":
-        if random.random() < 0.10:  # 10% chance
+        if world.rng.combat.random() < 0.10:  # 10% chance
             attack_source.condition -= 1
             await world.db_manager.update_item_condition(attack_source.id, attack_source.condition)
 
@@ -85,6 +85,8 @@ async def handle_durability(attacker: Union[Character, Mob], target: Union[Chara
                 await attacker.send(f"<R>Your {attack_source.name} shatters into pieces!<x>")
                 if attack_source.wear_location:
                     del attacker._equipped_items[attack_source.wear_location[0]]
+                attacker.untrack_carried(attack_source)
+                attacker.refresh_light()
                 del world._all_item_instances[attack_source.id]
                 await world.db_manager.delete_item_instance(attack_source.id)
             elif attack_source.condition <= 10:
@@ -93,8 +95,8 @@ async def handle_durability(attacker: Union[Character, Mob], target: Union[Chara
     # Target armor durability
     if isinstance(target, Character):
         armor_pieces = [item for item in target._equipped_items.values() if item.item_type == "ARMOR"]
-        if armor_pieces and random.random() < 0.10:  # 10% chance
-            armor_hit = random.choice(armor_pieces)
+        if armor_pieces and world.rng.combat.random() < 0.10:  # 10% chance
+            armor_hit = world.rng.combat.choice(armor_pieces)
             armor_hit.condition -= 1
             await world.db_manager.update_item_condition(armor_hit.id, armor_hit.condition)
 
@@ -102,6 +104,8 @@ async def handle_durability(attacker: Union[Character, Mob], target: Union[Chara
                 await target.send(f"<R>Your {armor_hit.name} is destroyed by the blow!<x>")
                 if armor_hit.wear_location:
                     del target._equipped_items[armor_hit.wear_location[0]]
+                target.untrack_carried(armor_hit)
+                target.refresh_light()
                 del world._all_item_instances[armor_hit.id]
                 await world.db_manager.delete_item_instance(armor_hit.id)
             elif armor_hit.condition <= 10:
@@ -248,12 +252,12 @@ async def handle_defeat(attacker: Union[Character, Mob], target: Union[Character
         mob_template = world.get_mob_template(target.template_id)
         
         if mob_template:
-            dropped_coinage, dropped_item_ids = _determine_loot(mob_template)
+            dropped_coinage, dropped_item_ids = _determine_loot(mob_template, world.rng.loot)
         else:
             dropped_coinage, dropped_item_ids = 0, []
 
         base_xp = 25
-        xp_gain = max(1, target.level * base_xp + random.randint(-base_xp // 2, base_xp // 2))
+        xp_gain = max(1, target.level * base_xp + world.rng.loot.randint(-base_xp // 2, base_xp // 2))
         killer = attacker if isinstance(attacker, Character) else None
 
         # Check if this was a group kill with other members present
@@ -306,15 +310,18 @@ async def handle_defeat(attacker: Union[Character, Mob], target: Union[Character
                 instance_data = await world.db_manager.create_item_instance(
                     template_id=template_id,
                     room_id=target_loc.dbid,
-                    instance_stats=initial_stats if initial_stats else None
+                    instance_stats=initial_stats if initial_stats else None,
+                    rng=world.rng.loot
                 )
                 
                 if instance_data:
                     item_obj = Item(instance_data, template)
 
                     # 3. Add the new item to the world's in-memory state (your existing method)
+                    item_obj.room = target_loc
                     world._all_item_instances[item_obj.id] = item_obj
                     target_loc.item_instance_ids.append(item_obj.id)
+                    world.decay_index.track(item_obj)
                     dropped_item_names.append(template['name'])
             
             if dropped_item_names:
@@ -0,0 +1,163 @@
+# game/command_queue.py
+"""
+Per-connection command queues.
+Lines a player types are queued rather than run as they arrive. The
+connection's worker runs them one at a time, in order:
+
+  - A command that roundtime applies to waits (typeahead) until the
+    character's roundtime runs out, instead of being rejected.
+    World.update_roundtimes wakes the worker when the deadline passes.
+    Lines exempt from roundtime (blank lines, which only redraw the
+    prompt) skip ahead of a waiting command rather than queue behind it.
+  - Each connection has a token bucket (COMMAND_RATE_PER_SECOND, burst
+    COMMAND_BURST). A client typing faster than that is throttled, and once
+    COMMAND_QUEUE_MAX lines are waiting, further lines are dropped.
+  - Every command takes one of its world's COMMAND_CONCURRENCY slots
+    (World.command_scheduler) while it runs.
+    Waiting workers get slots first come, first served, and a worker
+    rejoins the back of the line after each command. Throughput is
+    therefore shared round-robin across players, and a spammer gets one
+    turn in each round like everyone else.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, TYPE_CHECKING
+
+import config
+
+if TYPE_CHECKING:
+    from .character import Character
+
+log = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Allows rate events per second on average, with bursts of up to burst."""
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self) -> bool:
+        """Takes a token if one is available."""
+        self._refill(time.monotonic())
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+    def wait_time(self) -> float:
+        """Seconds until a token will be available."""
+        self._refill(time.monotonic())
+        return max(0.0, (1.0 - self.tokens) / self.rate)
+
+    def is_full(self) -> bool:
+        """True once the bucket has refilled completely (nothing to remember about this user)."""
+        self._refill(time.monotonic())
+        return self.tokens >= self.burst
+
+
+class CommandScheduler:
+    """One world's command slots and the workers waiting out a character's roundtime."""
+    def __init__(self):
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.roundtime_waiters: Dict['Character', asyncio.Future] = {}
+
+    def slots(self) -> asyncio.Semaphore:
+        """FIFO admission for running commands; created on first use so it binds to the running loop."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(config.COMMAND_CONCURRENCY)
+        return self._semaphore
+
+    def wake(self, character: 'Character'):
+        """Called when a character's roundtime expires; resumes its queued commands."""
+        waiter = self.roundtime_waiters.pop(character, None)
+        if waiter and not waiter.done():
+            waiter.set_result(None)
+
+
+class CommandQueue:
+    """Bounded queue of one connection's typed-ahead lines."""
+    def __init__(self, character: 'Character', scheduler: CommandScheduler):
+        self.character = character
+        self.scheduler = scheduler
+        self.bucket = TokenBucket(config.COMMAND_RATE_PER_SECOND, config.COMMAND_BURST)
+        self._lines: Deque[str] = deque()
+        self._wakeup = asyncio.Event()
+        self._closed = False
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def push(self, line: str) -> bool:
+        """Queues a line. Returns False if the queue was full and the line was dropped."""
+        if len(self._lines) >= config.COMMAND_QUEUE_MAX:
+            self.dropped += 1
+            return False
+        self._lines.append(line)
+        self._wakeup.set()
+        return True
+
+    def close(self):
+        """Stops the worker once the command it is running (if any) finishes."""
+        self._closed = True
+        self._lines.clear()
+        self._wakeup.set()
+        self.scheduler.wake(self.character)
+
+    async def next_command(self, roundtime_exempt) -> Optional[str]:
+        """
+        Waits until a line may run, removes it and returns it, or None once closed.
+        That is the head line, unless roundtime holds it back; then it is the
+        first line roundtime_exempt(line) allows to run during roundtime.
+        """
+        while True:
+            while not self._lines:
+                if self._closed:
+                    return None
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            if self._closed:
+                return None
+
+            line = self._lines[0]
+            if self.character.roundtime > 0 and not roundtime_exempt(line):
+                line = next((queued for queued in self._lines if roundtime_exempt(queued)), None)
+                if line is None:
+                    await self._wait_for_roundtime()
+                    continue
+
+            delay = self.bucket.wait_time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            self.bucket.take()
+            # Any earlier line equal to this one would have been picked instead
+            self._lines.remove(line)
+            return line
+
+    async def _wait_for_roundtime(self):
+        """Waits for roundtime to expire, or for a new line that might be exempt from it."""
+        loop = asyncio.get_running_loop()
+        waiters = self.scheduler.roundtime_waiters
+        waiter = waiters.get(self.character)
+        if waiter is None or waiter.done():
+            waiter = waiters[self.character] = loop.create_future()
+        self._wakeup.clear()
+        pushed = asyncio.ensure_future(self._wakeup.wait())
+        try:
+            # The timeout is only a backstop in case roundtime is cleared without expiring.
+            await asyncio.wait((waiter, pushed), timeout=self.character.roundtime + config.TICKER_INTERVAL_SECONDS,
+                               return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            pushed.cancel()
+            if waiters.get(self.character) is waiter and waiter.done():
+                waiters.pop(self.character, None)
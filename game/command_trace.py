@@ -0,0 +1,197 @@
+# game/command_trace.py
+"""
+Per-command latency tracing.
+process_command opens a CommandTrace for each command; DatabaseManager calls
+and Character.send add their await time to it through a context variable, so
+the total can be split into DB, send and CPU time. Calls a command overlaps
+(e.g. under asyncio.gather) count the wall time while any of them is in
+flight, so neither share can exceed the command's total. Results feed
+per-verb histograms and a structured slow-command log.
+"""
+import bisect
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import time
+from typing import Dict, List, Optional
+
+import config
+
+log = logging.getLogger(__name__)
+slow_log = logging.getLogger("game.slow_commands")
+
+# Upper bounds of the latency histogram buckets, in milliseconds. The last bucket is open-ended.
+BUCKET_BOUNDS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class BusyTime:
+    """Calls of one kind and the wall time during which at least one was in flight."""
+    __slots__ = ("calls", "_seconds", "_in_flight", "_since")
+
+    def __init__(self):
+        self.calls = 0
+        self._seconds = 0.0
+        self._in_flight = 0
+        self._since = 0.0
+
+    def start(self):
+        if not self._in_flight:
+            self._since = time.perf_counter()
+        self._in_flight += 1
+
+    def stop(self):
+        self.calls += 1
+        self._in_flight -= 1
+        if not self._in_flight:
+            self._seconds += time.perf_counter() - self._since
+
+    @property
+    def seconds(self) -> float:
+        """Busy time so far, including any stretch still open."""
+        if self._in_flight:
+            return self._seconds + time.perf_counter() - self._since
+        return self._seconds
+
+
+class CommandTrace:
+    """Accumulates timing for one in-flight command."""
+    __slots__ = ("db", "send")
+
+    def __init__(self):
+        self.db = BusyTime()
+        self.send = BusyTime()
+
+
+class VerbStats:
+    """Latency histogram and totals for one command verb."""
+    __slots__ = ("count", "total_ms", "max_ms", "db_ms", "send_ms", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.db_ms = 0.0
+        self.send_ms = 0.0
+        self.buckets: List[int] = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+
+    def record(self, total_ms: float, db_ms: float, send_ms: float):
+        self.count += 1
+        self.total_ms += total_ms
+        self.db_ms += db_ms
+        self.send_ms += send_ms
+        if total_ms > self.max_ms:
+            self.max_ms = total_ms
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS_MS, total_ms)] += 1
+
+    def percentile(self, pct: float) -> float:
+        """Approximate percentile (bucket upper bound) in milliseconds."""
+        if not self.count:
+            return 0.0
+        target = self.count * pct / 100.0
+        running = 0
+        for index, bucket_count in enumerate(self.buckets):
+            running += bucket_count
+            if running >= target:
+                return BUCKET_BOUNDS_MS[index] if index < len(BUCKET_BOUNDS_MS) else self.max_ms
+        return self.max_ms
+
+
+_current: contextvars.ContextVar[Optional[CommandTrace]] = contextvars.ContextVar("command_trace", default=None)
+# Set inside a timed DB call, so the calls it makes are not counted again; each task has its own
+_in_db_call: contextvars.ContextVar[bool] = contextvars.ContextVar("in_db_call", default=False)
+VERB_STATS: Dict[str, VerbStats] = {}
+
+
+def begin() -> contextvars.Token:
+    """Starts a trace for the current task. Pass the token to finish()."""
+    return _current.set(CommandTrace())
+
+
+def finish(token: contextvars.Token, verb: str, args_str: str, character_name: str, started_at: float):
+    """Closes the trace, records it into the verb histogram and logs it if slow."""
+    trace = _current.get()
+    _current.reset(token)
+    if trace is None:
+        return
+
+    total_ms = (time.perf_counter() - started_at) * 1000.0
+    db_ms = trace.db.seconds * 1000.0
+    send_ms = trace.send.seconds * 1000.0
+
+    stats = VERB_STATS.get(verb)
+    if stats is None:
+        stats = VERB_STATS[verb] = VerbStats()
+    stats.record(total_ms, db_ms, send_ms)
+
+    if total_ms >= config.SLOW_COMMAND_THRESHOLD_MS:
+        slow_log.warning(json.dumps({
+            "verb": verb,
+            "character": character_name,
+            "args_len": len(args_str),
+            "total_ms": round(total_ms, 2),
+            "db_ms": round(db_ms, 2),
+            "db_calls": trace.db.calls,
+            "send_ms": round(send_ms, 2),
+            "send_calls": trace.send.calls,
+            "cpu_ms": round(max(0.0, total_ms - db_ms - send_ms), 2),
+        }))
+
+
+def trace_db_methods(cls):
+    """
+    Class decorator: times every public coroutine method against the active
+    CommandTrace. Nested calls (e.g. save_character_full calling other methods)
+    are only counted once; calls made side by side from gathered tasks each count.
+    """
+    for name, func in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.iscoroutinefunction(func):
+            continue
+        setattr(cls, name, _wrap_db_call(func))
+    return cls
+
+
+def _wrap_db_call(func):
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        trace = _current.get()
+        if trace is None or _in_db_call.get():
+            return await func(*args, **kwargs)
+        token = _in_db_call.set(True)
+        trace.db.start()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            trace.db.stop()
+            _in_db_call.reset(token)
+    return wrapper
+
+
+def timed_send(func):
+    """Method decorator: adds the await time of a send coroutine to the active CommandTrace."""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        trace = _current.get()
+        if trace is None:
+            return await func(*args, **kwargs)
+        trace.send.start()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            trace.send.stop()
+    return wrapper
+
+
+def format_report(limit: int = 20) -> List[str]:
+    """Returns report lines for the slowest verbs by total time spent."""
+    lines = [f"{'Verb':<14} {'Count':>7} {'Avg ms':>8} {'p50':>7} {'p95':>7} {'p99':>7} {'Max':>8} {'DB%':>5} {'Send%':>6}"]
+    ranked = sorted(VERB_STATS.items(), key=lambda kv: kv[1].total_ms, reverse=True)
+    for verb, stats in ranked[:limit]:
+        total = stats.total_ms or 1.0
+        lines.append(
+            f"{verb:<14} {stats.count:>7} {stats.total_ms / stats.count:>8.2f} "
+            f"{stats.percentile(50):>7g} {stats.percentile(95):>7g} {stats.percentile(99):>7g} "
+            f"{stats.max_ms:>8.1f} {100 * stats.db_ms / total:>5.0f} {100 * stats.send_ms / total:>6.0f}"
+        )
+    return lines
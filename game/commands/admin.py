@@ -3,11 +3,15 @@
 Admin-only commands for in-game debugging and server management.
 World-building commands are handled by a separate GUI tool.
 """
+import asyncio
 import logging
 import json
 from typing import TYPE_CHECKING, Optional
 
 from .. import utils
+from .. import command_trace
+from .. import diagnostics
+from .. import capture
 from ..room import Room
 
 if TYPE_CHECKING:
@@ -79,6 +83,91 @@ async def cmd_roomstat(character: 'Character', world: 'World', args_str: str) ->
     return True
 
 
+async def cmd_cmdstats(character: 'Character', world: 'World', args_str: str) -> bool:
+    """Admin: Shows per-command latency stats since startup. Usage: @cmdstats [count]"""
+    limit = int(args_str) if args_str.isdigit() else 20
+    if not command_trace.VERB_STATS:
+        await character.send("No commands have been timed yet.")
+        return True
+
+    output = ["\r\n--- Command Latency (slowest by total time) ---"]
+    output.extend(command_trace.format_report(limit))
+    await character.send("\r\n".join(output))
+    return True
+
+
+async def cmd_profile(character: 'Character', world: 'World', args_str: str) -> bool:
+    """Admin: Profiles the game loop for a few seconds and writes a report. Usage: @profile [seconds]"""
+    seconds = float(args_str) if args_str.strip().isdigit() else 10.0
+
+    async def _on_done(path: str):
+        await character.send(f"<g>Profile complete. Report written to {path}<x>")
+
+    if not diagnostics.start_profile(seconds, _on_done):
+        await character.send("A profiling session is already running.")
+        return True
+    await character.send(f"Profiling the game loop for {min(seconds, diagnostics.MAX_PROFILE_SECONDS):.0f} seconds...")
+    return True
+
+
+async def cmd_heap(character: 'Character', world: 'World', args_str: str) -> bool:
+    """Admin: tracemalloc snapshots and diffs. Usage: @heap <start|snap|stop>"""
+    action = args_str.strip().lower()
+    if action == "start":
+        diagnostics.heap_start()
+        await character.send("Heap tracing started. Use '@heap snap' to take snapshots.")
+    elif action in ("snap", "snapshot"):
+        lines = await diagnostics.heap_snapshot()
+        await character.send("\r\n".join(lines))
+    elif action == "stop":
+        diagnostics.heap_stop()
+        await character.send("Heap tracing stopped.")
+    else:
+        await character.send("Usage: @heap <start|snap|stop>")
+    return True
+
+
+async def cmd_capture(character: 'Character', world: 'World', args_str: str) -> bool:
+    """Admin: Captures anonymized client input for replay. Usage: @capture <start|stop|status>"""
+    action = args_str.strip().lower()
+    if action == "start":
+        if capture.active:
+            await character.send(f"Already capturing to {capture.active.path}.")
+        else:
+            started = capture.start_capture()
+            await character.send(f"Capturing client input to {started.path}.")
+    elif action == "stop":
+        stopped = await asyncio.to_thread(capture.stop_capture)
+        if stopped:
+            await character.send(f"<g>Capture stopped: {stopped.count} lines from "
+                                 f"{stopped.connections} connections in {stopped.path}<x>")
+        else:
+            await character.send("No capture is running.")
+    elif action == "status":
+        if capture.active:
+            await character.send(f"Capturing to {capture.active.path}: {capture.active.count} lines, "
+                                 f"{capture.active.connections} connections so far.")
+        else:
+            await character.send("No capture is running.")
+    else:
+        await character.send("Usage: @capture <start|stop|status>")
+    return True
+
+
+async def cmd_objcount(character: 'Character', world: 'World', args_str: str) -> bool:
+    """Admin: Shows live object counts. Usage: @objcount [gc]"""
+    tracked = diagnostics.world_object_counts(world)
+    output = ["\r\n--- Object Counts ---"]
+    if args_str.strip().lower() == "gc":
+        live = await diagnostics.gc_object_counts(list(tracked))
+        output.append(f"{'Type':<10} {'World':>8} {'Heap':>8}")
+        output.extend(f"{name:<10} {count:>8} {live[name]:>8}" for name, count in tracked.items())
+    else:
+        output.extend(f"{name:<10} {count:>8}" for name, count in tracked.items())
+    await character.send("\r\n".join(output))
+    return True
+
+
 async def cmd_examine(character: 'Character', world: 'World', args_str: str) -> bool:
     """Admin: Shows debug info about world objects. Usage: @examine <type> <id>"""
     parts = args_str.lower().split(" ", 1)
@@ -202,7 +202,7 @@ async def cmd_shoot(character: Character, world: World, args: str) -> bool:
     if ammo_stack.instance_stats["quantity"] <= 0:
         await character.send(f"You have used your last {required_ammo_type}.")
         # Remove from quiver and world
-        del quiver.contents[ammo_stack.id]
+        quiver.remove_content(ammo_stack)
         if ammo_stack.id in world._all_item_instances:
             del world._all_item_instances[ammo_stack.id]
         # Persist deletion in DB
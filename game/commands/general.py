@@ -22,6 +22,7 @@ HELP_TOPICS = {
         "abilities": "ABILITIES\n\r  Shows a list of all spells and abilities you have learned.",
         "who": "WHO\n\r  See a list of all players currently online.",
         "quit": "QUIT\n\r  Log out of the game safely, saving your character.",
+        "color": "COLOR [on|off]\n\r  Turn ANSI color on or off for this session.",
         "help": "HELP [topic]\n\r  Shows a list of help topics, or detailed help for a specific topic."
     },
     "COMMUNICATION": {
@@ -68,7 +69,7 @@ async def cmd_look(character: 'Character', world: 'World', args_str: str) -> boo
         await character.send("You are floating in an endless void... somehow.")
         return True
     
-    is_dark = "DARK" in character.location.flags and not character.is_holding_light_source()
+    is_dark = character.location.is_dark(world) and not character.carries_light
     if is_dark and not args_str:
         await character.send("It is pitch black...")
         return True
@@ -180,6 +181,19 @@ async def cmd_say(character: 'Character', world: 'World', args_str: str) -> bool
     await character.location.broadcast(f"\r\n{character.first_name} says, \"{message}\"", exclude={character})
     return True
 
+async def cmd_color(character: 'Character', world: 'World', args_str: str) -> bool:
+    """Turns ANSI color on or off for this session: color [on|off]."""
+    setting = args_str.strip().lower()
+    if setting in ("on", "off"):
+        character.use_color = setting == "on"
+    elif setting:
+        await character.send("Usage: color [on|off]")
+        return True
+    else:
+        character.use_color = not character.use_color
+    await character.send(f"Color is now <G>{'on' if character.use_color else 'off'}<x>.")
+    return True
+
 async def cmd_quit(character: 'Character', world: 'World', args_str: str) -> bool:
     """Handles the 'quit' command."""
     await character.send("Farewell!")
@@ -576,19 +590,24 @@ async def cmd_release(character: 'Character', world: 'World', args_str: str) ->
         
         # Drop all inventory items
             for item in list(character._inventory_items.values()):
+                character.untrack_carried(item)
                 item.container_id = None
                 item.room = character.location
                 character.location.item_instance_ids.append(item.id)
                 world._all_item_instances[item.id] = item
+                world.decay_index.track(item)
             character._inventory_items.clear()
             
         # Drop all equipped items
             for item in list(character._equipped_items.values()):
+                character.untrack_carried(item)
                 item.container_id = None
                 item.room = character.location
                 character.location.item_instance_ids.append(item.id)
                 world._all_item_instances[item.id] = item
+                world.decay_index.track(item)
             character._equipped_items.clear()
+            character.refresh_light()
         
             await character.location.broadcast(
                 f"\r\n<R>{character.name}'s possessions scatter across the ground as their spirit departs forever.<x>\r\n"
@@ -3,12 +3,16 @@
 Handles parsing player input and dispatching commands.
 """
 import logging
-from typing import Dict, Callable, Awaitable, Tuple
+import time
+from dataclasses import dataclass
+from typing import Dict, Callable, Awaitable, Tuple, Optional
 from functools import partial
 
 # Import necessary game objects
 from ..character import Character
 from ..world import World
+from .. import command_trace
+from .. import replay
 
 # Import command modules
 from . import general as general_cmds
@@ -30,6 +34,15 @@ log = logging.getLogger(__name__)
 # REFACTOR: Removed the database connection from the function signature type
 CommandHandlerFunc = Callable[[Character, World, str], Awaitable[bool]]
 DEAD_ALLOWED_CMDS = {"quit", "release", "look", "who", "tell", "help"}
+MEDITATION_ALLOWED_CMDS = {"look", "l", "score", "stats", "skills", "quit", "help", "who", "tell"}
+# Commands that must be typed in full (or by an explicit alias), never abbreviated: a half-typed
+# word must not quit, spend money or points, or give up, use or move items.
+NO_ABBREV_CMDS = {
+    "quit", "release",
+    "buy", "sell", "deposit", "withdraw", "repair", "give", "accept", "drop", "put", "eat", "drink", "pickpocket",
+    "spend", "invest", "improve", "advance", "level",
+    "disband", "kick",
+}
 
 # --- Command Map ---
 COMMAND_MAP: Dict[str, CommandHandlerFunc] = {
@@ -49,6 +62,7 @@ COMMAND_MAP: Dict[str, CommandHandlerFunc] = {
     "lie": general_cmds.cmd_lie,
     "release": general_cmds.cmd_release,
     "time": time_cmds.cmd_time,
+    "color": general_cmds.cmd_color, "colour": general_cmds.cmd_color,
 
     # Social Commands
     "group": social_cmds.cmd_group,
@@ -132,6 +146,11 @@ COMMAND_MAP: Dict[str, CommandHandlerFunc] = {
     "@examine": admin_cmds.cmd_examine,
     "@setstat": admin_cmds.cmd_setstat,
     "@roomstat": admin_cmds.cmd_roomstat,
+    "@cmdstats": admin_cmds.cmd_cmdstats,
+    "@profile": admin_cmds.cmd_profile,
+    "@heap": admin_cmds.cmd_heap,
+    "@objcount": admin_cmds.cmd_objcount,
+    "@capture": admin_cmds.cmd_capture,
 }
 
 # Use a loop to add directional commands cleanly
@@ -143,8 +162,79 @@ DIRECTIONAL_ALIASES = {
     "southeast": "southeast", "se": "southeast", "southwest": "southwest", "sw": "southwest",
 }
 
+_MOVE_HANDLERS = {direction: partial(movement_cmds.cmd_move, direction=direction)
+                  for direction in set(DIRECTIONAL_ALIASES.values())}
 for alias, direction in DIRECTIONAL_ALIASES.items():
-    COMMAND_MAP[alias] = partial(movement_cmds.cmd_move, direction=direction)
+    COMMAND_MAP[alias] = _MOVE_HANDLERS[direction]
+
+@dataclass(frozen=True, slots=True)
+class CommandSpec:
+    """Precomputed dispatch entry shared by a command and all of its aliases."""
+    name: str
+    func: CommandHandlerFunc
+    admin_only: bool
+    dead_allowed: bool
+    meditation_allowed: bool
+
+
+def _build_dispatch_table(command_map: Dict[str, CommandHandlerFunc]) -> Dict[str, CommandSpec]:
+    """
+    Compiles COMMAND_MAP into a flat verb -> CommandSpec table.
+    Every registered verb maps to its spec, and every prefix of a verb that
+    resolves to exactly one command is added as an abbreviation. Exact verbs
+    always win over abbreviations (so 'n' stays north, 'l' stays look).
+    Prefixes of NO_ABBREV_CMDS verbs resolve to nothing, rather than to
+    whichever other command shares them.
+    """
+    # Group aliases by handler so they share one spec
+    verbs_by_func: Dict[int, list] = {}
+    for verb, func in command_map.items():
+        verbs_by_func.setdefault(id(func), []).append(verb)
+
+    specs: Dict[str, CommandSpec] = {}
+    for verbs in verbs_by_func.values():
+        names = set(verbs)
+        spec = CommandSpec(
+            name=verbs[0],
+            func=command_map[verbs[0]],
+            admin_only=verbs[0].startswith('@'),
+            dead_allowed=bool(names & DEAD_ALLOWED_CMDS),
+            meditation_allowed=bool(names & MEDITATION_ALLOWED_CMDS),
+        )
+        for verb in verbs:
+            specs[verb] = spec
+
+    # Prefix trie: each node records the set of specs reachable below it. Full-word-only
+    # verbs add None, which keeps their prefixes from resolving to anything.
+    trie: Dict[str, dict] = {}
+    for verb, spec in specs.items():
+        node = trie
+        for ch in verb:
+            node = node.setdefault(ch, {"": set()})
+            node[""].add(None if verb in NO_ABBREV_CMDS else spec)
+
+    table: Dict[str, CommandSpec] = {}
+
+    def _walk(node: dict, prefix: str):
+        for ch, child in node.items():
+            if ch == "":
+                continue
+            reachable = child[""]
+            if len(reachable) == 1 and None not in reachable:
+                table[prefix + ch] = next(iter(reachable))
+            _walk(child, prefix + ch)
+
+    _walk(trie, "")
+    table.update(specs)
+    return table
+
+
+COMMAND_TABLE: Dict[str, CommandSpec] = _build_dispatch_table(COMMAND_MAP)
+
+
+def find_command(command_verb: str) -> Optional[CommandSpec]:
+    """Resolves a verb or unambiguous abbreviation to its CommandSpec."""
+    return COMMAND_TABLE.get(command_verb)
 
 def _parse_input(raw_input: str) -> Tuple[str, str]:
     """Splits raw input into a command verb and arguments string."""
@@ -154,22 +244,41 @@ def _parse_input(raw_input: str) -> Tuple[str, str]:
     parts = stripped_input.split(" ", 1)
     return parts[0].lower(), parts[1] if len(parts) > 1 else ""
 
+def is_roundtime_exempt(raw_input: str) -> bool:
+    """True if this input may run while the character is in roundtime; only blank lines, which run no command."""
+    command_verb, _ = _parse_input(raw_input)
+    return not command_verb
+
 async def process_command(character: Character, world: World, raw_input: str) -> bool:
     """Parses raw player input and executes the corresponding command function."""
     command_verb, args_str = _parse_input(raw_input)
     if not command_verb:
         return True
+    if replay.recorder:
+        replay.recorder.record(character, raw_input)
+
+    spec = COMMAND_TABLE.get(command_verb)
+    started_at = time.perf_counter()
+    token = command_trace.begin()
+    try:
+        return await _dispatch(character, world, command_verb, args_str, spec)
+    finally:
+        command_trace.finish(token, spec.name if spec else "<unknown>", args_str, character.name, started_at)
+
+async def _dispatch(character: Character, world: World, command_verb: str, args_str: str,
+                    spec: Optional[CommandSpec]) -> bool:
+    """Runs the state checks and the command itself for a parsed verb."""
 
     # --- Pre-command State Checks ---
-    if character.status == "DYING" and command_verb != "quit":
+    status = character.status
+    if status == "DYING" and (spec is None or spec.name != "quit"):
         await character.send("You are dying and cannot act!")
         return True
-    if character.status == "DEAD" and command_verb not in DEAD_ALLOWED_CMDS:
+    if status == "DEAD" and (spec is None or not spec.dead_allowed):
         await character.send("You are dead and cannot do that. Type 'release' to respawn.")
         return True
-        
-    MEDITATION_ALLOWED_CMDS = {"look", "l", "score", "stats", "skills", "quit", "help", "who", "tell"}
-    if character.status == "MEDITATING" and command_verb not in MEDITATION_ALLOWED_CMDS:
+
+    if status == "MEDITATING" and (spec is None or not spec.meditation_allowed):
         log.debug("Character %s broke meditation with command: %s", character.name, command_verb)
         character.status = "ALIVE"
         await character.send("You stop meditating as you act.")
@@ -179,20 +288,19 @@ async def process_command(character: Character, world: World, raw_input: str) ->
         return True
 
     # --- Find and Execute Command ---
-    command_func = COMMAND_MAP.get(command_verb)
-    if not command_func:
+    if spec is None:
         await character.send("Huh? (Type 'help' for available commands).")
         return True
 
-    if command_verb.startswith('@') and not character.is_admin:
+    if spec.admin_only and not character.is_admin:
         await character.send("Huh? (Unknown command).")
         return True
 
     try:
-        log.info("Executing command '%s' for %s (args: '%s')", command_verb, character.name, args_str)
+        log.debug("Executing command '%s' for %s (args: '%s')", spec.name, character.name, args_str)
         # REFACTOR: Call the command function with the new, shorter signature
-        return await command_func(character, world, args_str)
+        return await spec.func(character, world, args_str)
     except Exception:
-        log.exception("Error executing command '%s' for %s:", command_verb, character.name)
+        log.exception("Error executing command '%s' for %s:", spec.name, character.name)
         await character.send("Ope! Something went wrong with your command.")
-        return True
\ No newline at end of file
+        return True
@@ -93,9 +93,11 @@ async def cmd_get(character: 'Character', world: 'World', args_str: str) -> bool
             return True
         
         # Perform the move in memory
-        del container.contents[item_to_get.id]
+        container.remove_content(item_to_get)
         character._inventory_items[item_to_get.id] = item_to_get
+        character.track_carried(item_to_get)
         item_to_get.container_id = None
+        character.refresh_light()
 
         # Perform the move in the database (assign to character)
         await world.db_manager.update_item_location(item_to_get.id, owner_char_id=character.dbid)
@@ -121,7 +123,10 @@ async def cmd_get(character: 'Character', world: 'World', args_str: str) -> bool
         # Move item in memory
         character.location.item_instance_ids.remove(item_to_get.id)
         character._inventory_items[item_to_get.id] = item_to_get
+        character.track_carried(item_to_get)
         item_to_get.room = None
+        world.decay_index.untrack(item_to_get)
+        character.refresh_light()
         
         await character.send(f"You get {item_to_get.name}.")
         await character.location.broadcast(f"\r\n{character.name} gets {item_to_get.name}.\r\n", exclude={character})
@@ -142,10 +147,13 @@ async def cmd_drop(character: 'Character', world: 'World', args_str: str) -> boo
     await world.db_manager.update_item_location(item_to_drop.id, room_id=character.location_id)
 
     item_to_drop.room = character.location
+    world.decay_index.track(item_to_drop)
 
     # Move item in memory
     del character._inventory_items[item_to_drop.id]
+    character.untrack_carried(item_to_drop)
     character.location.item_instance_ids.append(item_to_drop.id)
+    character.refresh_light()
 
     world.mark_room_dirty(character.location)
 
@@ -366,8 +374,10 @@ async def cmd_put(character: 'Character', world: 'World', args_str: str) -> bool
     
     #5. Perform the move in memory
     del character._inventory_items[item_to_put.id]
-    container.contents[item_to_put.id] = item_to_put
+    character.untrack_carried(item_to_put)
+    container.add_content(item_to_put)
     item_to_put.container_id = container.id
+    character.refresh_light()
 
     #6. Perform the move in the database
     await world.db_manager.update_item_location(item_to_put.id, container_id=container.id)
@@ -501,7 +511,9 @@ async def _handle_consume(character: 'Character', world: 'World', args_str: str,
     # --- The code now correctly reaches the item destruction logic ---
     await world.db_manager.delete_item_instance(item_to_consume.id)
     del character._inventory_items[item_to_consume.id]
+    character.untrack_carried(item_to_consume)
     del world._all_item_instances[item_to_consume.id]
+    character.refresh_light()
 
     await character.location.broadcast(f"\r\n{character.name} {consume_type}s a {item_to_consume.name}.\r\n", exclude={character})
     return True
@@ -726,6 +738,7 @@ async def cmd_light(character: 'Character', world: 'World', args_str: str) -> bo
 
     # Update the item's state in memory and save to DB
     item_to_light.instance_stats["is_lit"] = True
+    character.refresh_light()
     await world.db_manager.update_item_instance_stats(item_to_light.id, item_to_light.instance_stats)
 
     await character.send(f"You light the {item_to_light.name}, casting a warm glow.")
@@ -734,7 +747,7 @@ async def cmd_light(character: 'Character', world: 'World', args_str: str) -> bo
         exclude={character}
     )
 
-    if "DARK" in character.location.flags:
+    if character.location.is_dark(world):
         await character.location.broadcast(
         f"\r\n{character.name}'s {item_to_light.name} illuminates the area.\r\n",
         exclude={character}
@@ -766,6 +779,7 @@ async def cmd_snuff(character: 'Character', world: 'World', args_str: str) -> bo
 
     # Update the item's state
     item_to_snuff.instance_stats["is_lit"] = False
+    character.refresh_light()
     await world.db_manager.update_item_instance_stats(item_to_snuff.id, item_to_snuff.instance_stats)
 
     await character.send(f"You snuff out the {item_to_snuff.name}.")
@@ -774,7 +788,7 @@ async def cmd_snuff(character: 'Character', world: 'World', args_str: str) -> bo
         exclude={character}
     )
 
-    if "DARK" in character.location.flags:
+    if character.location.is_dark(world):
     # Check if this was the LAST light source
         if not character.location.has_light_source():
             await character.location.broadcast(
@@ -3,7 +3,6 @@
 Commands related to spellcasting.
 """
 import logging
-import random
 from typing import TYPE_CHECKING, Optional, Union
 
 
@@ -34,21 +33,11 @@ async def cmd_cast(character: Character, world: 'World', args_str: str) -> bool:
     
     # --- 1. Parse Spell and Target ---
     normalized_input = args_str.strip().lower()
-    found_key: Optional[str] = None
     target_name_input: Optional[str] = None
 
-    longest_match_len = 0
-    # FIX #1: Iterate through world.abilities, which is the live, loaded data
-    for spell_key, data in world.abilities.items():
-        # FIX #2: Check for "ability_type", not "type"
-        if data.get("ability_type", "").upper() != "SPELL":
-            continue
-
-        if normalized_input.startswith(spell_key):
-            if len(spell_key) > longest_match_len:
-                longest_match_len = len(spell_key)
-                found_key = spell_key
-                target_name_input = args_str.strip()[len(spell_key):].strip()
+    found_key = world.ability_catalog.match_prefix("SPELL", normalized_input)
+    if found_key:
+        target_name_input = args_str.strip()[len(found_key):].strip()
 
     if not found_key:
         await character.send("You don't know any spell by that name.")
@@ -76,7 +65,7 @@ async def cmd_cast(character: Character, world: 'World', args_str: str) -> bool:
     
     # --- Armor Spell Failure Check
     failure_chance = character.total_spell_failure
-    if failure_chance > 0 and (random.random() * 100) < failure_chance:
+    if failure_chance > 0 and (world.rng.combat.random() * 100) < failure_chance:
         await character.send(f"<R>Your armor restricts your movement, causing your {display_name} spell to fizzle!<x>")
         character.essence -= spell_cost
         character.roundtime = spell_data.get("cast_time", 0.0)
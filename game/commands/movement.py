@@ -2,7 +2,6 @@
 """
 Movement commands.
 """
-import random
 import logging
 import json
 from typing import TYPE_CHECKING, Optional, Dict, Any
@@ -158,7 +157,7 @@ async def cmd_move(character: 'Character', world: 'World', args_str: str, *, dir
         return True
     
     if not character.can_see():
-        if random.random() < 0.25: # 25% chance to trip and fail
+        if world.rng.skill.random() < 0.25: # 25% chance to trip and fail
             await character.send("{rYou stumble in the darkness and fall!<x>")
             await combat_logic.apply_damage(character, 3, "bludgeon", world)
             character.roundtime = 5.0
@@ -201,7 +200,7 @@ async def cmd_go(character: 'Character', world: 'World', args_str: str) -> bool:
         return True
     
     if not character.can_see():
-        if random.random() < 0.25: # 25% chance to trip and fail
+        if world.rng.skill.random() < 0.25: # 25% chance to trip and fail
             await character.send("{rYou stumble in the darkness and fall!<x>")
             await combat_logic.apply_damage(character, 3, "bludgeon", world)
             character.roundtime = 5.0
@@ -1,6 +1,5 @@
 # game/commands/rogue.py
 import logging
-import random
 from typing import Union, TYPE_CHECKING
 from .. import utils
 from .. character import Character
@@ -43,6 +42,7 @@ async def cmd_hide(character: 'Character', world: 'World', args_str: str) -> boo
 
     if not spotted:
         character.is_hidden = True
+        world.perception_checks.notify(character.location)
         await character.send("You slip into the shadows.")
 
     return True
@@ -145,7 +145,7 @@ async def cmd_disarm(character: 'Character', world: 'World', args_str: str) -> b
     else:
         await character.send(f"<r>You fail to disarm the trap...<x>")
         # 25% chance to trigger the trap on failure!
-        if random.random() < 0.25:
+        if world.rng.skill.random() < 0.25:
             await character.send(f"<R>...and you've triggered it!<x>")
             # Here we would resolve the trap's effect, for now, we'll just log it.
             log.info(f"Trap {trap_id} triggered on failed disarm by {character.name}.")
@@ -193,7 +193,7 @@ async def cmd_pickpocket(character: 'Character', world: 'World', args_str: str)
         if target.coinage > 0:
             # Steal between 1% and 10% of their money, plus a bonus for skill
             max_steal = int(target.coinage * 0.10) + check['total_check']
-            amount_stolen = min(target.coinage, random.randint(1, max(1, max_steal)))
+            amount_stolen = min(target.coinage, world.rng.skill.randint(1, max(1, max_steal)))
 
             target.coinage -= amount_stolen
             character.coinage += amount_stolen
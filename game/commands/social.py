@@ -157,7 +157,11 @@ async def cmd_accept(character: 'Character', world: 'World', args_str: str) -> b
             
             #Perform item transfer
             del giver._inventory_items[item_to_receive.id]
+            giver.untrack_carried(item_to_receive)
             character._inventory_items[item_to_receive.id] = item_to_receive
+            character.track_carried(item_to_receive)
+            giver.refresh_light()
+            character.refresh_light()
             await world.db_manager.update_item_location(item_to_receive.id, owner_char_id=character.dbid)
 
             await character.send(f"You accept the {item_to_receive.name} from {giver.name}.")
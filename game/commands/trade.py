@@ -111,7 +111,8 @@ async def cmd_buy(character: 'Character', world: 'World', args_str: str) -> bool
     # Create a new unique instance of the item for the player
     new_instance_data = await world.db_manager.create_item_instance(
         template_id=item_template['id'],
-        owner_char_id=character.dbid
+        owner_char_id=character.dbid,
+        rng=world.rng.loot
     )
 
     # This should always succeed, but it's good practice to check
@@ -124,6 +125,8 @@ async def cmd_buy(character: 'Character', world: 'World', args_str: str) -> bool
     # Add the new item to the character's in memory inventory
     new_item_obj = Item(new_instance_data, item_template)
     character._inventory_items[new_item_obj.id] = new_item_obj
+    character.track_carried(new_item_obj)
+    character.refresh_light()
     world._all_item_instances[new_item_obj.id] = new_item_obj
 
     # 7. Update shop stock if it's not infinite
@@ -190,8 +193,10 @@ async def cmd_sell(character: 'Character', world: 'World', args_str: str) -> boo
 
     character.coinage += price
     del character._inventory_items[item_to_sell.id]
+    character.untrack_carried(item_to_sell)
     if item_to_sell.id in world._all_item_instances:
         del world._all_item_instances[item_to_sell.id]
+    character.refresh_light()
 
     await character.send(f"You sell {item_to_sell.name} for {utils.format_coinage(price)}.")
     return True
@@ -262,6 +267,8 @@ async def cmd_deposit(character: 'Character', world: 'World', args_str: str) ->
     # Remove item from character's in-memory state
     del world._all_item_instances[item_to_deposit.id]
     del character._inventory_items[item_to_deposit.id]
+    character.untrack_carried(item_to_deposit)
+    character.refresh_light()
 
     fee_str = f", paying a fee of {utils.format_coinage(fee)}" if fee > 0 else ""
     await character.send(f"You deposit {item_to_deposit.name}{fee_str}.")
@@ -320,6 +327,8 @@ async def cmd_withdraw(character: 'Character', world: 'World', args_str: str) ->
 
     # Add the item to the character's in-memory inventory
     character._inventory_items[item_obj.id] = item_obj
+    character.track_carried(item_obj)
+    character.refresh_light()
     
     # FIX: Register the newly created item with the world's master list
     world._all_item_instances[item_obj.id] = item_obj
@@ -13,6 +13,7 @@ import config
 from typing import Optional, Dict, Any, List, Set, Tuple
 
 from . import utils
+from . import command_trace
 from .definitions import skills as skill_defs
 from .definitions import abilities as ability_defs
 from .definitions import classes as class_defs
@@ -28,6 +29,7 @@ DB_CONFIG = {
     "host": "localhost"
 }
 
+@command_trace.trace_db_methods
 class DatabaseManager:
     """A class to manage the application's PostgreSQL connection pool and queries."""
 
@@ -494,9 +496,11 @@ class DatabaseManager:
         log.info("--- PostgreSQL schema check complete ---")
 
     # --- Item Instance Management Functions ---
-    async def create_item_instance(self, template_id: int, room_id: Optional[int] = None, owner_char_id: Optional[int] = None, container_id: Optional[str] = None, instance_stats: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    async def create_item_instance(self, template_id: int, room_id: Optional[int] = None, owner_char_id: Optional[int] = None, container_id: Optional[str] = None, instance_stats: Optional[Dict[str, Any]] = None,
+                                   rng: random.Random = random) -> Optional[Dict[str, Any]]:
         """
         Creates a new, unique instance of an item, applying template-based randomization for locks/traps.
+        Pass the world's loot stream as rng so seeded runs reproduce the rolls.
         """
         template_record = await self.fetch_one_query("SELECT random_properties, lock_details, trap_details FROM item_templates WHERE id = $1", template_id)
         
@@ -507,17 +511,17 @@ class DatabaseManager:
             props_str = template_record['random_properties']
             props = json.loads(props_str) if isinstance(props_str, str) else props_str
             
-            if random.random() < props.get('lock_chance', 0):
+            if rng.random() < props.get('lock_chance', 0):
                 generated_stats['is_locked'] = True
                 dc_range = props.get('lock_dc_range', [10, 25])
-                generated_stats['lockpick_dc'] = random.randint(dc_range[0], dc_range[1])
+                generated_stats['lockpick_dc'] = rng.randint(dc_range[0], dc_range[1])
 
-            if random.random() < props.get('trap_chance', 0):
+            if rng.random() < props.get('trap_chance', 0):
                 trap = {'is_active': True}
                 perc_range = props.get('trap_perception_dc_range', [10, 25])
                 disarm_range = props.get('trap_disarm_dc_range', [15, 30])
-                trap['perception_dc'] = random.randint(perc_range[0], perc_range[1])
-                trap['disarm_dc'] = random.randint(disarm_range[0], disarm_range[1])
+                trap['perception_dc'] = rng.randint(perc_range[0], perc_range[1])
+                trap['disarm_dc'] = rng.randint(disarm_range[0], disarm_range[1])
                 generated_stats['trap'] = trap
         
         # FIX: Check for and parse the lock_details JSON string before using it
@@ -606,6 +610,11 @@ class DatabaseManager:
         query = "DELETE FROM item_instances WHERE id = $1"
         return await self.execute_query(query, instance_id)
 
+    async def delete_item_instances(self, instance_ids: List[str]) -> str:
+        """Permanently deletes a batch of item instances in one statement."""
+        query = "DELETE FROM item_instances WHERE id = ANY($1::uuid[])"
+        return await self.execute_query(query, instance_ids)
+
     # --- Creator Functions (for seeding and building) ---
     async def create_item_template(self, name: str, item_type: str, description: str, stats: dict, flags: list, damage_type: Optional[str]) -> Optional[int]:
         query = "INSERT INTO item_templates (name, type, description, stats, flags, damage_type) VALUES ($1, $2, $3, $4, $5, $6) RETURNING id"
@@ -0,0 +1,60 @@
+# game/decay.py
+"""
+Expiry index for decaying ground items.
+An item with the DECAYS flag is pushed onto a heap keyed by the wall-clock
+time it expires (config.ITEM_DECAY_TIME_SECONDS after it reached the
+ground) when it is loaded into a room or dropped there, and untracked when
+it leaves the ground. Each World has its own index (World.decay_index),
+and World.update_item_decay pops only the expired entries, so its cost
+follows the items that actually decay rather than every item in the world. Entries for items picked up or dropped again are
+skipped when popped, in the same way as game/roundtime.py.
+"""
+import heapq
+import itertools
+import time
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple, TYPE_CHECKING
+
+import config
+
+if TYPE_CHECKING:
+    from .item import Item
+
+
+class DecayIndex:
+    """Heap of (expires_at, seq, item). An entry is live while item.decays_at still matches it."""
+    def __init__(self):
+        self._heap: List[Tuple[float, int, 'Item']] = []
+        self._seq = itertools.count()
+
+    def track(self, item: 'Item', moved_at: Optional[float] = None):
+        """Starts the decay timer for an item now on the ground, from moved_at (default now)."""
+        if not item.has_flag("DECAYS"):
+            return
+        if moved_at is None:
+            moved_at = time.time()
+            item.last_moved_at = datetime.now(timezone.utc)
+        item.decays_at = moved_at + config.ITEM_DECAY_TIME_SECONDS
+        heapq.heappush(self._heap, (item.decays_at, next(self._seq), item))
+
+    def untrack(self, item: 'Item'):
+        item.decays_at = None
+
+    def pop_expired(self, now: Optional[float] = None) -> List['Item']:
+        """Removes and returns the tracked items that have expired by now."""
+        now = time.time() if now is None else now
+        expired = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            expires_at, _seq, item = heapq.heappop(heap)
+            if item.decays_at == expires_at and item.room is not None:
+                item.decays_at = None
+                expired.append(item)
+        return expired
+
+    def clear(self):
+        self._heap.clear()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
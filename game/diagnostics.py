@@ -0,0 +1,151 @@
+# game/diagnostics.py
+"""
+On-demand runtime diagnostics for admins: a time-bounded cProfile session,
+tracemalloc snapshots/diffs, and live object counts. Nothing here costs
+anything until an admin starts it, and report writing happens off the
+event loop thread.
+"""
+import asyncio
+import cProfile
+import gc
+import io
+import logging
+import os
+import pstats
+import time
+import tracemalloc
+from typing import Optional, Dict, List, TYPE_CHECKING
+
+import config
+
+if TYPE_CHECKING:
+    from .world import World
+
+log = logging.getLogger(__name__)
+
+MAX_PROFILE_SECONDS = 120
+
+_profile_task: Optional[asyncio.Task] = None
+_last_snapshot: Optional[tracemalloc.Snapshot] = None
+
+
+def _report_path(prefix: str, suffix: str) -> str:
+    os.makedirs(config.DIAGNOSTICS_DIR, exist_ok=True)
+    millis = int(time.time() * 1000) % 1000
+    return os.path.join(config.DIAGNOSTICS_DIR, f"{prefix}_{time.strftime('%Y%m%d_%H%M%S')}_{millis:03d}.{suffix}")
+
+
+def is_profiling() -> bool:
+    return _profile_task is not None and not _profile_task.done()
+
+
+def _write_profile_report(profiler: cProfile.Profile, seconds: float) -> str:
+    """Dumps raw stats plus a readable top-N summary. Runs in a worker thread."""
+    path = _report_path("profile", "txt")
+    profiler.dump_stats(path[:-4] + ".prof")
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(60)
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(30)
+    with open(path, "w") as f:
+        f.write(f"Profile of the event loop thread over {seconds:.1f}s\n")
+        f.write(stream.getvalue())
+    return path
+
+
+async def _run_profile(seconds: float, on_done) -> None:
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profiler.disable()
+    path = await asyncio.to_thread(_write_profile_report, profiler, seconds)
+    log.info("Profiler report written to %s", path)
+    await on_done(path)
+
+
+def start_profile(seconds: float, on_done) -> bool:
+    """
+    Starts profiling the event loop thread for the given number of seconds.
+    on_done(path) is awaited once the report is written. Returns False if a
+    session is already running.
+    """
+    global _profile_task
+    if is_profiling():
+        return False
+    seconds = max(1.0, min(float(seconds), MAX_PROFILE_SECONDS))
+    _profile_task = asyncio.create_task(_run_profile(seconds, on_done))
+    return True
+
+
+def heap_start(frames: int = 10):
+    """Starts tracemalloc tracing. Allocation tracking slows the server while on."""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+
+
+def heap_stop():
+    global _last_snapshot
+    _last_snapshot = None
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def _take_snapshot_report(limit: int) -> List[str]:
+    """Takes a snapshot and, if there is a previous one, diffs against it. Runs in a worker thread."""
+    global _last_snapshot
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ))
+    current, peak = tracemalloc.get_traced_memory()
+    lines = [f"Traced memory: current {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB"]
+
+    if _last_snapshot is None:
+        lines.append(f"Top {limit} allocation sites:")
+        lines.extend(str(stat) for stat in snapshot.statistics("lineno")[:limit])
+    else:
+        lines.append(f"Top {limit} changes since last snapshot:")
+        lines.extend(str(stat) for stat in snapshot.compare_to(_last_snapshot, "lineno")[:limit])
+    _last_snapshot = snapshot
+
+    path = _report_path("heap", "txt")
+    with open(path, "w") as f:
+        f.write("\n".join(lines))
+    lines.append(f"Full report: {path}")
+    return lines
+
+
+async def heap_snapshot(limit: int = 15) -> List[str]:
+    """Snapshots the traced heap (diffing against the previous snapshot, if any)."""
+    if not tracemalloc.is_tracing():
+        return ["tracemalloc is not running. Use '@heap start' first."]
+    return await asyncio.to_thread(_take_snapshot_report, limit)
+
+
+def world_object_counts(world: 'World') -> Dict[str, int]:
+    """Counts of the objects the world itself tracks. Cheap; no heap scan."""
+    return {
+        "Room": len(world.rooms),
+        "Mob": sum(len(room.mobs) for room in world.rooms.values()),
+        "Item": len(world._all_item_instances),
+        "Character": len(world.active_characters),
+    }
+
+
+def _gc_object_counts(type_names: List[str]) -> Dict[str, int]:
+    counts = dict.fromkeys(type_names, 0)
+    for obj in gc.get_objects():
+        name = type(obj).__name__
+        if name in counts:
+            counts[name] += 1
+    return counts
+
+
+async def gc_object_counts(type_names: List[str]) -> Dict[str, int]:
+    """
+    Counts live instances of the named classes across the whole heap, including
+    ones the world no longer references (leaks). Runs in a worker thread.
+    """
+    return await asyncio.to_thread(_gc_object_counts, type_names)
@@ -2,6 +2,7 @@
 from __future__ import annotations
 import uuid
 from typing import Set, Optional, TYPE_CHECKING
+from . import broadcast
 
 if TYPE_CHECKING:
     from .character import Character
@@ -41,9 +42,7 @@ class Group:
 
     async def broadcast(self, message: str, exclude: Optional[Set[Character]] = None):
         """Sends a message to all members of the group."""
-        for member in self.members:
-            if not exclude or member not in exclude:
-                await member.send(message)
+        await broadcast.fan_out(list(self.members), message, exclude=exclude)
 
     def get_slowest_member_rt(self) -> float:
         """Finds the highest roundtime among all group members."""
@@ -7,6 +7,7 @@ import time
 import config
 import asyncio
 import logging
+import weakref
 from enum import Enum, auto
 from typing import Optional, Dict, Any
 
@@ -15,6 +16,10 @@ from game.player import Player
 from game.character import Character
 from game.world import World
 from game import utils
+from game import capture
+from game import telnet
+from game import command_queue
+from game import admission
 from game.commands import handler as command_handler
 from game.handlers.creation import CreationHandler
 
@@ -49,12 +54,18 @@ class ConnectionState(Enum):
     PLAYING = auto()
     DISCONNECTED = auto()
 
+# Every live handler, for metrics and admin tooling. Handlers drop out when collected.
+ACTIVE_HANDLERS: "weakref.WeakSet[ConnectionHandler]" = weakref.WeakSet()
+
 class ConnectionHandler:
     MAX_PASSWORD_ATTEMPTS = 3
 
     def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, world: World, db_manager_instance):
         self.reader = reader
-        self.writer = writer
+        # All output goes through this so it can be MCCP2-compressed once negotiated
+        self.writer = telnet.TelnetWriter(writer)
+        # Parses telnet input into bounded lines; shared with CreationHandler
+        self.telnet = telnet.TelnetStream(reader, self.writer, config.MAX_INPUT_LENGTH)
         self.world = world
         self.db_manager = db_manager_instance
         self.state = ConnectionState.GETTING_USERNAME
@@ -63,6 +74,11 @@ class ConnectionHandler:
         self.active_character: Optional[Character] = None
         self.password_attempts: int = 0
         self.new_account_data: Dict[str, Any] = {}
+        # Read by the admission reaper for login, idle and link-dead timeouts
+        self.connected_at = time.monotonic()
+        self.last_input_at = self.connected_at
+        self.authenticated = False
+        ACTIVE_HANDLERS.add(self)
         log.info("ConnectionHandler initialized for %s", self.addr)
 
     async def _prompt(self, message: str):
@@ -73,14 +89,19 @@ class ConnectionHandler:
 
     async def _read_line(self) -> Optional[str]:
         try:
-            data = await self.reader.readuntil(b'\n')
-            
-            # --- THIS IS THE FIX ---
-            # Add 'errors="ignore"' to discard invalid MUD client command bytes
-            decoded_data = data.decode(config.ENCODING, errors='ignore').strip()
-            # -----------------------
-
-            if decoded_data.lower() == 'quit':
+            result = await self.telnet.readline()
+            if result is None:
+                self.state = ConnectionState.DISCONNECTED
+                return None
+            decoded_data, truncated = result
+            self.last_input_at = time.monotonic()
+            if truncated:
+                await self.send(f"Input longer than {config.MAX_INPUT_LENGTH} bytes was cut short.")
+            if capture.active:
+                capture.active.record_line(self, decoded_data)
+
+            # In play, 'quit' is queued like any other command so it runs after the lines typed before it
+            if decoded_data.lower() == 'quit' and self.state != ConnectionState.PLAYING:
                 self.state = ConnectionState.DISCONNECTED
                 return None
             return decoded_data
@@ -172,6 +193,7 @@ class ConnectionHandler:
             if new_id:
                 player_data = await self.db_manager.load_player_account(self.new_account_data['username'])
                 self.player_account = Player(**dict(player_data))
+                self._mark_authenticated()
                 self.state = ConnectionState.CREATING_CHARACTER
             else:
                 await self._send("Failed to create account (username or email may be taken).")
@@ -192,6 +214,7 @@ class ConnectionHandler:
                 new_hash = utils.hash_password(password)
                 await self.db_manager.execute_query("UPDATE players SET hashed_password = $1 WHERE id = $2", new_hash, self.player_account.dbid)
                 self.player_account.hashed_password = new_hash
+            self._mark_authenticated()
             self.state = ConnectionState.SELECTING_CHARACTER
         else:
             self.password_attempts += 1
@@ -201,6 +224,12 @@ class ConnectionHandler:
             else:
                 await self._send(f"Incorrect password. ({self.MAX_PASSWORD_ATTEMPTS - self.password_attempts} attempts remaining)")
 
+    def _mark_authenticated(self):
+        """Password verified: frees the login slot and switches the reaper to the idle timeout."""
+        self.authenticated = True
+        self.last_input_at = time.monotonic()
+        admission.control.leave_pre_auth(self)
+
     async def _handle_select_character(self):
         char_list = await self.db_manager.load_characters_for_account(self.player_account.dbid)
         if not char_list:
@@ -248,19 +277,53 @@ class ConnectionHandler:
         await self.world.broadcast_to_all(f"<Y>** {self.active_character.name} has entered the realm. **<x>", exclude={self.active_character})
         self.state = ConnectionState.PLAYING
 
+    async def _send_prompt(self):
+        prompt = (f"<{int(self.active_character.hp)}/{int(self.active_character.max_hp)}hp "
+                  f"{int(self.active_character.essence)}/{int(self.active_character.max_essence)}e | "
+                  f"{self.active_character.stance}> ")
+        await self._send(prompt, add_newline=False)
+
     async def _handle_playing(self):
-        while self.state == ConnectionState.PLAYING:
-            prompt = (f"<{int(self.active_character.hp)}/{int(self.active_character.max_hp)}hp "
-                      f"{int(self.active_character.essence)}/{int(self.active_character.max_essence)}e | "
-                      f"{self.active_character.stance}> ")
-            await self._send(prompt, add_newline=False)
-            line = await self._read_line()
-            if line is None: return
-            if not await command_handler.process_command(self.active_character, self.world, line):
-                self.state = ConnectionState.DISCONNECTED
+        """Reads input into the command queue while this task runs queued commands in order."""
+        queue = command_queue.CommandQueue(self.active_character, self.world.command_scheduler)
+        reader_task = asyncio.create_task(self._read_commands(queue))
+        try:
+            await self._send_prompt()
+            while self.state == ConnectionState.PLAYING:
+                line = await queue.next_command(command_handler.is_roundtime_exempt)
+                if line is None:
+                    if reader_task.done() and not reader_task.cancelled():
+                        reader_task.result()  # Re-raises whatever ended the reader
+                    return
+                async with self.world.command_scheduler.slots():
+                    keep_playing = await command_handler.process_command(self.active_character, self.world, line)
+                if not keep_playing:
+                    self.state = ConnectionState.DISCONNECTED
+                    return
+                await self._send_prompt()
+        finally:
+            queue.close()
+            reader_task.cancel()
+
+    async def _read_commands(self, queue: command_queue.CommandQueue):
+        """Queues each line the client sends ('quit' included); closes the queue on disconnect or error."""
+        flooding = False
+        try:
+            while self.state == ConnectionState.PLAYING:
+                line = await self._read_line()
+                if line is None:
+                    break
+                if queue.push(line):
+                    flooding = False
+                elif not flooding:
+                    # Warn once per burst rather than once per dropped line
+                    flooding = True
+                    await self.send("You are typing too fast; commands are being dropped.")
+        finally:
+            queue.close()
 
     async def _handle_character_creation(self):
-        creator = CreationHandler(self.reader, self.writer, self.player_account, self.world, self.db_manager)
+        creator = CreationHandler(self.telnet, self.writer, self.player_account, self.world, self.db_manager)
         new_char_id = await creator.handle()
         if new_char_id:
             char_data = await self.db_manager.load_character_data(new_char_id)
@@ -282,6 +345,8 @@ class ConnectionHandler:
             ConnectionState.CREATING_CHARACTER: self._handle_character_creation,
             ConnectionState.PLAYING: self._handle_playing,
         }
+        if config.MCCP_ENABLED:
+            self.telnet.offer_compression()
         try:
             while self.state != ConnectionState.DISCONNECTED:
                 current_state = self.state
@@ -293,7 +358,8 @@ class ConnectionHandler:
                     self.state = ConnectionState.DISCONNECTED
                 
                 if self.state == current_state and self.state != ConnectionState.PLAYING:
-                    await asyncio.sleep(0.1)
+                    # Every state handler waits on input, so this only yields; no polling delay.
+                    await asyncio.sleep(0)
         except Exception:
             log.exception("Unexpected error in ConnectionHandler for %s:", self.addr)
         finally:
@@ -345,4 +411,8 @@ class ConnectionHandler:
                 self.writer.close()
                 await self.writer.wait_closed()
                 
+        ACTIVE_HANDLERS.discard(self)
+        admission.control.leave_pre_auth(self)
+        if capture.active:
+            capture.active.record_close(self)
         log.info("Connection handler finished for %s.", self.addr)
\ No newline at end of file
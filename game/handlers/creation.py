@@ -12,6 +12,7 @@ from typing import Optional, Dict, Any, List
 from game.database import db_manager
 from game import utils
 from game.player import Player
+from game.telnet import TelnetStream
 from game.world import World
 from game.definitions import traits as trait_defs, races as race_defs, classes as class_defs, abilities as ability_defs
 
@@ -50,7 +51,7 @@ class CreationState(Enum):
 class CreationHandler:
     """Manages the state machine for creating a new character."""
 
-    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+    def __init__(self, reader: TelnetStream, writer: asyncio.StreamWriter,
                  player: Player, world: World, db_manager_instance):
         self.reader = reader
         self.writer = writer
@@ -78,8 +79,11 @@ class CreationHandler:
 
     async def _read_line(self) -> Optional[str]:
         try:
-            data = await self.reader.readuntil(b'\n')
-            decoded_data = data.decode('utf-8').strip()
+            result = await self.reader.readline()
+            if result is None:
+                self.state = CreationState.CANCELLED
+                return None
+            decoded_data = result[0]
             if decoded_data.lower() == 'quit':
                 self.state = CreationState.CANCELLED
                 return None
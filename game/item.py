@@ -30,6 +30,7 @@ class Item:
         self.condition: int = instance_data.get('condition', 100)
         self.last_moved_at = instance_data.get('last_moved_at')
         self.room: Optional[Room] = None
+        self.decays_at: Optional[float] = None  # Wall-clock expiry while on the ground; see game/decay.py
 
         # FIX: Properly handle instance_stats which might be a string or None
         stats_data = instance_data.get('instance_stats')
@@ -47,6 +48,10 @@ class Item:
 
         # --- Runtime Attributes ---
         self.contents: Dict[str, 'Item'] = {}
+        # Whatever holds this item: the container Item it is in or the Character carrying it.
+        # Weight changes are passed up through it, so container and carried weights stay cached.
+        self.parent: Optional[Union['Item', 'Character']] = None
+        self._contents_weight: float = 0.0
 
         # --- Shared Template Data ---
         self._template = template_data
@@ -55,16 +60,35 @@ class Item:
             log.warning("Item template %s has non-dict stats: %s", self._template.get('id'), type(self._template_stats))
             self._template_stats = {} # Default to empty dict to prevent errors
 
-    def get_total_contents_weight(self) -> int:
-        """Calculates the total weight of all items inside this container."""
-        if not self.contents:
-            return 0
-        # FIX: Recursively get the weight of items in sub-containers
-        return sum(item.get_total_weight() for item in self.contents.values())
+    def get_total_contents_weight(self) -> float:
+        """Returns the cached total weight of all items inside this container, nested ones included."""
+        return self._contents_weight
 
-    def get_total_weight(self) -> int:
+    def get_total_weight(self) -> float:
         """Calculates the item's own weight plus the weight of its contents."""
-        return self.weight + self.get_total_contents_weight()
+        return self.weight + self._contents_weight
+
+    def compute_total_weight(self) -> float:
+        """Recomputes get_total_weight() from scratch; used to check the cached weights."""
+        return self.weight + sum(item.compute_total_weight() for item in self.contents.values())
+
+    def add_content(self, item: 'Item'):
+        """Puts item inside this container and adds its weight to every holder above."""
+        self.contents[item.id] = item
+        item.parent = self
+        self._adjust_weight(item.get_total_weight())
+
+    def remove_content(self, item: 'Item'):
+        """Takes item out of this container and removes its weight from every holder above."""
+        if self.contents.pop(item.id, None) is None:
+            return
+        item.parent = None
+        self._adjust_weight(-item.get_total_weight())
+
+    def _adjust_weight(self, delta: float):
+        self._contents_weight += delta
+        if self.parent is not None:
+            self.parent._adjust_weight(delta)
 
     @property
     def template_id(self) -> int:
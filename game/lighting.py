@@ -0,0 +1,25 @@
+# game/lighting.py
+"""
+Room lighting.
+Whether a room is dark is worked out when asked, from its flags and its
+world's day/night state (World.night), instead of adding and removing DARK
+on every outdoor room at dusk and dawn:
+
+  LIT rooms are never dark.
+  OUTDOORS rooms are dark at night.
+  Other rooms are dark if flagged DARK.
+
+Light carried by characters is kept as a count per room (Room.light_sources),
+adjusted as characters holding lights move and as Character.refresh_light
+notices a light being lit, snuffed, picked up or put down. Together these
+make can_see checks constant-time.
+"""
+from typing import Iterable
+
+
+def is_dark(flags: Iterable[str], night: bool) -> bool:
+    if "LIT" in flags:
+        return False
+    if "OUTDOORS" in flags:
+        return night
+    return "DARK" in flags
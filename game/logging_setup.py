@@ -0,0 +1,125 @@
+# game/logging_setup.py
+"""
+Non-blocking logging pipeline.
+Records are handed off to a bounded queue on the event loop thread and
+written to disk/stdout by a QueueListener thread, so a slow disk or
+terminal never stalls a tick.
+"""
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+from typing import Dict, Optional
+
+import config
+
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that never blocks. When the queue is full the record is
+    dropped and counted; the count is reported once the queue drains.
+    """
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._unreported = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            self._unreported += 1
+            return
+        if self._unreported:
+            notice = logging.LogRecord(
+                __name__, logging.WARNING, __file__, 0,
+                "Log queue was full; dropped %d records.", (self._unreported,), None
+            )
+            try:
+                self.queue.put_nowait(self.prepare(notice))
+                self._unreported = 0
+            except queue.Full:
+                pass
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Per-logger token bucket for chatty, hot-path loggers.
+    Only applies to records below WARNING; warnings and errors always pass.
+    """
+    def __init__(self, limits: Dict[str, float]):
+        super().__init__()
+        self.limits = limits
+        self.suppressed = 0
+        self._buckets: Dict[str, list] = {}  # name -> [tokens, last_refill]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.limits.get(record.name)
+        if rate is None:
+            return True
+
+        now = time.monotonic()
+        bucket = self._buckets.get(record.name)
+        if bucket is None:
+            bucket = self._buckets[record.name] = [rate, now]
+        else:
+            bucket[0] = min(rate, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+
+        if bucket[0] < 1.0:
+            self.suppressed += 1
+            return False
+        bucket[0] -= 1.0
+        return True
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+queue_handler: Optional[DroppingQueueHandler] = None
+rate_limiter: Optional[RateLimitFilter] = None
+
+
+def setup_logging(level: int = logging.INFO) -> logging.handlers.QueueListener:
+    """
+    Installs the queue handler on the root logger and starts the writer thread.
+    Returns the listener; call stop_logging() on shutdown to flush it.
+    """
+    global _listener, queue_handler, rate_limiter
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    file_handler = logging.handlers.RotatingFileHandler(
+        config.LOG_FILE, maxBytes=config.LOG_MAX_BYTES, backupCount=config.LOG_BACKUP_COUNT
+    )
+    file_handler.setFormatter(formatter)
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(formatter)
+
+    log_queue: queue.Queue = queue.Queue(maxsize=config.LOG_QUEUE_SIZE)
+    queue_handler = DroppingQueueHandler(log_queue)
+    rate_limiter = RateLimitFilter(config.LOG_RATE_LIMITS)
+    queue_handler.addFilter(rate_limiter)
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, file_handler, stream_handler, respect_handler_level=True
+    )
+    _listener.start()
+    return _listener
+
+
+def stop_logging():
+    """Flushes any queued records and stops the writer thread."""
+    global _listener
+    if _listener:
+        _listener.stop()
+        _listener = None
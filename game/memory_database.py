@@ -0,0 +1,664 @@
+# game/memory_database.py
+"""
+In-memory stand-in for DatabaseManager.
+Implements the same public interface over plain dicts so World.build, the
+tick handlers and commands can run (and be benchmarked or profiled) without
+PostgreSQL. Optional injected latency simulates a remote database.
+
+The raw-SQL entry points (fetch_all_query, fetch_one_query, execute_query)
+understand only the simple single-table SELECT/UPDATE/DELETE statements the
+game issues directly; everything else is implemented natively. Anything
+else raises UnsupportedQueryError, naming the statement.
+"""
+import asyncio
+import json
+import logging
+import random
+import re
+import uuid
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, Set, Tuple, Iterable
+
+import config
+from . import utils
+from . import command_trace
+from .definitions import skills as skill_defs
+from .definitions import abilities as ability_defs
+from .definitions import classes as class_defs
+from .definitions import slots
+
+log = logging.getLogger(__name__)
+
+# Tables keyed by something other than a serial 'id'.
+PRIMARY_KEYS = {
+    "character_stats": "character_id",
+    "character_equipment": "character_id",
+    "bank_accounts": "character_id",
+    "game_economy": "key",
+}
+
+# Column defaults applied on insert, mirroring the schema in DatabaseManager.init_db.
+TABLE_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "areas": {"description": "An undescribed area."},
+    "players": {"is_admin": False, "last_login": None},
+    "rooms": {"description": "You see nothing special.", "spawners": "{}", "flags": "[]", "coinage": 0,
+              "shop_buy_filter": "[]", "shop_sell_modifier": 0.5},
+    "item_templates": {"description": "An ordinary item.", "stats": "{}", "flags": "[]", "damage_type": None,
+                       "loot_table_id": None, "lock_details": None, "trap_details": None, "random_properties": None},
+    "mob_templates": {"description": "A creature.", "mob_type": None, "level": 1, "stats": "{}", "resistances": "{}",
+                      "max_hp": 10, "max_coinage": 0, "flags": "[]", "respawn_delay_seconds": 300,
+                      "variance": "{}", "movement_chance": 0.0},
+    "mob_attacks": {"damage_base": 1, "damage_rng": 0, "speed": 2.0, "attack_type": "physical", "effect_details": None},
+    "characters": {"level": 1, "description": "", "hp": 50.0, "max_hp": 50.0, "essence": 20.0, "max_essence": 20.0,
+                   "spiritual_tether": 3, "xp_pool": 0.0, "xp_total": 0.0, "status": "ALIVE", "stance": "Standing",
+                   "unspent_skill_points": 0, "unspent_attribute_points": 0, "location_id": 1, "coinage": 0,
+                   "last_saved": None, "total_playtime_seconds": 0, "hunger": 100, "thirst": 100},
+    "exits": {"details": "{}", "is_hidden": False},
+    "item_instances": {"owner_char_id": None, "room_id": None, "container_id": None, "condition": 100,
+                       "instance_stats": "{}"},
+    "shop_inventories": {"stock_quantity": -1, "buy_price_modifier": 1.25, "sell_price_modifier": 0.75},
+    "room_objects": {"description": "It looks unremarkable.", "keywords": "[]"},
+    "ambient_scripts": {"room_id": None, "area_id": None},
+    "mob_loot_table": {"drop_chance": 1.0, "min_quantity": 1, "max_quantity": 1},
+}
+
+_SELECT_RE = re.compile(
+    r"^\s*SELECT\s+(?P<cols>.+?)\s+FROM\s+(?P<table>\w+)"
+    r"(?:\s+WHERE\s+(?P<where>.+?))?(?:\s+ORDER\s+BY\s+(?P<order>.+?))?(?:\s+LIMIT\s+(?P<limit>\d+))?\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL)
+_UPDATE_RE = re.compile(r"^\s*UPDATE\s+(?P<table>\w+)\s+SET\s+(?P<sets>.+?)\s+WHERE\s+(?P<where>.+?)\s*;?\s*$",
+                        re.IGNORECASE | re.DOTALL)
+_DELETE_RE = re.compile(r"^\s*DELETE\s+FROM\s+(?P<table>\w+)\s+WHERE\s+(?P<where>.+?)\s*;?\s*$",
+                        re.IGNORECASE | re.DOTALL)
+_CONDITION_RE = re.compile(r"^(?:lower\((\w+)\)|(\w+))\s*=\s*(?:lower\((\$\d+)\)|(\$\d+|'[^']*'|-?\d+))$",
+                           re.IGNORECASE)
+
+
+class UnsupportedQueryError(Exception):
+    """Raised for SQL the in-memory database cannot evaluate."""
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _split_top_level(text: str, sep: str = ",") -> List[str]:
+    """Splits on sep, ignoring separators inside parentheses."""
+    parts, depth, current = [], 0, []
+    for ch in text:
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        if ch == sep and depth == 0:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(ch)
+    parts.append("".join(current))
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _literal(token: str, params: Tuple) -> Any:
+    if token.startswith("$"):
+        return params[int(token[1:]) - 1]
+    if token.startswith("'"):
+        return token[1:-1]
+    return int(token)
+
+
+def _eval_expr(expr: str, row: Dict[str, Any], params: Tuple) -> Any:
+    """Evaluates the small expression subset used in UPDATE ... SET clauses."""
+    expr = expr.strip()
+    if match := re.fullmatch(r"GREATEST\((.*)\)", expr, re.IGNORECASE | re.DOTALL):
+        return max(_eval_expr(arg, row, params) for arg in _split_top_level(match.group(1)))
+    terms = _split_top_level(expr, "+")
+    if len(terms) > 1:
+        return sum(_eval_expr(term, row, params) for term in terms)
+    if expr.upper() == "NOW()":
+        return _now()
+    if expr.upper() == "NULL":
+        return None
+    if expr.startswith("$") or expr.startswith("'") or re.fullmatch(r"-?\d+", expr):
+        return _literal(expr, params)
+    return row.get(expr)
+
+
+@command_trace.trace_db_methods
+class InMemoryDatabaseManager:
+    """Drop-in, dict-backed replacement for DatabaseManager."""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self._rng = random.Random(seed)
+        self.tables: Dict[str, Dict[Any, Dict[str, Any]]] = {}
+        self._next_id: Dict[str, int] = {}
+        self._indexes: Dict[Tuple[str, str], Dict[Any, List[Dict[str, Any]]]] = {}
+        self.pool = None
+
+    # --- Storage helpers ---
+    async def _io(self):
+        """Simulates a database round trip."""
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + self._rng.uniform(0.0, self.jitter))
+        else:
+            await asyncio.sleep(0)
+
+    def _table(self, name: str) -> Dict[Any, Dict[str, Any]]:
+        return self.tables.setdefault(name, {})
+
+    def _invalidate(self, table: str):
+        for key in [key for key in self._indexes if key[0] == table]:
+            del self._indexes[key]
+
+    def _index(self, table: str, column: str) -> Dict[Any, List[Dict[str, Any]]]:
+        """Lazily built equality index, dropped whenever the table changes."""
+        key = (table, column)
+        index = self._indexes.get(key)
+        if index is None:
+            index = {}
+            for row in self._table(table).values():
+                index.setdefault(row.get(column), []).append(row)
+            self._indexes[key] = index
+        return index
+
+    def insert(self, table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Inserts a row (applying schema defaults) and returns the stored row."""
+        pk = PRIMARY_KEYS.get(table, "id")
+        stored = dict(TABLE_DEFAULTS.get(table, {}))
+        stored.update(row)
+        if stored.get(pk) is None:
+            next_id = self._next_id.get(table, 1)
+            stored[pk] = next_id
+        if isinstance(stored[pk], int):
+            self._next_id[table] = max(self._next_id.get(table, 1), stored[pk] + 1)
+        self._table(table)[stored[pk]] = stored
+        self._invalidate(table)
+        return stored
+
+    def seed(self, rows_by_table: Dict[str, Iterable[Dict[str, Any]]]):
+        """Bulk-loads rows, e.g. from a synthetic world generator."""
+        for table, rows in rows_by_table.items():
+            for row in rows:
+                self.insert(table, row)
+
+    def _where(self, table: str, where: Optional[str], params: Tuple) -> List[Dict[str, Any]]:
+        if not where:
+            return list(self._table(table).values())
+        conditions = []
+        for clause in re.split(r"\s+AND\s+", where.strip(), flags=re.IGNORECASE):
+            match = _CONDITION_RE.match(clause.strip())
+            if not match:
+                raise UnsupportedQueryError(f"InMemoryDatabaseManager cannot evaluate WHERE clause: {clause!r}")
+            lowered = match.group(1) is not None
+            column = match.group(1) or match.group(2)
+            value = _literal(match.group(3) or match.group(4), params)
+            conditions.append((column, value, lowered))
+
+        column, value, lowered = conditions[0]
+        if lowered:
+            candidates = [r for r in self._table(table).values() if str(r.get(column, "")).lower() == str(value).lower()]
+        else:
+            candidates = self._index(table, column).get(value, [])
+        for column, value, lowered in conditions[1:]:
+            if lowered:
+                candidates = [r for r in candidates if str(r.get(column, "")).lower() == str(value).lower()]
+            else:
+                candidates = [r for r in candidates if r.get(column) == value]
+        return list(candidates)
+
+    def _select(self, query: str, params: Tuple) -> List[Dict[str, Any]]:
+        match = _SELECT_RE.match(query)
+        if not match:
+            raise UnsupportedQueryError(f"InMemoryDatabaseManager cannot run query: {query.strip()!r}")
+        rows = self._where(match.group("table"), match.group("where"), params)
+
+        if order := match.group("order"):
+            for term in reversed(_split_top_level(order)):
+                words = term.split()
+                column, descending = words[0], len(words) > 1 and words[1].upper() == "DESC"
+                rows.sort(key=lambda r: (r.get(column) is None, r.get(column) if r.get(column) is not None else 0),
+                          reverse=descending)
+        if limit := match.group("limit"):
+            rows = rows[:int(limit)]
+
+        cols = match.group("cols").strip()
+        if cols == "*":
+            return [dict(r) for r in rows]
+        names = [c.strip() for c in cols.split(",")]
+        return [{name: r.get(name) for name in names} for r in rows]
+
+    # --- Connection lifecycle ---
+    async def connect(self):
+        log.info("Using in-memory database (latency %.1f ms, jitter %.1f ms).", self.latency * 1000, self.jitter * 1000)
+
+    async def close(self):
+        log.info("In-memory database closed.")
+
+    # --- Raw query entry points ---
+    async def execute_query(self, query: str, *params) -> str:
+        await self._io()
+        if match := _UPDATE_RE.match(query):
+            table = match.group("table")
+            rows = self._where(table, match.group("where"), params)
+            assignments = []
+            for assignment in _split_top_level(match.group("sets")):
+                column, _, expr = assignment.partition("=")
+                assignments.append((column.strip(), expr))
+            for row in rows:
+                new_values = {column: _eval_expr(expr, row, params) for column, expr in assignments}
+                row.update(new_values)
+            if rows:
+                self._invalidate(table)
+            return f"UPDATE {len(rows)}"
+        if match := _DELETE_RE.match(query):
+            table = match.group("table")
+            pk = PRIMARY_KEYS.get(table, "id")
+            rows = self._where(table, match.group("where"), params)
+            for row in rows:
+                self._table(table).pop(row[pk], None)
+            if rows:
+                self._invalidate(table)
+            return f"DELETE {len(rows)}"
+        raise UnsupportedQueryError(f"InMemoryDatabaseManager cannot execute: {query.strip()!r}")
+
+    async def fetch_one_query(self, query: str, *params) -> Optional[Dict[str, Any]]:
+        await self._io()
+        rows = self._select(query, params)
+        return rows[0] if rows else None
+
+    async def fetch_all_query(self, query: str, *params) -> List[Dict[str, Any]]:
+        await self._io()
+        return self._select(query, params)
+
+    async def init_db(self):
+        """Seeds the same essential rows as DatabaseManager.init_db, if not already present."""
+        if not self._table("races"):
+            self.seed({"races": [
+                {"id": 1, "name": "Chrozalin", "description": "Versatile humans..."},
+                {"id": 2, "name": "Dwarf", "description": "Stout mountain folk..."},
+                {"id": 3, "name": "Elf", "description": "Graceful forest dwellers..."},
+                {"id": 4, "name": "Yan-tar", "description": "Ancient turtle-like people..."},
+                {"id": 5, "name": "Grak", "description": "Towering humanoids..."},
+            ]})
+        if not self._table("classes"):
+            names = ["Warrior", "Mage", "Cleric", "Rogue", "Ranger", "Barbarian", "Druid", "Bard", "Paladin", "Monk"]
+            self.seed({"classes": [{"id": i + 1, "name": n, "description": "..."} for i, n in enumerate(names)]})
+        if not self._table("areas"):
+            self.insert("areas", {"id": 1, "name": "The Void", "description": "..."})
+        if not self._table("rooms"):
+            self.insert("rooms", {"id": 1, "area_id": 1, "name": "The Void", "description": "...",
+                                  "flags": json.dumps(["NODE", "RESPAWN"])})
+        if not self._table("damage_types"):
+            damage_types = [('slash', False), ('pierce', False), ('bludgeon', False), ('fire', True), ('cold', True),
+                            ('lightning', True), ('earth', True), ('arcane', True), ('divine', True),
+                            ('poison', True), ('sonic', True)]
+            self.seed({"damage_types": [{"name": n, "is_magical": m} for n, m in damage_types]})
+        if not self._table("ability_templates"):
+            self.seed({"ability_templates": [{
+                "internal_name": key, "name": data.get('name'), "ability_type": data.get('type'),
+                "class_req": json.dumps(data.get('class_req', [])), "level_req": data.get('level_req', 1),
+                "cost": data.get('cost', 0), "target_type": data.get('target_type'),
+                "effect_type": data.get('effect_type'), "effect_details": json.dumps(data.get('effect_details', {})),
+                "cast_time": data.get('cast_time', 0.0), "roundtime": data.get('roundtime', 1.0),
+                "messages": json.dumps(data.get('messages', {})), "description": data.get('description'),
+            } for key, data in ability_defs.ABILITIES_DATA.items()]})
+        if "time" not in self._table("game_economy"):
+            self.insert("game_economy", {"key": "time", "value": 0, "game_year": 218, "game_month": 7,
+                                         "game_day": 1, "game_hour": 6, "game_minute": 0})
+        if not self._table("players"):
+            self.insert("players", {"username": "tester", "hashed_password": utils.hash_password("password"),
+                                    "email": "tester@example.com", "is_admin": False})
+            self.insert("players", {"username": "admin", "hashed_password": utils.hash_password("password"),
+                                    "email": "admin@example.com", "is_admin": True})
+
+    # --- Item Instance Management Functions ---
+    async def create_item_instance(self, template_id: int, room_id: Optional[int] = None, owner_char_id: Optional[int] = None, container_id: Optional[str] = None, instance_stats: Optional[Dict[str, Any]] = None,
+                                   rng: random.Random = random) -> Optional[Dict[str, Any]]:
+        await self._io()
+        template = self._table("item_templates").get(template_id)
+        if template is None:
+            log.error("In-memory DB: cannot create instance of unknown item template %s", template_id)
+            return None
+        generated_stats = instance_stats or {}
+        for key, target in (("lock_details", None), ("trap_details", "trap")):
+            details = template.get(key)
+            details = json.loads(details) if isinstance(details, str) else details
+            if details:
+                if target:
+                    generated_stats.setdefault(target, details)
+                elif 'is_locked' not in generated_stats:
+                    generated_stats.update(details)
+        row = self.insert("item_instances", {
+            "id": str(uuid.uuid4()), "template_id": template_id, "owner_char_id": owner_char_id,
+            "room_id": room_id, "container_id": container_id,
+            "instance_stats": json.dumps(generated_stats) if generated_stats else '{}',
+            "last_moved_at": _now(),
+        })
+        return dict(row)
+
+    async def fetch_loot_table_entries(self, loot_table_id: int) -> List[Dict[str, Any]]:
+        await self._io()
+        return [dict(r) for r in self._index("mob_loot_table", "mob_template_id").get(loot_table_id, [])]
+
+    async def get_item_instance(self, instance_id: str) -> Optional[Dict[str, Any]]:
+        await self._io()
+        row = self._table("item_instances").get(instance_id)
+        return dict(row) if row else None
+
+    async def get_instances_in_room(self, room_id: int) -> List[Dict[str, Any]]:
+        await self._io()
+        return [dict(r) for r in self._index("item_instances", "room_id").get(room_id, [])]
+
+    async def get_instances_for_character(self, character_id: int) -> List[Dict[str, Any]]:
+        await self._io()
+        by_container = self._index("item_instances", "container_id")
+        found = list(self._index("item_instances", "owner_char_id").get(character_id, []))
+        frontier = list(found)
+        while frontier:
+            children = [child for parent in frontier for child in by_container.get(parent["id"], [])]
+            found.extend(children)
+            frontier = children
+        return [dict(r) for r in found]
+
+    async def update_item_location(self, instance_id: str, room_id: Optional[int] = None,
+                                   owner_char_id: Optional[int] = None, container_id: Optional[str] = None) -> str:
+        await self._io()
+        row = self._table("item_instances").get(instance_id)
+        if not row:
+            return "UPDATE 0"
+        row.update(room_id=room_id, owner_char_id=owner_char_id, container_id=container_id)
+        if room_id is not None:
+            row["last_moved_at"] = _now()
+        self._invalidate("item_instances")
+        return "UPDATE 1"
+
+    async def delete_item_instance(self, instance_id: str) -> str:
+        await self._io()
+        removed = self._table("item_instances").pop(instance_id, None)
+        if removed:
+            self._invalidate("item_instances")
+            for banked in [r for r in self._table("banked_items").values() if r["item_instance_id"] == instance_id]:
+                self._table("banked_items").pop(banked["id"], None)
+            self._invalidate("banked_items")
+        return f"DELETE {1 if removed else 0}"
+
+    async def delete_item_instances(self, instance_ids: List[str]) -> str:
+        await self._io()
+        table = self._table("item_instances")
+        removed = {instance_id for instance_id in instance_ids if table.pop(instance_id, None)}
+        if removed:
+            self._invalidate("item_instances")
+            for banked in [r for r in self._table("banked_items").values() if r["item_instance_id"] in removed]:
+                self._table("banked_items").pop(banked["id"], None)
+            self._invalidate("banked_items")
+        return f"DELETE {len(removed)}"
+
+    # --- Creator Functions (for seeding and building) ---
+    async def create_item_template(self, name: str, item_type: str, description: str, stats: dict, flags: list, damage_type: Optional[str]) -> Optional[int]:
+        await self._io()
+        return self.insert("item_templates", {"name": name, "type": item_type, "description": description,
+                                              "stats": json.dumps(stats), "flags": json.dumps(flags),
+                                              "damage_type": damage_type})["id"]
+
+    async def create_mob_template(self, name: str, level: int, description: str, stats: dict, attacks: list, loot: dict, flags: list) -> Optional[int]:
+        await self._io()
+        return self.insert("mob_templates", {"name": name, "level": level, "description": description,
+                                             "stats": json.dumps(stats), "flags": json.dumps(flags)})["id"]
+
+    async def update_room_exits(self, room_id: int, exits: dict) -> str:
+        await self._io()
+        row = self._table("rooms").get(room_id)
+        if not row:
+            return "UPDATE 0"
+        row["exits"] = json.dumps(exits)
+        return "UPDATE 1"
+
+    # --- Player Functions ---
+    async def load_player_account(self, username: str) -> Optional[Dict[str, Any]]:
+        await self._io()
+        wanted = username.lower()
+        for row in self._table("players").values():
+            if row["username"].lower() == wanted:
+                return dict(row)
+        return None
+
+    async def create_player_account(self, username: str, hashed_password: str, email: str) -> Optional[int]:
+        await self._io()
+        for row in self._table("players").values():
+            if row["username"] == username or row["email"] == email:
+                return None
+        return self.insert("players", {"username": username, "hashed_password": hashed_password,
+                                       "email": email, "last_login": _now()})["id"]
+
+    # --- Character Functions ---
+    async def load_characters_for_account(self, player_id: int) -> List[Dict[str, Any]]:
+        await self._io()
+        rows = self._index("characters", "player_id").get(player_id, [])
+        never_saved = datetime.min.replace(tzinfo=timezone.utc)
+        rows = sorted(rows, key=lambda r: r["id"])
+        rows.sort(key=lambda r: r.get("last_saved") or never_saved, reverse=True)
+        return [{k: r.get(k) for k in ("id", "first_name", "last_name", "level", "race_id", "class_id")} for r in rows]
+
+    async def load_character_data(self, character_id: int) -> Optional[Dict[str, Any]]:
+        await self._io()
+        row = self._table("characters").get(character_id)
+        return dict(row) if row else None
+
+    async def create_character(self, player_id: int, first_name: str, last_name: str, sex: str,
+                               race_id: int, class_id: int, class_name: str, stats: dict,
+                               description: str, hp: float, max_hp: float, essence: float,
+                               max_essence: float, spiritual_tether: int) -> Optional[int]:
+        await self._io()
+        for row in self._index("characters", "player_id").get(player_id, []):
+            if row["first_name"] == first_name and row["last_name"] == last_name:
+                return None
+        new_char_id = self.insert("characters", {
+            "player_id": player_id, "first_name": first_name, "last_name": last_name, "sex": sex,
+            "race_id": race_id, "class_id": class_id, "description": description, "hp": hp, "max_hp": max_hp,
+            "essence": essence, "max_essence": max_essence, "spiritual_tether": spiritual_tether,
+            "coinage": config.STARTING_COINAGE, "created_at": _now(),
+        })["id"]
+        self._write_stats(new_char_id, stats)
+        self.insert("character_equipment", {"character_id": new_char_id, **{slot: None for slot in slots.ALL_SLOTS}})
+        bonuses = class_defs.get_starting_skill_bonuses(class_name)
+        self._write_skills(new_char_id, {name: bonuses.get(name, 0) for name in skill_defs.SKILL_ATTRIBUTE_MAP})
+        return new_char_id
+
+    def _write_core(self, character_id: int, data: dict) -> bool:
+        row = self._table("characters").get(character_id)
+        if not row:
+            return False
+        row.update(data)
+        row["last_saved"] = _now()
+        self._invalidate("characters")
+        return True
+
+    def _write_stats(self, character_id: int, stats: dict):
+        self.insert("character_stats", {"character_id": character_id, **{
+            stat: stats.get(stat, 10) for stat in ("might", "vitality", "agility", "intellect", "aura", "persona")}})
+
+    def _write_skills(self, character_id: int, skills: dict):
+        table = self._table("character_skills")
+        for row in list(self._index("character_skills", "character_id").get(character_id, [])):
+            table.pop(row["id"], None)
+        self._invalidate("character_skills")
+        for name, rank in skills.items():
+            self.insert("character_skills", {"character_id": character_id, "skill_name": name, "rank": rank})
+
+    def _write_abilities(self, character_id: int, abilities: Set[str]):
+        table = self._table("character_abilities")
+        for row in list(self._index("character_abilities", "character_id").get(character_id, [])):
+            table.pop(row["id"], None)
+        self._invalidate("character_abilities")
+        for name in abilities:
+            self.insert("character_abilities", {"character_id": character_id, "ability_internal_name": name})
+
+    def _write_equipment(self, character_id: int, equipment: dict, slot_names: Iterable[str]):
+        row = self._table("character_equipment").get(character_id) or \
+            self.insert("character_equipment", {"character_id": character_id})
+        for slot in slot_names:
+            row[slot] = equipment.get(slot)
+
+    async def save_character_core(self, character_id: int, data: dict) -> str:
+        await self._io()
+        if not data: return "UPDATE 0"
+        return "UPDATE 1" if self._write_core(character_id, data) else "UPDATE 0"
+
+    async def save_character_stats(self, character_id: int, stats: dict) -> str:
+        await self._io()
+        self._write_stats(character_id, stats)
+        return "INSERT 0 1"
+
+    async def save_character_skills(self, character_id: int, skills: dict) -> str:
+        await self._io()
+        self._write_skills(character_id, skills or {})
+        return "COPY" if skills else "DELETE"
+
+    async def save_character_equipment(self, character_id: int, equipment: dict) -> str:
+        await self._io()
+        self._write_equipment(character_id, equipment,
+                              ("head", "torso", "legs", "feet", "hands", "main_hand", "off_hand"))
+        return "INSERT 0 1"
+
+    async def save_character_full(self, char_id: int, core_data: dict, stats: dict, skills: dict,
+                                  equipment: dict, abilities: Set[str], items: List[Tuple[str, Optional[str]]]) -> bool:
+        await self._io()
+        if core_data:
+            self._write_core(char_id, core_data)
+        if stats:
+            self._write_stats(char_id, stats)
+        if skills is not None:
+            self._write_skills(char_id, skills)
+        if equipment:
+            self._write_equipment(char_id, equipment, slots.ALL_SLOTS)
+        if abilities is not None:
+            self._write_abilities(char_id, abilities)
+        if items is not None:
+            item_table = self._table("item_instances")
+            for item_id, container_id in items:
+                if row := item_table.get(item_id):
+                    row["owner_char_id"] = char_id if container_id is None else None
+                    row["container_id"] = container_id
+            self._invalidate("item_instances")
+        return True
+
+    async def get_character_stats(self, character_id: int) -> Optional[Dict[str, Any]]:
+        await self._io()
+        row = self._table("character_stats").get(character_id)
+        return dict(row) if row else None
+
+    async def get_character_skills(self, character_id: int) -> List[Dict[str, Any]]:
+        await self._io()
+        return [{"skill_name": r["skill_name"], "rank": r["rank"]}
+                for r in self._index("character_skills", "character_id").get(character_id, [])]
+
+    async def get_character_equipment(self, character_id: int) -> Optional[Dict[str, Any]]:
+        await self._io()
+        row = self._table("character_equipment").get(character_id)
+        return dict(row) if row else None
+
+    async def get_character_abilities(self, character_id: int) -> Set[str]:
+        await self._io()
+        return {r["ability_internal_name"] for r in self._index("character_abilities", "character_id").get(character_id, [])}
+
+    async def save_character_abilities(self, character_id: int, abilities: Set[str]) -> str:
+        await self._io()
+        self._write_abilities(character_id, abilities or set())
+        return "COPY" if abilities else "DELETE"
+
+    async def update_character_playtime(self, character_id: int, session_seconds: int) -> str:
+        await self._io()
+        row = self._table("characters").get(character_id)
+        if not row:
+            return "UPDATE 0"
+        row["total_playtime_seconds"] = row.get("total_playtime_seconds", 0) + session_seconds
+        return "UPDATE 1"
+
+    # --- Item Functions and Economy
+    async def update_shop_stock(self, shop_inventory_id: int, quantity_change: int):
+        await self._io()
+        row = self._table("shop_inventories").get(shop_inventory_id)
+        if not row or row["stock_quantity"] == -1:
+            return "UPDATE 0"
+        row["stock_quantity"] += quantity_change
+        return "UPDATE 1"
+
+    async def get_character_balance(self, character_id: int) -> int:
+        await self._io()
+        row = self._table("bank_accounts").get(character_id)
+        return row["balance"] if row else 0
+
+    async def update_character_balance(self, character_id: int, amount_change: int) -> str:
+        await self._io()
+        row = self._table("bank_accounts").get(character_id)
+        if row:
+            row["balance"] += amount_change
+        else:
+            self.insert("bank_accounts", {"character_id": character_id, "balance": amount_change})
+        return "INSERT 0 1"
+
+    async def bank_item(self, character_id: int, item_instance_id: str) -> bool:
+        await self._io()
+        row = self._table("item_instances").get(item_instance_id)
+        if not row:
+            return False
+        row["owner_char_id"] = None
+        self._invalidate("item_instances")
+        self.insert("banked_items", {"character_id": character_id, "item_instance_id": item_instance_id,
+                                     "stored_at": _now()})
+        return True
+
+    async def find_banked_item_for_character(self, character_id: int, item_name: str) -> Optional[dict]:
+        await self._io()
+        suffix = item_name.lower()
+        templates = self._table("item_templates")
+        items = self._table("item_instances")
+        for banked in self._index("banked_items", "character_id").get(character_id, []):
+            inst = items.get(banked["item_instance_id"])
+            template = templates.get(inst["template_id"]) if inst else None
+            if template and template["name"].lower().endswith(suffix):
+                return dict(inst)
+        return None
+
+    async def unbank_item(self, character_id: int, item_instance_id: str) -> bool:
+        await self._io()
+        for banked in self._index("banked_items", "character_id").get(character_id, []):
+            if banked["item_instance_id"] == item_instance_id:
+                self._table("banked_items").pop(banked["id"], None)
+                self._invalidate("banked_items")
+                if row := self._table("item_instances").get(item_instance_id):
+                    row["owner_char_id"] = character_id
+                    self._invalidate("item_instances")
+                return True
+        return False
+
+    async def update_item_condition(self, instance_id: str, new_condition: int) -> str:
+        await self._io()
+        row = self._table("item_instances").get(instance_id)
+        if not row:
+            return "UPDATE 0"
+        row["condition"] = new_condition
+        return "UPDATE 1"
+
+    async def update_item_instance_stats(self, instance_id: str, new_stats: dict) -> str:
+        await self._io()
+        row = self._table("item_instances").get(instance_id)
+        if not row:
+            return "UPDATE 0"
+        row["instance_stats"] = json.dumps(new_stats)
+        return "UPDATE 1"
+
+    async def get_game_time(self) -> Optional[Dict[str, Any]]:
+        await self._io()
+        row = self._table("game_economy").get("time")
+        return dict(row) if row else None
+
+    async def save_game_time(self, year: int, month: int, day: int, hour: int, minute: int) -> str:
+        await self._io()
+        row = self._table("game_economy").get("time")
+        if not row:
+            return "UPDATE 0"
+        row.update(game_year=year, game_month=month, game_day=day, game_hour=hour, game_minute=minute)
+        return "UPDATE 1"
@@ -0,0 +1,190 @@
+# game/metrics.py
+"""
+Lightweight runtime metrics with a Prometheus text exporter.
+Everything runs on the event loop thread, so metric updates are plain
+attribute writes with no locking. Values that are cheap to read on demand
+(connection counts, pool usage, world sizes) are gathered by collector
+callbacks only when the endpoint is scraped.
+"""
+import asyncio
+import bisect
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+# A collector yields (metric_name, labels, value) samples at scrape time.
+Sample = Tuple[str, Dict[str, str], float]
+Collector = Callable[[], Iterable[Sample]]
+
+
+class Counter:
+    __slots__ = ("name", "help", "value")
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter",
+                f"{self.name} {self.value:g}"]
+
+
+class Gauge:
+    __slots__ = ("name", "help", "value")
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge",
+                f"{self.name} {self.value:g}"]
+
+
+class Histogram:
+    __slots__ = ("name", "help", "bounds", "buckets", "count", "sum")
+
+    def __init__(self, name: str, help_text: str, bounds: Tuple[float, ...]):
+        self.name = name
+        self.help = help_text
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        running = 0
+        for bound, bucket_count in zip(self.bounds, self.buckets):
+            running += bucket_count
+            lines.append(f'{self.name}_bucket{{le="{bound:g}"}} {running}')
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {self.count}')
+        lines.append(f"{self.name}_sum {self.sum:g}")
+        lines.append(f"{self.name}_count {self.count}")
+        return lines
+
+
+# --- Registry ---
+_metrics: List = []
+_collectors: List[Tuple[str, str, str, Collector]] = []  # (name, type, help, collector)
+
+
+def counter(name: str, help_text: str) -> Counter:
+    metric = Counter(name, help_text)
+    _metrics.append(metric)
+    return metric
+
+
+def gauge(name: str, help_text: str) -> Gauge:
+    metric = Gauge(name, help_text)
+    _metrics.append(metric)
+    return metric
+
+
+def histogram(name: str, help_text: str, bounds: Tuple[float, ...]) -> Histogram:
+    metric = Histogram(name, help_text, bounds)
+    _metrics.append(metric)
+    return metric
+
+
+def register_collector(name: str, metric_type: str, help_text: str, collector: Collector):
+    """Registers a callback evaluated at scrape time for the named metric family."""
+    _collectors.append((name, metric_type, help_text, collector))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def render() -> str:
+    """Renders every metric and collector in Prometheus text exposition format."""
+    lines: List[str] = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    for name, metric_type, help_text, collector in _collectors:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        try:
+            for sample_name, labels, value in collector():
+                lines.append(f"{sample_name}{_format_labels(labels)} {value:g}")
+        except Exception:
+            log.exception("Metrics collector for %s failed.", name)
+    return "\n".join(lines) + "\n"
+
+
+# --- Core metrics updated on hot paths ---
+TICK_DURATION = histogram(
+    "chrozal_tick_duration_seconds", "Time spent running all ticker callbacks for one tick.",
+    (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+TICK_DRIFT = gauge("chrozal_tick_drift_seconds", "How late the most recent tick started versus its interval.")
+TICKS_TOTAL = counter("chrozal_ticks_total", "Ticks processed since startup.")
+AUTOSAVE_DURATION = histogram(
+    "chrozal_autosave_duration_seconds", "Time taken by periodic world autosaves.",
+    (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+CONNECTIONS_TOTAL = counter("chrozal_connections_total", "TCP connections accepted since startup.")
+
+
+# --- HTTP endpoint ---
+async def _handle_scrape(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), timeout=5.0)
+        # Drain headers; we only serve one resource.
+        while True:
+            header = await asyncio.wait_for(reader.readline(), timeout=5.0)
+            if header in (b"\r\n", b"\n", b""):
+                break
+
+        parts = request_line.split()
+        if len(parts) >= 2 and parts[0] == b"GET" and parts[1].split(b"?")[0] in (b"/metrics", b"/"):
+            body = render().encode("utf-8")
+            status = b"200 OK"
+        else:
+            body = b"Not Found\n"
+            status = b"404 Not Found"
+
+        writer.write(
+            b"HTTP/1.1 " + status + b"\r\n"
+            b"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+            b"Content-Length: " + str(len(body)).encode() + b"\r\n"
+            b"Connection: close\r\n\r\n" + body
+        )
+        await writer.drain()
+    except (asyncio.TimeoutError, ConnectionError):
+        pass
+    except Exception:
+        log.exception("Error serving metrics request.")
+    finally:
+        writer.close()
+
+
+async def start_exporter(host: str, port: int) -> Optional[asyncio.AbstractServer]:
+    """Starts the /metrics HTTP endpoint. Returns the server, or None if it could not bind."""
+    try:
+        server = await asyncio.start_server(_handle_scrape, host, port)
+    except OSError:
+        log.exception("Could not start metrics exporter on %s:%s.", host, port)
+        return None
+    log.info("Metrics exporter listening on http://%s:%s/metrics", host, port)
+    return server
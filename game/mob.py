@@ -4,12 +4,12 @@ Represents Mob (Mobile Object / Non-Player Character) instances.
 """
 import math
 import time
-import random
 import json
 import logging
 from typing import TYPE_CHECKING, Optional, Dict, Any, List, Set, Union
 
 from . import utils
+from .roundtime import RoundtimeField
 from .definitions import abilities as ability_defs
 from .character import Character
 
@@ -27,6 +27,7 @@ class Mob:
     AI is very basic (retaliation, random movement, aggression).
     """
     next_instance_id = 1
+    roundtime = RoundtimeField()
 
     @property
     def might_mod(self) -> int: return utils.calculate_modifier(self.stats.get("might", 10))
@@ -89,7 +90,7 @@ class Mob:
                 return effect.get('potency', 0.0)
         return 0.0
 
-    def __init__(self, template_data: Dict[str, Any], current_room: 'Room'):
+    def __init__(self, template_data: Dict[str, Any], current_room: 'Room', world: 'World'):
         """Initializes a Mob instance from template data, applying variance."""
         self.instance_id: int = Mob.next_instance_id
         Mob.next_instance_id += 1
@@ -102,6 +103,8 @@ class Mob:
         self.mob_type: Optional[str] = template_data.get('mob_type')
         self.effects: Dict[str, Dict[str, Any]] = {}
         self.is_hidden: bool = False
+        self.world = world
+        self.rng = world.rng  # The owning world's random streams
 
         # --- FIX: Properly parse all JSONB fields from the template ---
         def _parse_json(data, default_type=dict):
@@ -130,7 +133,7 @@ class Mob:
 
         template_max_hp: int = template_data.get('max_hp', 10)
         if hp_var_pct > 0:
-            hp_multiplier = 1.0 + random.uniform(-hp_var_pct / 100.0, hp_var_pct / 100.0)
+            hp_multiplier = 1.0 + self.rng.ai.uniform(-hp_var_pct / 100.0, hp_var_pct / 100.0)
             self.max_hp = max(1, math.floor(template_max_hp * hp_multiplier))
         else:
             self.max_hp = max(1, template_max_hp)
@@ -139,7 +142,7 @@ class Mob:
         self.stats: Dict[str, int] = {}
         for stat_name, base_value in template_stats.items():
             if stats_var_pct > 0:
-                stat_multiplier = 1.0 + random.uniform(-stats_var_pct / 100.0, stats_var_pct / 100.0)
+                stat_multiplier = 1.0 + self.rng.ai.uniform(-stats_var_pct / 100.0, stats_var_pct / 100.0)
                 self.stats[stat_name] = max(1, math.floor(base_value * stat_multiplier))
             else:
                 self.stats[stat_name] = base_value
@@ -164,7 +167,7 @@ class Mob:
         """Selects an attack from the available list (basic random choice)."""
         if not self.attacks:
             return None
-        return random.choice(self.attacks)
+        return self.rng.combat.choice(self.attacks)
 
     def can_see(self) -> bool:
         """Determines if the mob can see in its current room."""
@@ -174,13 +177,10 @@ class Mob:
         if self.has_flag("INFRAVISION"):
             return True
         # If the room isn't dark, you can see.
-        if "DARK" not in self.location.flags:
+        if not self.location.is_dark(self.world):
             return True
         # If it is dark, check if any players in the room have a light
-        for char in self.location.characters:
-            if char.is_holding_light_source():
-                return True
-        return False
+        return self.location.light_sources > 0
     
     def get_stealth_value(self) -> int:
         """
@@ -254,17 +254,17 @@ class Mob:
         
         if self.has_flag("CAN_FLY"):
             # 10% chance per tick to consider changing flight state
-            if random.random() < 0.1:
+            if world.rng.ai.random() < 0.1:
                 is_currently_flying = self.has_flag("FLYING")
                 
                 if is_currently_flying:
                     # If fighting a target on the ground, 25% chance to land
-                    if self.is_fighting and random.random() < 0.25:
+                    if self.is_fighting and world.rng.ai.random() < 0.25:
                         self.flags.discard("FLYING")
                         await self.location.broadcast(f"\r\n{self.name.capitalize()} lands on the ground to attack!\r\n")
                 else:
                     # If not fighting, 20% chance to take off
-                    if not self.is_fighting and random.random() < 0.20:
+                    if not self.is_fighting and world.rng.ai.random() < 0.20:
                         self.flags.add("FLYING")
                         await self.location.broadcast(f"\r\n{self.name.capitalize()} takes to the air!\r\n")
 
@@ -273,7 +273,7 @@ class Mob:
             potential_targets = [char for char in self.location.characters if char.is_alive()]
             if potential_targets:
                 self.is_hidden = False # Reveal to attack
-                target = random.choice(potential_targets)
+                target = world.rng.ai.choice(potential_targets)
                 self.target = target
                 self.is_fighting = True
 
@@ -306,7 +306,7 @@ class Mob:
                         if char.is_alive() and not char.is_hidden
                     ]
                     if potential_targets:
-                        self.target = random.choice(potential_targets)
+                        self.target = world.rng.ai.choice(potential_targets)
                         self.is_fighting = True
                         await self.location.broadcast(f"\r\n{self.name.capitalize()} spots {self.target.name}!\r\n")
 
@@ -339,18 +339,19 @@ class Mob:
             
         # If not fighting, has the CAN_HIDE flag, and isn't already hidden, try to hide.
         if not self.is_fighting and self.has_flag("CAN_HIDE") and not self.is_hidden:
-            if random.random() < 0.25: # 25% chance per tick to attempt to hide
+            if world.rng.ai.random() < 0.25: # 25% chance per tick to attempt to hide
                 self.is_hidden = True
                 self.roundtime = 2.0 # Hiding takes a moment
+                world.perception_checks.notify(self.location)
                 await self.location.broadcast(f"\r\n{self.name.capitalize()} skitters into the shadows, disappearing from sight.\r\n")
                 return
 
         # --- Movement Logic ---
         if not self.is_fighting and self.movement_chance > 0 and not self.has_flag("STATIONARY"):
-            if random.random() < self.movement_chance * dt:
+            if world.rng.ai.random() < self.movement_chance * dt:
                 possible_exits = list(self.location.exits.keys())
                 if possible_exits:
-                    await self.move(random.choice(possible_exits), world)
+                    await self.move(world.rng.ai.choice(possible_exits), world)
                     return # After moving, the mob's turn is over for this tick.
 
         # --- Aggressive Check ---
@@ -360,10 +361,14 @@ class Mob:
                 if char.is_alive() and not char.is_hidden
             ]
             if potential_targets:
-                self.target = random.choice(potential_targets)
+                self.target = world.rng.ai.choice(potential_targets)
                 self.is_fighting = True
                 await self.location.broadcast(f"\r\n{self.name.capitalize()} becomes aggressive towards {self.target.name}!\r\n")
 
+    def __hash__(self) -> int:
+        # Stable across runs, so room.mobs iterates in a reproducible order (see Character.__hash__).
+        return self.instance_id
+
     def __repr__(self) -> str:
         return f"<Mob Inst:{self.instance_id} Tmpl:{self.template_id} '{self.name}' HP:{self.hp}/{self.max_hp}>"
 
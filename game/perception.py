@@ -0,0 +1,132 @@
+# game/perception.py
+"""
+Event-driven stealth detection.
+Rooms are queued on their world's scheduler (World.perception_checks) for
+a perception check when something that could change the outcome happens
+there: someone hides, or someone enters a room where they could spot or be
+spotted. While a room still holds both a hider and someone who could spot
+them, it is queued again after PERCEPTION_CHECK_INTERVAL_SECONDS. Rooms
+without both are dropped, and World.update_stealth_checks stops rolling
+for the tick once PERCEPTION_MAX_ROLLS_PER_TICK is reached; the rest wait
+a tick.
+"""
+import heapq
+import itertools
+import logging
+import random
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+import config
+from . import utils
+
+if TYPE_CHECKING:
+    from .room import Room
+
+log = logging.getLogger(__name__)
+
+
+class PerceptionScheduler:
+    """Heap of rooms due a perception check, on a clock advanced by the ticker."""
+    def __init__(self):
+        self.now = 0.0
+        self._heap: List[Tuple[float, int, 'Room']] = []
+        self._due: Dict[int, float] = {}
+        self._seq = itertools.count()
+
+    def notify(self, room: Optional['Room'], delay: float = 0.0):
+        """Queues room for a check after delay seconds, unless one is already due sooner."""
+        if room is None:
+            return
+        due = self.now + delay
+        if self._due.get(room.dbid, float("inf")) <= due:
+            return
+        self._due[room.dbid] = due
+        heapq.heappush(self._heap, (due, next(self._seq), room))
+
+    def advance(self, dt: float):
+        self.now += dt
+
+    def pop_due(self) -> Optional['Room']:
+        """Returns the next room whose check is due, or None."""
+        heap = self._heap
+        while heap and heap[0][0] <= self.now:
+            due, _seq, room = heapq.heappop(heap)
+            if self._due.get(room.dbid) == due:
+                del self._due[room.dbid]
+                return room
+        return None
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+
+
+def on_enter(room: 'Room', entity):
+    """Queues a check if the newcomer could spot, or be spotted by, someone in the room."""
+    if not room.characters:
+        return  # Only characters spot mobs, and mobs only look for characters
+    if entity.is_hidden or any(c.is_hidden for c in room.characters) or any(m.is_hidden for m in room.mobs):
+        entity.world.perception_checks.notify(room)
+
+
+async def check_room(room: 'Room', skill_rng: random.Random) -> Tuple[int, bool]:
+    """
+    Lets everyone in the room try to spot each hider. Returns the number of
+    rolls made and whether the room still needs checking later.
+    """
+    from .character import Character  # Imported late; character imports most of the game.
+
+    hiders = [c for c in room.characters if c.is_hidden]
+    hiders += [m for m in room.mobs if m.is_hidden and m.is_alive()]
+    if not hiders:
+        return 0, False
+    living_chars = [c for c in room.characters if c.is_alive()]
+    living_mobs = [m for m in room.mobs if m.is_alive()]
+
+    rolls = 0
+    still_relevant = False
+    for hidden_entity in hiders:
+        is_character = isinstance(hidden_entity, Character)
+        # Determine the stealth value (DC) of the hidden entity
+        stealth_dc = hidden_entity.get_stealth_dc() if is_character else hidden_entity.get_stealth_value()
+
+        # Observers exclude the hider and, for characters, their group members.
+        observers = [c for c in living_chars if c is not hidden_entity
+                     and not (is_character and hidden_entity.group and c in hidden_entity.group.members)]
+        mob_observers = living_mobs if is_character else []
+        if not observers and not mob_observers:
+            continue
+        still_relevant = True
+
+        for observer in observers:
+            rolls += 1
+            if utils.skill_check(observer, "perception", dc=stealth_dc)['success']:
+                hidden_entity.is_hidden = False
+                if is_character:
+                    await hidden_entity.send(f"<R>You have been spotted by {observer.name}!<x>")
+                await observer.send(f"<Y>You spot {hidden_entity.name} hiding in the shadows!<x>")
+                await room.broadcast(
+                    f"\r\n{observer.name} spots {hidden_entity.name} hiding in the shadows!\r\n",
+                    exclude={observer, hidden_entity}
+                )
+                break # Stop checking once spotted
+
+        # Mobs use their level * 2 as perception skill
+        for mob in mob_observers:
+            if not hidden_entity.is_hidden:
+                break
+            rolls += 1
+            roll = skill_rng.randint(1, 20)
+            total = roll + mob.level * 2
+            success = total >= stealth_dc
+            log.debug("Mob %s (Lvl %d) perception: Roll %d + %d = %d vs DC %d = %s", mob.name, mob.level,
+                      roll, mob.level * 2, total, stealth_dc, "SUCCESS" if success else "FAIL")
+            if success:
+                hidden_entity.is_hidden = False
+                await hidden_entity.send(f"<R>{mob.name.capitalize()} spots you!<x>")
+                await room.broadcast(f"\r\n{mob.name.capitalize()} spots {hidden_entity.name}!\r\n",
+                                     exclude={hidden_entity})
+
+    if still_relevant:
+        still_relevant = any(h.is_hidden for h in hiders)
+    return rolls, still_relevant
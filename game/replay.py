@@ -0,0 +1,95 @@
+# game/replay.py
+"""
+Command recording and deterministic replay.
+While a recorder is active, process_command appends every command with the
+tick it arrived on (counted from when recording started). Replaying the file
+against the same starting world and RNG seed - feeding each command in just
+before its tick, then stepping the ticker with a fixed dt - reproduces the
+workload, so profiles and benchmark comparisons see identical runs.
+"""
+import json
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple, Any, TYPE_CHECKING
+
+from . import ticker
+
+if TYPE_CHECKING:
+    from .character import Character
+    from .world import World
+
+log = logging.getLogger(__name__)
+
+CommandsByTick = Dict[int, List[Tuple[int, str]]]
+
+
+class CommandRecorder:
+    """Appends commands as JSON lines: a header, then {"tick", "char", "line"} records."""
+    def __init__(self, path: str, seed: Optional[int], metadata: Optional[Dict[str, Any]] = None):
+        self.path = path
+        self.start_tick = ticker.tick_number()
+        self.count = 0
+        self._file = open(path, "w", encoding="utf-8")
+        header = {"type": "header", "seed": seed, **(metadata or {})}
+        self._file.write(json.dumps(header) + "\n")
+
+    def record(self, character: 'Character', line: str):
+        entry = {"tick": ticker.tick_number() - self.start_tick, "char": character.dbid, "line": line}
+        self._file.write(json.dumps(entry) + "\n")
+        self.count += 1
+
+    def close(self):
+        self._file.close()
+
+
+recorder: Optional[CommandRecorder] = None
+
+
+def start_recording(path: str, seed: Optional[int], metadata: Optional[Dict[str, Any]] = None) -> CommandRecorder:
+    global recorder
+    stop_recording()
+    recorder = CommandRecorder(path, seed, metadata)
+    log.info("Recording commands to %s (seed %s).", path, seed)
+    return recorder
+
+
+def stop_recording():
+    global recorder
+    if recorder:
+        recorder.close()
+        log.info("Stopped recording: %d commands written to %s.", recorder.count, recorder.path)
+        recorder = None
+
+
+def load_recording(path: str) -> Tuple[Dict[str, Any], CommandsByTick]:
+    """Returns (header, {tick: [(character_id, line), ...]})."""
+    header: Dict[str, Any] = {}
+    commands: CommandsByTick = defaultdict(list)
+    with open(path, encoding="utf-8") as f:
+        for raw in f:
+            entry = json.loads(raw)
+            if entry.get("type") == "header":
+                header = entry
+            else:
+                commands[entry["tick"]].append((entry["char"], entry["line"]))
+    return header, commands
+
+
+async def replay(world: 'World', commands: CommandsByTick, ticks: int, dt: float) -> int:
+    """
+    Feeds recorded commands to their characters tick by tick, running the
+    ticker after each batch. Returns the number of commands replayed.
+    """
+    from .commands import handler  # Imported late; handler imports most of the game.
+
+    replayed = 0
+    for tick in range(ticks):
+        for character_id, line in commands.get(tick, ()):
+            character = world.get_active_character(character_id)
+            if character is None:
+                log.warning("Replay: character %s is not active; skipping %r", character_id, line)
+                continue
+            await handler.process_command(character, world, line)
+            replayed += 1
+        await ticker.run_tick(dt)
+    return replayed
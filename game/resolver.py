@@ -3,16 +3,16 @@
 Coordinates combat resolution by calling specialized modules.
 """
 import logging
-import random
 import math
 import time
 import json
+import random
 from typing import Union, Dict, Any, Optional, Tuple, List, TYPE_CHECKING
 
 from . import utils
 
 # The coordinator now imports all its helper modules
-from .combat import hit_resolver, damage_calculator, outcome_handler
+from .combat import hit_resolver, damage_calculator, outcome_handler, evaluation
 from .character import Character
 from .mob import Mob
 from .item import Item
@@ -27,17 +27,9 @@ if TYPE_CHECKING:
 
 log = logging.getLogger(__name__)
 
-def roll_exploding_dice(max_roll: int) -> int:
+def roll_exploding_dice(max_roll: int, rng: random.Random) -> int:
     """Rolls a die, exploding on the maximum result up to 10 times."""
-    if max_roll <= 0: return 0
-    total, rolls, max_explosions = 0, 0, 10
-    while rolls < max_explosions:
-        roll = random.randint(1, max_roll)
-        total += roll
-        if roll < max_roll:
-            break
-        rolls += 1
-    return total
+    return evaluation.roll_exploding_dice(max_roll, rng)
 
 async def _check_and_break_concentration(target: Union['Character', 'Mob'], damage: int):
     """
@@ -96,7 +88,7 @@ async def resolve_physical_attack(
             use_rar = True
 
     # ---Resolve Hit/Miss ---
-    hit_result = hit_resolver.check_physical_hit(attacker, target, use_rar=use_rar, hit_modifier=hit_modifier)
+    hit_result = hit_resolver.check_physical_hit(attacker, target, world.rng.combat, use_rar=use_rar, hit_modifier=hit_modifier)
     rt_penalty = attacker.total_av * 0.05 if isinstance(attacker, Character) else 0.0
     
     if not hit_result.is_hit:
@@ -112,7 +104,7 @@ async def resolve_physical_attack(
     if isinstance(target, Character) and (weapon := target._equipped_items.get("main_hand")):
         parry_skill_rank = target.get_skill_rank("parrying")
         parry_chance = parry_skill_rank * 0.005
-        if random.random() < parry_chance:
+        if world.rng.combat.random() < parry_chance:
             await attacker.send(f"<y>{target.name} parries your attack with their {weapon.name}!<x>")
             await target.send(f"<g>You parry {attacker.name}'s attack with your {weapon.name}!<x>")
             attacker.roundtime = 1.0 + rt_penalty + attacker.slow_penalty
@@ -122,7 +114,7 @@ async def resolve_physical_attack(
     if isinstance(target, Character) and (shield := target.get_shield()):
         shield_skill_rank = target.get_skill_rank("shield usage")
         block_chance = shield.block_chance + (math.floor(shield_skill_rank / 10) * 0.01)
-        if random.random() < block_chance:
+        if world.rng.combat.random() < block_chance:
             await attacker.send(f"<y>{target.name} blocks your attack with their shield!<x>")
             await target.send(f"<g>You block {attacker.name}'s attack with your shield!<x>")
             attacker.roundtime = wpn_speed + rt_penalty + attacker.slow_penalty
@@ -130,7 +122,7 @@ async def resolve_physical_attack(
         
     # ---Calculate and Mitigate Damage ---
     # <-- FIX 2: Pass the new 'ability_mods' argument to the calculator
-    damage_info = damage_calculator.calculate_physical_damage(attacker, attack_source, hit_result.is_crit, ability_mods=ability_mods)
+    damage_info = damage_calculator.calculate_physical_damage(attacker, attack_source, hit_result.is_crit, world.rng.combat, ability_mods=ability_mods)
     
     damage_info.attack_name = attack_name
     if damage_multiplier != 1.0:
@@ -178,7 +170,7 @@ async def resolve_ranged_attack(
         hit_modifier += 4 # Same bonus applies
 
     # --- Resolve Hit/Miss (using RAR instead of MAR) ---
-    hit_result = hit_resolver.check_physical_hit(attacker, target, use_rar=True, hit_modifier=hit_modifier)
+    hit_result = hit_resolver.check_physical_hit(attacker, target, world.rng.combat, use_rar=True, hit_modifier=hit_modifier)
 
     if not hit_result.is_hit:
         roll_details = f"<i>[Roll: {hit_result.roll} + RAR: {hit_result.attacker_rating} vs DV: {hit_result.target_dv}]<x>"
@@ -193,7 +185,7 @@ async def resolve_ranged_attack(
     if isinstance(target, Character) and (shield := target.get_shield()):
         shield_skill_rank = target.get_skill_rank("shield usage")
         block_chance = shield.block_chance + (math.floor(shield_skill_rank / 10) * 0.01)
-        if random.random() < block_chance:
+        if world.rng.combat.random() < block_chance:
             await attacker.send(f"<y>{target.name} blocks your attack with their shield!<x>")
             await target.send(f"<g>You block {attacker.name}'s attack with your shield!<x>")
             attacker.roundtime = wpn_speed + rt_penalty + attacker.slow_penalty
@@ -201,7 +193,7 @@ async def resolve_ranged_attack(
         
     # --- Calculate and Mitigate Damage ---
     # Damage is primarily from the weapon, with a possible bonus from ammo
-    damage_info = damage_calculator.calculate_physical_damage(attacker, weapon, hit_result.is_crit)
+    damage_info = damage_calculator.calculate_physical_damage(attacker, weapon, hit_result.is_crit, world.rng.combat)
     
     # Add bonus from ammo
     ammo_bonus = ammo.instance_stats.get("damage_bonus", 0)
@@ -245,7 +237,7 @@ async def resolve_magical_attack(
         school = effect_details.get("school", "Arcane")
         rating_name = "APR" if school == "Arcane" else "DPR"
 
-        hit_result = hit_resolver.check_magical_hit(caster, target, school)
+        hit_result = hit_resolver.check_magical_hit(caster, target, school, world.rng.combat)
 
         if not hit_result.is_hit:
             roll_details = f"<i>[Roll: {hit_result.roll} + {rating_name}: {hit_result.attacker_rating} vs DV: {hit_result.target_dv}]<x>"
@@ -256,7 +248,7 @@ async def resolve_magical_attack(
             return
     
     # ---Calculate Damage ---
-    damage_info = damage_calculator.calculate_magical_damage(caster, spell_data, hit_result.is_crit)
+    damage_info = damage_calculator.calculate_magical_damage(caster, spell_data, hit_result.is_crit, world.rng.combat)
 
     weather_mod = _get_weather_damage_modifier(caster.location, damage_info.damage_type)
     if weather_mod != 1.0:
@@ -374,7 +366,7 @@ async def resolve_ability_effect(
         if effect_details.get("is_cone_aoe"):
             primary_target = target
             other_mobs = [m for m in caster.location.mobs if m.is_alive() and m != primary_target]
-            random.shuffle(other_mobs)
+            world.rng.combat.shuffle(other_mobs)
             
             max_targets = effect_details.get("max_aoe_targets", 1)
             secondary_targets = other_mobs[:max_targets - 1]
@@ -401,7 +393,7 @@ async def resolve_ability_effect(
             primary_target = target
             
             other_mobs = [m for m in caster.location.mobs if m.is_alive() and m != primary_target]
-            random.shuffle(other_mobs)
+            world.rng.combat.shuffle(other_mobs)
             
             max_targets = effect_details.get("max_cleave_targets", 1)
             secondary_targets = other_mobs[:max_targets - 1]
@@ -487,6 +479,8 @@ async def resolve_ability_effect(
 
         for key in effects_to_remove:
             del target.effects[key]
+        if isinstance(target, Character):
+            target.refresh_light()
         
         await caster.send(f"You cure the {cure_type} afflicting {target.name}.")
         if isinstance(target, Character) and target != caster:
@@ -497,9 +491,9 @@ async def resolve_ability_effect(
             await caster.send("You need a shield equipped for that!")
             return
         
-        if perform_hit_check(caster, target, effect_details.get("mar_modifier_mult", 1.0)):
+        if perform_hit_check(caster, target, world.rng.combat, effect_details.get("mar_modifier_mult", 1.0)):
             await caster.location.broadcast(f"\r\n{caster.name.capitalize()} bashes {target.name}!\r\n", exclude={})
-            if random.random() < effect_details.get("stun_chance", 0.0):
+            if world.rng.combat.random() < effect_details.get("stun_chance", 0.0):
                 stun_duration = effect_details.get("stun_duration", 3.0)
                 target.roundtime += stun_duration
                 await caster.location.broadcast(f"\r\n{target.name} is stunned!\r\n", exclude={})
@@ -513,8 +507,8 @@ async def resolve_ability_effect(
         attacker_mod = caster.get_skill_modifier(contest_details["attacker_skill"])
         defender_mod = target.get_skill_modifier(contest_details["defender_skill"])
 
-        attacker_roll = random.randint(1, 20) + attacker_mod
-        defender_roll = random.randint(1, 20) + defender_mod
+        attacker_roll = world.rng.combat.randint(1, 20) + attacker_mod
+        defender_roll = world.rng.combat.randint(1, 20) + defender_mod
 
         if attacker_roll > defender_roll:
             await caster.send(f"<g>You successfully trip {target.name}!<x>")
@@ -551,20 +545,20 @@ async def apply_dot_damage(target: Union[Character, Mob], effect_data: Dict[str,
 
         await outcome_handler.handle_defeat(EffectAttacker(), target, world)
 
-def determine_loot(loot_table: Dict[str, Any]) -> Tuple[int, List[int]]:
+def determine_loot(loot_table: Dict[str, Any], rng: random.Random) -> Tuple[int, List[int]]:
     """Calculates loot based on the provided loot_table dictionary."""
     dropped_coinage = 0
     dropped_item_ids = []
 
     if (max_coinage := loot_table.get("coinage_max", 0)) and isinstance(max_coinage, int):
-        dropped_coinage = random.randint(0, max_coinage)
+        dropped_coinage = rng.randint(0, max_coinage)
 
     if (item_list := loot_table.get("items", [])) and isinstance(item_list, list):
         for item_info in item_list:
             if isinstance(item_info, dict):
                 if (template_id := item_info.get("template_id")) and \
                    (chance := item_info.get("chance", 0.0)) and \
-                   (random.random() < chance):
+                   (rng.random() < chance):
                     dropped_item_ids.append(template_id)
     
     return dropped_coinage, dropped_item_ids
@@ -586,11 +580,12 @@ async def award_xp_to_character(character: Character, xp_amount: int):
     elif not character.group:
         await character.send("Your mind cannot hold any more raw experience right now.")
 
-def perform_hit_check(attacker: Union[Character, Mob], target: Union[Character, Mob], mar_mult: float = 1.0) -> bool:
+def perform_hit_check(attacker: Union[Character, Mob], target: Union[Character, Mob], rng: random.Random,
+                      mar_mult: float = 1.0) -> bool:
     """ Basic hit check logic (d20 + MAR*mult vs DV). """
     mod_mar = math.floor(attacker.mar * mar_mult)
     target_dv = target.dv
-    hit_roll = random.randint(1, 20)
+    hit_roll = rng.randint(1, 20)
     if hit_roll == 1: return False
     if hit_roll == 20: return True
     return (mod_mar + hit_roll) >= target_dv
@@ -605,7 +600,7 @@ async def apply_heal(caster: Character, target: Union[Character, Mob], effect_de
     if not target.is_alive() and isinstance(target, Mob):
         return
 
-    heal_amount = effect_details.get("heal_base", 0) + random.randint(0, effect_details.get("heal_rng", 0))
+    heal_amount = effect_details.get("heal_base", 0) + world.rng.combat.randint(0, effect_details.get("heal_rng", 0))
     if heal_amount <= 0: return
 
     was_dying = isinstance(target, Character) and target.status == "DYING"
@@ -684,6 +679,8 @@ async def apply_effect(caster: Union[Character, Mob], target: Union[Character, M
         "source_ability_key": ability_data.get("internal_name")
     }
     target.is_dirty = True
+    if isinstance(target, Character):
+        target.refresh_light()  # "Magical Light" counts as a carried light
     log.info("Applied effect '%s' to %s for %.1f seconds.", effect_name, target.name, duration)
 
     # --- Handle Immediate Secondary Effects ---
@@ -731,6 +728,8 @@ async def resolve_effect_expiration(target: Union[Character, Mob], effect_key: s
 
     log.info(f"Effect '{effect_key}' expired for {target.name}.")
     target.is_dirty = True
+    if isinstance(target, Character):
+        target.refresh_light()
 
     # --- Revert Stat Changes ---
     stat_affected = effect_data.get("stat_affected")
@@ -0,0 +1,35 @@
+# game/rng.py
+"""
+Named, seedable random streams.
+Each subsystem draws from its own random.Random so that seeding one run
+reproduces its workload exactly, and so that extra draws in one subsystem
+(say, a new combat roll) do not shift the sequence seen by another.
+
+Each World owns its own RandomStreams as world.rng, so two worlds in one
+process (replay and benchmark tools) never share or reseed each other's
+streams. Code that draws is handed the world, or the stream it needs.
+"""
+import random
+from typing import Optional
+
+STREAM_NAMES = ("combat", "ai", "weather", "loot", "ambient", "skill")
+
+
+class RandomStreams:
+    """One random.Random per subsystem, all derived from a single seed."""
+    __slots__ = ("seed_value",) + STREAM_NAMES
+
+    def __init__(self, seed: Optional[int] = None):
+        self.seed(seed)
+
+    def seed(self, seed: Optional[int] = None):
+        """Reseeds every stream in place. None draws a fresh seed from the OS."""
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        self.seed_value = seed
+        for name in STREAM_NAMES:
+            setattr(self, name, random.Random(f"{seed}:{name}"))
+
+    def __repr__(self) -> str:
+        return f"<RandomStreams seed={self.seed_value}>"
+
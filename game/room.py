@@ -7,6 +7,9 @@ import textwrap
 from .item import Item
 from typing import Set, Dict, Any, Optional, List, Union, TYPE_CHECKING
 from . import utils
+from . import perception
+from . import lighting
+from . import broadcast
 
 
 # FIX: Import Mob for check_respawn
@@ -47,24 +50,39 @@ class Room:
         
         # Runtime attributes
         self.characters: Set['Character'] = set()
+        # Shared by every room in the area once World.build indexes it.
+        self.area_characters: Set['Character'] = set()
         self.mobs: Set['Mob'] = set()
+        self.light_sources: int = 0  # Characters here holding a lit light (see game/lighting.py)
         self.coinage: int = db_data.get('coinage', 0)
         self.item_instance_ids: List[str] = []
         
     def add_character(self, character: 'Character'):
         """Adds a character object to the room."""
+        if character in self.characters:
+            return
         self.characters.add(character)
+        self.area_characters.add(character)
+        if character.carries_light:
+            self.light_sources += 1
+        perception.on_enter(self, character)
     
     def remove_character(self, character: 'Character'):
         """Removes a character object from the room."""
+        if character not in self.characters:
+            return
         self.characters.discard(character)
+        self.area_characters.discard(character)
+        if character.carries_light:
+            self.light_sources -= 1
 
     def has_light_source(self) -> bool:
         """Returns True if any character in the room has a lit light source."""
-        for char in self.characters:
-            if char.is_holding_light_source():
-                return True
-        return False
+        return self.light_sources > 0
+
+    def is_dark(self, world: 'World') -> bool:
+        """True if the room itself gives no light right now; carried lights are separate."""
+        return lighting.is_dark(self.flags, world.night)
 
     def get_item_instance_by_name(self, item_name: str, world: 'World') -> Optional['Item']:
         name_lower = item_name.lower()
@@ -138,13 +156,7 @@ class Room:
     
     async def broadcast(self, message: str, exclude: Optional[Set[Union['Character', 'Mob']]] = None):
         """Sends a message to all characters in the room, optionally excluding some."""
-        tasks = [
-            char.send(message, add_newline=False) 
-            for char in self.characters 
-            if not exclude or char not in exclude
-        ]
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+        await broadcast.fan_out(self.characters, message, add_newline=False, exclude=exclude)
 
     def get_character_by_name(self, name: str) -> Optional['Character']:
         """Finds the first character in the room matching their first name (case-insensitive)."""
@@ -157,6 +169,7 @@ class Room:
     def add_mob(self, mob: 'Mob'):
         self.mobs.add(mob)
         mob.location = self
+        perception.on_enter(self, mob)
 
     def remove_mob(self, mob: 'Mob'):
         self.mobs.discard(mob)
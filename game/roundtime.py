@@ -0,0 +1,58 @@
+# game/roundtime.py
+"""
+Roundtime deadlines for characters and mobs.
+Instead of every entity's roundtime being decremented each tick, setting a
+roundtime records a deadline on its world's clock (World.roundtimes), which
+World.update_roundtimes advances by dt, and pushes it onto a heap. Reading roundtime gives the
+time left until that deadline, so it behaves exactly like the old counter
+to the rest of the code. Each tick only pops the deadlines that have
+passed, so the cost follows the entities whose roundtime actually ran out.
+"""
+import heapq
+import itertools
+from typing import List, Tuple, Any
+
+
+class RoundtimeScheduler:
+    """Heap of (deadline, seq, entity). Entries replaced by a newer roundtime are skipped when popped."""
+    def __init__(self):
+        self.now = 0.0
+        self._heap: List[Tuple[float, int, Any]] = []
+        self._seq = itertools.count()
+
+    def schedule(self, entity, seconds: float) -> float:
+        """Returns the deadline for a roundtime of seconds starting now."""
+        if seconds <= 0:
+            return self.now
+        deadline = self.now + seconds
+        heapq.heappush(self._heap, (deadline, next(self._seq), entity))
+        return deadline
+
+    def advance(self, dt: float) -> List[Any]:
+        """Moves the clock on by dt and returns the entities whose roundtime just ran out."""
+        self.now += dt
+        expired = []
+        heap = self._heap
+        while heap and heap[0][0] <= self.now:
+            deadline, _seq, entity = heapq.heappop(heap)
+            if entity.__dict__.get("_rt_deadline") == deadline:
+                expired.append(entity)
+        return expired
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class RoundtimeField:
+    """
+    The roundtime attribute: seconds left until the entity's deadline, never
+    negative. The entity's world must be set before roundtime is first assigned.
+    """
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        remaining = obj.__dict__.get("_rt_deadline", 0.0) - obj.world.roundtimes.now
+        return remaining if remaining > 0 else 0.0
+
+    def __set__(self, obj, value: float):
+        obj.__dict__["_rt_deadline"] = obj.world.roundtimes.schedule(obj, value)
@@ -0,0 +1,260 @@
+# game/telnet.py
+"""
+Incremental telnet input parsing.
+TelnetParser is a state machine fed whatever arrives on the socket (packets
+of plain text and line endings skip it and are split with bytes methods;
+anything else is walked a byte at a time). It strips IAC command and
+subnegotiation sequences, turns IAC IAC back into a literal 255, applies
+backspace/delete, and splits the rest into lines on LF (CR and NUL are
+dropped). A line longer than the limit keeps its first max_line_length
+bytes and the rest is discarded as it arrives, so a client cannot make the
+server buffer an unbounded line; a UTF-8 character split by the cut is
+dropped whole rather than left to decode as a replacement character.
+
+TelnetStream wraps an asyncio StreamReader/StreamWriter pair for the
+connection and creation handlers. Each read is parsed in one pass, so a
+packet holding many commands yields all of them, and readline() serves
+queued lines without touching the socket again. Option negotiation is
+answered by refusing whatever the client offers or asks for, except MCCP2.
+
+MCCP2 (option 86): when config.MCCP_ENABLED, the server offers
+IAC WILL COMPRESS2. A client answering IAC DO COMPRESS2 gets
+IAC SB COMPRESS2 IAC SE, after which everything TelnetWriter sends goes
+through one zlib stream for the life of the connection. Each write is
+one message, and ends with a sync flush so the client can show it
+without waiting for more.
+"""
+import asyncio
+import logging
+import zlib
+from collections import deque
+from typing import Callable, Deque, List, Optional, Set, Tuple
+
+import config
+
+log = logging.getLogger(__name__)
+
+# Telnet command bytes (RFC 854)
+IAC, DONT, DO, WONT, WILL, SB, SE = 255, 254, 253, 252, 251, 250, 240
+NOP, GA = 241, 249
+COMPRESS2 = 86  # MCCP2
+BS, DEL, CR, LF, NUL = 0x08, 0x7F, 0x0D, 0x0A, 0x00
+
+READ_CHUNK_SIZE = 4096  # Bytes requested from the socket per read
+MAX_SUBNEGOTIATION_LENGTH = 1024  # Longer SB payloads are cut off; we don't use them anyway
+
+# Bytes that need the state machine; packets without any take the fast path
+_SPECIAL_BYTES = (bytes((IAC,)), bytes((BS,)), bytes((DEL,)))
+
+# Parser states
+_DATA, _IAC, _OPTION, _SB, _SB_IAC = range(5)
+
+
+class TelnetParser:
+    """
+    Turns raw client bytes into lines. Negotiation requests are passed to
+    on_negotiate(command, option) and subnegotiations to on_subnegotiate(option, payload).
+    """
+    def __init__(self, max_line_length: int,
+                 on_negotiate: Optional[Callable[[int, int], None]] = None,
+                 on_subnegotiate: Optional[Callable[[int, bytes], None]] = None):
+        self.max_line_length = max_line_length
+        self.on_negotiate = on_negotiate
+        self.on_subnegotiate = on_subnegotiate
+        self._state = _DATA
+        self._command = 0
+        self._line = bytearray()
+        self._truncated = False
+        self._sb = bytearray()
+
+    def feed(self, data: bytes) -> List[Tuple[bytes, bool]]:
+        """Parses data and returns the completed lines as (line, was_truncated)."""
+        if self._state == _DATA and not any(special in data for special in _SPECIAL_BYTES):
+            return self._feed_plain(data)
+        lines = []
+        line = self._line
+        limit = self.max_line_length
+        state = self._state
+        for byte in data:
+            if state == _DATA:
+                if byte == IAC:
+                    state = _IAC
+                elif byte == LF:
+                    lines.append(self._take_line())
+                elif byte == CR or byte == NUL:
+                    pass
+                elif byte == BS or byte == DEL:
+                    if line:
+                        del line[-1]
+                elif len(line) < limit:
+                    line.append(byte)
+                else:
+                    self._truncated = True
+            elif state == _IAC:
+                if byte == IAC:  # Escaped literal 255
+                    if len(line) < limit:
+                        line.append(byte)
+                    else:
+                        self._truncated = True
+                    state = _DATA
+                elif byte in (WILL, WONT, DO, DONT):
+                    self._command = byte
+                    state = _OPTION
+                elif byte == SB:
+                    self._sb.clear()
+                    state = _SB
+                else:  # NOP, GA, AYT and the rest carry no option
+                    state = _DATA
+            elif state == _OPTION:
+                if self.on_negotiate:
+                    self.on_negotiate(self._command, byte)
+                state = _DATA
+            elif state == _SB:
+                if byte == IAC:
+                    state = _SB_IAC
+                elif len(self._sb) < MAX_SUBNEGOTIATION_LENGTH:
+                    self._sb.append(byte)
+            elif state == _SB_IAC:
+                if byte == SE:
+                    if self._sb and self.on_subnegotiate:
+                        self.on_subnegotiate(self._sb[0], bytes(self._sb[1:]))
+                    state = _DATA
+                else:
+                    if byte == IAC and len(self._sb) < MAX_SUBNEGOTIATION_LENGTH:
+                        self._sb.append(IAC)
+                    state = _SB
+        self._state = state
+        return lines
+
+    def _feed_plain(self, data: bytes) -> List[Tuple[bytes, bool]]:
+        # Fast path for the usual packet: text and line endings only, split with bytes methods.
+        lines = []
+        *complete, rest = data.split(b'\n')
+        for part in complete:
+            self._append(part)
+            lines.append(self._take_line())
+        self._append(rest)
+        return lines
+
+    def _append(self, part: bytes):
+        part = part.replace(b'\r', b'').replace(b'\0', b'')
+        room = self.max_line_length - len(self._line)
+        if len(part) > room:
+            part = part[:max(room, 0)]
+            self._truncated = True
+        self._line += part
+
+    def _take_line(self) -> Tuple[bytes, bool]:
+        line, truncated = self._line, self._truncated
+        if truncated:
+            # The cut may have landed inside a multibyte character: find where the last
+            # character starts and drop it if it lacks continuation bytes.
+            start = len(line) - 1
+            while start > 0 and len(line) - start < 4 and line[start] & 0xC0 == 0x80:
+                start -= 1
+            if start >= 0 and line[start] >= 0xC0:
+                needed = 2 if line[start] < 0xE0 else 3 if line[start] < 0xF0 else 4
+                if len(line) - start < needed:
+                    del line[start:]
+        taken = (bytes(line), truncated)
+        line.clear()
+        self._truncated = False
+        return taken
+
+
+class TelnetWriter:
+    """
+    Stands in front of a connection's StreamWriter and can switch its output
+    to MCCP2 compression mid-stream. Everything else is passed through.
+    """
+    def __init__(self, writer: asyncio.StreamWriter, compression_level: int = config.MCCP_COMPRESSION_LEVEL):
+        self._writer = writer
+        self.compression_level = compression_level
+        self._compressor = None
+        self.raw_bytes = 0   # Bytes handed to write()
+        self.wire_bytes = 0  # Bytes passed on to the transport
+
+    @property
+    def compressing(self) -> bool:
+        return self._compressor is not None
+
+    def write(self, data: bytes):
+        self.raw_bytes += len(data)
+        if self._compressor is not None:
+            data = self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        self.wire_bytes += len(data)
+        self._writer.write(data)
+
+    def start_compression(self):
+        if self._compressor is not None or self._writer.is_closing():
+            return
+        marker = bytes((IAC, SB, COMPRESS2, IAC, SE))
+        self._writer.write(marker)
+        self.wire_bytes += len(marker)
+        self._compressor = zlib.compressobj(self.compression_level)
+
+    def end_compression(self):
+        """Finishes the zlib stream; output after this is uncompressed again."""
+        if self._compressor is None:
+            return
+        tail = self._compressor.flush(zlib.Z_FINISH)
+        self._compressor = None
+        if not self._writer.is_closing():
+            self._writer.write(tail)
+            self.wire_bytes += len(tail)
+
+    def close(self):
+        self.end_compression()
+        self._writer.close()
+
+    def __getattr__(self, name: str):
+        # drain, is_closing, wait_closed, get_extra_info, transport...
+        return getattr(self._writer, name)
+
+
+class TelnetStream:
+    """Line-oriented telnet reader over a connection's StreamReader/StreamWriter."""
+    def __init__(self, reader: asyncio.StreamReader, writer: 'TelnetWriter',
+                 max_line_length: int = config.MAX_INPUT_LENGTH):
+        self.reader = reader
+        self.writer = writer
+        self.parser = TelnetParser(max_line_length, self._on_negotiate)
+        self._lines: Deque[Tuple[bytes, bool]] = deque()
+        self._refused: Set[Tuple[int, int]] = set()
+        self._offered_compression = False
+        self.lines_truncated = 0
+
+    def offer_compression(self):
+        """Sends IAC WILL COMPRESS2; compression starts if the client answers DO."""
+        if not self._offered_compression and not self.writer.is_closing():
+            self._offered_compression = True
+            self.writer.write(bytes((IAC, WILL, COMPRESS2)))
+
+    def _on_negotiate(self, command: int, option: int):
+        if option == COMPRESS2 and self._offered_compression and command in (DO, DONT):
+            if command == DO:
+                self.writer.start_compression()
+            else:
+                self.writer.end_compression()
+            return
+        # Refuse every other option, answering each request only once so clients can't loop us.
+        if command in (DO, WILL) and (command, option) not in self._refused:
+            self._refused.add((command, option))
+            reply = WONT if command == DO else DONT
+            if not self.writer.is_closing():
+                self.writer.write(bytes((IAC, reply, option)))
+
+    async def readline(self) -> Optional[Tuple[str, bool]]:
+        """
+        Returns the next line as (text, was_truncated), or None once the client has gone.
+        Raises ConnectionResetError/BrokenPipeError as the underlying reader does.
+        """
+        while not self._lines:
+            data = await self.reader.read(READ_CHUNK_SIZE)
+            if not data:
+                return None
+            self._lines.extend(self.parser.feed(data))
+        raw, truncated = self._lines.popleft()
+        if truncated:
+            self.lines_truncated += 1
+        return raw.decode(config.ENCODING, errors='replace').strip(), truncated
@@ -7,7 +7,9 @@ awaited on each tick.
 import asyncio
 import logging
 import time
-from typing import Callable, Coroutine, Any, Set, Optional
+from typing import Callable, Coroutine, Any, Dict, Optional, List
+
+from . import metrics
 
 log = logging.getLogger(__name__)
 
@@ -16,9 +18,11 @@ log = logging.getLogger(__name__)
 TickCallback = Callable[[float], Coroutine[Any, Any, None]]
 
 # --- Module State ---
-_callbacks: Set[TickCallback] = set()
+# Insertion-ordered (a dict used as a set) so callbacks run in a reproducible order.
+_callbacks: Dict[TickCallback, None] = {}
 _ticker_task: Optional[asyncio.Task] = None
 _interval_seconds: float = 1.0 # Default tick interval
+_tick_number: int = 0
 
 # --- Public API ---
 def subscribe(callback: TickCallback):
@@ -26,14 +30,51 @@ def subscribe(callback: TickCallback):
     if not asyncio.iscoroutinefunction(callback):
         log.error("Ticker subscription failed: Provided callback %s is not an async function.", callback.__name__)
         return
-    _callbacks.add(callback)
+    _callbacks[callback] = None
     log.debug("Callback %s subscribed to ticker.", callback.__name__)
 
 def unsubscribe(callback: TickCallback):
     """Unsubscribe an async function from the ticker cycle."""
-    _callbacks.discard(callback)
+    _callbacks.pop(callback, None)
     log.debug("Callback %s unsubscribed from ticker.", callback.__name__)
 
+def tick_number() -> int:
+    """Number of ticks run since startup."""
+    return _tick_number
+
+async def run_tick(delta_time: float):
+    """
+    Runs every subscribed callback once, concurrently. Used by the ticker loop,
+    and directly by simulations that step time themselves.
+    """
+    global _tick_number
+    _tick_number += 1
+    metrics.TICKS_TOTAL.inc()
+
+    if not _callbacks: # No work to do
+        return
+
+    log.debug("Ticker tick! Delta: %.3f s. Processing %d callbacks.", delta_time, len(_callbacks))
+    started_at = time.monotonic()
+
+    # Create tasks for all subscribed callbacks for this tick
+    # Copy the set in case callbacks modify it during execution
+    callbacks = list(_callbacks)
+    tasks = [asyncio.create_task(cb(delta_time)) for cb in callbacks]
+
+    # Run callbacks concurrently and gather results/exceptions
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    metrics.TICK_DURATION.observe(time.monotonic() - started_at)
+    for callback, result in zip(callbacks, results):
+        if isinstance(result, Exception):
+            # Log exceptions from individual callbacks but don't stop the ticker
+            callback_name = getattr(callback, '__name__', 'unknown callback')
+            log.exception("Ticker: Exception in callback '%s': %s", callback_name, result, exc_info=result)
+
+def subscribers() -> List[TickCallback]:
+    """Returns a snapshot of the subscribed callbacks (e.g. for benchmarks)."""
+    return list(_callbacks)
+
 async def start_ticker(interval_seconds: float = 1.0):
     """Starts the global ticker task if not already running."""
     global _ticker_task, _interval_seconds
@@ -90,23 +131,8 @@ async def _run_ticker():
             delta_time = current_time - last_tick_time
             last_tick_time = current_time
 
-            if not _callbacks: # No work to do
-                continue
-
-            log.debug("Ticker tick! Delta: %.3f s. Processing %d callbacks.", delta_time, len(_callbacks))
-
-            # Create tasks for all subscribed callbacks for this tick
-            # Copy the set in case callbacks modify it during execution
-            tasks = [asyncio.create_task(cb(delta_time)) for cb in list(_callbacks)]
-
-            if tasks:
-                # Run callbacks concurrently and gather results/exceptions
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-                for i, result in enumerate(results):
-                    if isinstance(result, Exception):
-                        # Log exceptions from individual callbacks but don't stop the ticker
-                        callback_name = getattr(list(_callbacks)[i], '__name__', 'unknown callback')
-                        log.exception("Ticker: Exception in callback '%s': %s", callback_name, result, exc_info=result)
+            metrics.TICK_DRIFT.set(delta_time - _interval_seconds)
+            await run_tick(delta_time)
         except asyncio.CancelledError:
             log.info("Ticker loop cancelled.")
             break # Exit the loop cleanly
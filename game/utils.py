@@ -259,7 +259,8 @@ def strip_article(item_name: str) -> str:
         return item_name[3:]
     return item_name
 
-def skill_check(character: 'Character', skill_name: str, dc: int = 10) -> Dict[str, Any]:
+def skill_check(character: 'Character', skill_name: str, dc: int = 10,
+                rng: Optional[random.Random] = None) -> Dict[str, Any]:
     """
     Performs a skill check for a character against a difficulty.
     Rolls d100 <= Skill_Rank + Attribute_Modifier - Difficulty_Modifier
@@ -269,6 +270,7 @@ def skill_check(character: 'Character', skill_name: str, dc: int = 10) -> Dict[s
         skill_name: The name of the skill being used (case-insensitive).
         difficulty_mod: A modifier representing the check's difficulty.
         Positive values make it harder, negative easier.
+        rng: The random stream to roll on; defaults to the character's world.rng.skill.
 
     Returns:
         A dictionary containing:
@@ -281,7 +283,7 @@ def skill_check(character: 'Character', skill_name: str, dc: int = 10) -> Dict[s
         return {'success': False, 'roll': 0, 'target_roll': 0, 'skill_value': 0} # Cannot perform check
     
     skill_value = character.get_skill_modifier(skill_name) # Rank + Attr Mod
-    roll = random.randint(1, 20) # d20 roll
+    roll = (rng or character.world.rng.skill).randint(1, 20) # d20 roll
     total_check = roll + skill_value # Final result to compare against DC
 
     # Success if total meets or exceeds DC
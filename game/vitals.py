@@ -0,0 +1,238 @@
+# game/vitals.py
+"""
+Struct-of-arrays engine for the once-a-second vitals ticks.
+While a character is active, its hp, essence, hunger, thirst and XP pool
+live in NumPy arrays at the character's slot instead of on the object, so
+regeneration, hunger/thirst decay and XP absorption run as a handful of
+vectorized operations over every character at once. The Character
+attributes stay as they were to the rest of the code: they are descriptors
+that read and write the slot while registered and the instance otherwise.
+
+Only the characters whose hunger or thirst bucket changed, or who
+finished absorbing or became able to advance, come back to Python for a
+message. The NODE flag is tracked per slot as characters move (rooms do
+not gain or lose it at runtime). NumPy is optional; without it World keeps
+its per-character loops.
+"""
+import logging
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+import config
+from . import utils
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+if TYPE_CHECKING:
+    from .character import Character
+
+log = logging.getLogger(__name__)
+
+# Lower bounds (percent) of the hunger/thirst buckets used by utils.format_*_status.
+STATUS_THRESHOLDS = (15, 40, 70, 95)
+# Messages for reaching a bucket, by index into STATUS_THRESHOLDS + 1 (0 is the worst).
+HUNGER_MESSAGES = {
+    0: "<R>You are starving! Your health regeneration has stopped!<x>",
+    1: "<Y>Your stomach rumbles loudly.<x>",
+    2: "<Y>You are starting to feel peckish.<x>",
+}
+THIRST_MESSAGES = {
+    0: "<r>You are dehydrated! Your essence regeneration has stopped!<x>",
+    1: "<y>Your mouth feels dry and parched.<x>",
+    2: "<y>You feel thirsty.<x>",
+}
+# status_code values; anything else neither regenerates nor is gated.
+STATUS_OTHER, STATUS_ALIVE, STATUS_MEDITATING = 0, 1, 2
+_STATUS_CODES = {"ALIVE": STATUS_ALIVE, "MEDITATING": STATUS_MEDITATING}
+
+_FLOAT_FIELDS = ("hp", "essence", "hunger", "thirst", "xp_pool", "xp_total")
+_MIRROR_FIELDS = ("max_hp", "max_essence", "status", "level")
+
+
+class EngineField:
+    """Character attribute stored in the engine's array while the character is registered."""
+    def __init__(self, cast=float):
+        self.cast = cast
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        engine = obj._vitals
+        if engine is None:
+            return obj.__dict__[self.name]
+        return self.cast(engine.arrays[self.name][obj._vital_slot])
+
+    def __set__(self, obj, value):
+        engine = obj._vitals
+        if engine is None:
+            obj.__dict__[self.name] = value
+        else:
+            engine.arrays[self.name][obj._vital_slot] = value
+
+
+class MirroredField:
+    """Plain Character attribute whose writes are also copied into the engine, which only reads it."""
+    def __set_name__(self, owner, name: str):
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return obj.__dict__[self.name]
+
+    def __set__(self, obj, value):
+        obj.__dict__[self.name] = value
+        if obj._vitals is not None:
+            obj._vitals.mirror(obj._vital_slot, self.name, value)
+
+
+class VitalsEngine:
+    """Owns the vitals arrays and the slot assigned to each registered character."""
+    def __init__(self, capacity: int = 64):
+        self.characters: List[Optional['Character']] = []
+        self._free_slots: List[int] = []
+        self.arrays: Dict[str, "np.ndarray"] = {}
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        old, self.arrays = self.arrays, {}
+        specs = [(name, np.float64) for name in _FLOAT_FIELDS + ("max_hp", "max_essence", "xp_needed")]
+        specs += [("status_code", np.int8), ("active", np.bool_), ("in_node", np.bool_),
+                  ("can_advance_notified", np.bool_)]
+        for name, dtype in specs:
+            array = np.zeros(capacity, dtype=dtype)
+            if name in old:
+                array[:len(old[name])] = old[name]
+            self.arrays[name] = array
+        self._free_slots.extend(reversed(range(len(self.characters), capacity)))
+        self.characters.extend([None] * (capacity - len(self.characters)))
+
+    # --- Registration ---
+    def register(self, character: 'Character'):
+        if character._vitals is self:
+            return
+        if not self._free_slots:
+            self._allocate(2 * len(self.characters))
+        slot = self._free_slots.pop()
+
+        values = character.__dict__
+        for name in _FLOAT_FIELDS:
+            self.arrays[name][slot] = values.pop(name)
+        self.arrays["can_advance_notified"][slot] = values.pop("can_advance_notified")
+        for name in _MIRROR_FIELDS:
+            self.mirror(slot, name, values[name])
+        self.arrays["in_node"][slot] = bool(character.location and "NODE" in character.location.flags)
+        self.arrays["active"][slot] = True
+        self.characters[slot] = character
+        character._vital_slot, character._vitals = slot, self
+
+    def release(self, character: 'Character'):
+        """Copies the character's values back onto it and frees its slot."""
+        if character._vitals is not self:
+            return
+        slot = character._vital_slot
+        values = character.__dict__
+        for name in _FLOAT_FIELDS:
+            values[name] = float(self.arrays[name][slot])
+        values["can_advance_notified"] = bool(self.arrays["can_advance_notified"][slot])
+        self.arrays["active"][slot] = False
+        self.characters[slot] = None
+        self._free_slots.append(slot)
+        character._vital_slot, character._vitals = None, None
+
+    def mirror(self, slot: int, name: str, value):
+        if name == "status":
+            self.arrays["status_code"][slot] = _STATUS_CODES.get(value, STATUS_OTHER)
+        elif name == "level":
+            self.arrays["xp_needed"][slot] = utils.xp_needed_for_level(value)
+        else:
+            self.arrays[name][slot] = value
+
+    def set_in_node(self, slot: int, in_node: bool):
+        self.arrays["in_node"][slot] = in_node
+
+    # --- Ticks ---
+    def tick_hunger_thirst(self, dt: float) -> List[Tuple['Character', str]]:
+        """Decays hunger and thirst. Returns (character, message) for each bucket change."""
+        a = self.arrays
+        active = a["active"]
+        messages = []
+        for name, rate, texts in (("hunger", 200.0, HUNGER_MESSAGES), ("thirst", 100.0, THIRST_MESSAGES)):
+            values = a[name]
+            before = np.digitize(values, STATUS_THRESHOLDS)
+            np.maximum(values - dt / rate, 0.0, out=values, where=active)
+            after = np.digitize(values, STATUS_THRESHOLDS)
+            for slot in np.flatnonzero(active & (after != before)):
+                text = texts.get(int(after[slot]))
+                if text:
+                    messages.append((self.characters[slot], text))
+        return messages
+
+    def tick_regen(self, dt: float):
+        """Applies HP and essence regeneration; same rules as Character.update_regen."""
+        a = self.arrays
+        code = a["status_code"]
+        meditating = code == STATUS_MEDITATING
+        can_regen = a["active"] & (code != STATUS_OTHER)
+        hp_mask = can_regen & ~meditating & (a["hp"] < a["max_hp"]) & (a["hunger"] > 0)
+        ess_mask = can_regen & (a["essence"] < a["max_essence"]) & (a["thirst"] > 0)
+        regenerating = np.flatnonzero(hp_mask | ess_mask)
+        if not len(regenerating):
+            return
+
+        # Rates depend on equipment and stats, so they are only worked out for the
+        # characters who are actually regenerating this tick.
+        hp_rate = np.empty(len(regenerating))
+        ess_rate = np.empty(len(regenerating))
+        for i, slot in enumerate(regenerating):
+            character = self.characters[slot]
+            hp_rate[i] = config.HP_REGEN_BASE_PER_SEC + character.vit_mod * config.HP_REGEN_VIT_MULTIPLIER
+            ess_rate[i] = config.ESSENCE_REGEN_BASE_PER_SEC + character.aura_mod * config.ESSENCE_REGEN_AURA_MULTIPLIER
+        node_multiplier = np.where(a["in_node"][regenerating], config.NODE_REGEN_MULTIPLIER, 1.0)
+        hp_rate *= node_multiplier
+        ess_rate *= node_multiplier * np.where(meditating[regenerating], config.MEDITATE_REGEN_MULTIPLIER, 1.0)
+
+        for name, rate, mask in (("hp", hp_rate, hp_mask), ("essence", ess_rate, ess_mask)):
+            values, maximum = a[name], a["max_" + name]
+            regen = regenerating[mask[regenerating]]
+            values[regen] = np.minimum(maximum[regen], values[regen] + rate[mask[regenerating]] * dt)
+
+    def tick_xp_absorption(self, dt: float) -> List[Tuple['Character', str]]:
+        """Moves XP from pool to total for characters in nodes. Returns messages to send."""
+        a = self.arrays
+        pool, total = a["xp_pool"], a["xp_total"]
+        absorbing = np.flatnonzero(a["active"] & a["in_node"] & (pool > 0))
+        if not len(absorbing):
+            return []
+        amount = np.minimum(pool[absorbing], config.XP_ABSORB_RATE_PER_SEC * dt)
+        pool[absorbing] -= amount
+        total[absorbing] += amount
+
+        messages = []
+        for slot in absorbing:
+            self.characters[slot].is_dirty = True
+        for slot in absorbing[pool[absorbing] <= 0]:
+            pool[slot] = 0.0
+            messages.append((self.characters[slot], "You feel you have absorbed all you can for now."))
+        notified = a["can_advance_notified"]
+        ready = absorbing[(total[absorbing] >= a["xp_needed"][absorbing]) & ~notified[absorbing]]
+        for slot in ready:
+            notified[slot] = True
+            messages.append((self.characters[slot], "{gYou have gained enough experience to advance to the next level!{x"))
+            messages.append((self.characters[slot], "{gType {c<advance>{g to proceed.{x"))
+        return messages
+
+
+def create_engine() -> Optional[VitalsEngine]:
+    """Returns an engine, or None if it is disabled or NumPy is not installed."""
+    if not config.VITALS_ENGINE:
+        return None
+    if np is None:
+        log.info("NumPy is not installed; vitals ticks will use per-character loops.")
+        return None
+    return VitalsEngine()
@@ -8,7 +8,6 @@ import json
 import logging
 import asyncio
 import config
-import random   
 from typing import Dict, Any, Optional, List, Union, TYPE_CHECKING
 from itertools import groupby
 from operator import itemgetter
@@ -16,12 +15,20 @@ from .room import Room
 from .character import Character
 from .mob import Mob
 from .item import Item
+from .ability_catalog import AbilityCatalog
 from .definitions import abilities as ability_defs
 from .definitions import calendar as calendar_defs
 from .definitions import weather as weather_defs
 from . import resolver
 from . import utils
 from . import ticker
+from . import rng
+from . import vitals
+from . import roundtime
+from . import perception
+from . import decay
+from . import broadcast
+from . import command_queue
 
 if TYPE_CHECKING:
     from .database import DatabaseManager
@@ -35,26 +42,43 @@ class World:
     """
     Holds the currently loaded game world data and a reference to the database manager.
     """
-    def __init__(self, db_manager: "DatabaseManager"):
+    def __init__(self, db_manager: "DatabaseManager", rng_seed: Optional[int] = None):
         self.db_manager = db_manager
+        # This world's named RNG streams; seeding makes tick simulations reproducible.
+        self.rng = rng.RandomStreams(rng_seed if rng_seed is not None else config.RNG_SEED)
+        # Schedulers and indexes this world's ticks drive; see the module named by each.
+        self.roundtimes = roundtime.RoundtimeScheduler()
+        self.decay_index = decay.DecayIndex()
+        self.perception_checks = perception.PerceptionScheduler()
+        self.command_scheduler = command_queue.CommandScheduler()
+        self.night = False  # Cached is_night(); outdoor rooms read it (see game/lighting.py)
         self.areas: Dict[int, Dict] = {}
         self.rooms: Dict[int, Room] = {}
+        # Spatial indexes for weather and day/night; see _index_rooms.
+        self.outdoor_rooms_by_area: Dict[int, List[Room]] = {}
+        self.characters_by_area: Dict[int, set] = {}
         self.races: Dict[int, Dict] = {}
         self.classes: Dict[int, Dict] = {}
         self.item_templates: Dict[int, Dict] = {}
         self.mob_templates: Dict[int, Dict] = {}
         self.active_characters: Dict[int, Character] = {}
+        # Vectorized regen/hunger/XP ticks; None without NumPy (see game/vitals.py).
+        self.vitals = vitals.create_engine()
         self._all_item_instances: Dict[str, Item] = {}
         self.shop_inventories: Dict[int, List[Dict]] = {}
         self.pending_invites: Dict[int, int] = {}
         self.active_groups: Dict[int, 'Group'] = {}
         self.dirty_rooms: set[int] = set()
         self.abilities: Dict[str, Dict] = {}
+        self.ability_catalog = AbilityCatalog()
         self.damage_types: Dict[str, Dict] = {}
         self._last_decay_check_time = time.monotonic()
         self.loot_tables: Dict [int, Dict] = {}
         self.loot_table_entries: Dict[int, List[Dict]] = {}
         self.ambient_scripts: List[Dict] = []
+        # Formatted ambient messages an occupied room can show; see _index_ambient_scripts()
+        self.ambient_messages_by_area: Dict[int, List[str]] = {}
+        self.ambient_messages_by_room: Dict[int, List[str]] = {}
         self.game_time_accumulator: float = 0.0
         self.game_minute: int = 0
         self.game_hour: int = calendar_defs.STARTING_HOUR
@@ -141,6 +165,7 @@ class World:
                         ability_dict['effect_details'] = {}
                         ability_dict['messages'] = {}
                     self.abilities[ability_dict['internal_name']] = ability_dict
+            self.rebuild_ability_catalog()
 
             self.damage_types = {row['name']: dict(row) for row in damage_type_rows or []}
 
@@ -166,14 +191,8 @@ class World:
                 room = Room(dict(row_data))
                 self.rooms[room.dbid] = room
 
-            is_currently_night = self.is_night()
-            for room in self.rooms.values():
-                # FIX: Add 'and "LIT" not in room.flags' to the condition
-                if "OUTDOORS" in room.flags and "LIT" not in room.flags:
-                    if is_currently_night:
-                        room.flags.add("DARK")
-                    else:
-                        room.flags.discard("DARK")
+            self._index_rooms()
+            self.night = self.is_night()
 
             if exit_rows:
                 for room_id, exits in groupby(exit_rows, key=itemgetter('source_room_id')):
@@ -194,6 +213,7 @@ class World:
                         self.loot_table_entries[table_id] = [dict(e) for e in entries]
 
             self.ambient_scripts = [dict(row) for row in scripts_rows or []]  
+            self._index_ambient_scripts()
 
             for room in self.rooms.values():
                 instance_records = await self.db_manager.get_instances_in_room(room.dbid)
@@ -204,6 +224,8 @@ class World:
                         item_obj.room = room
                         room.item_instance_ids.append(item_obj.id)
                         self._all_item_instances[item_obj.id] = item_obj
+                        if item_obj.last_moved_at:
+                            self.decay_index.track(item_obj, item_obj.last_moved_at.timestamp())
                         
                 object_rows = await self.db_manager.fetch_all_query("SELECT * FROM room_objects WHERE room_id = $1", room.dbid)
                 room.objects = [dict(r) for r in object_rows]
@@ -212,7 +234,7 @@ class World:
                 for template_id, spawn_info in room.spawners.items():
                     if mob_template := self.mob_templates.get(template_id):
                         for _ in range(spawn_info.get("max_present", 1)):
-                            room.add_mob(Mob(mob_template, room))
+                            room.add_mob(Mob(mob_template, room, self))
 
             log.info("World build complete. %d rooms loaded and populated.", len(self.rooms))
             return True
@@ -221,6 +243,10 @@ class World:
             log.exception("A critical error occurred during the world build process.")
             return False
             
+    def rebuild_ability_catalog(self):
+        """Rebuilds the ability lookup indexes. Call after self.abilities changes."""
+        self.ability_catalog.rebuild(self.abilities)
+
     # --- Getters ---
     def get_room(self, room_id: int) -> Optional[Room]:
         return self.rooms.get(room_id)
@@ -277,12 +303,54 @@ class World:
     def get_mob_template(self, template_id: int) -> Optional[Dict]:
         return self.mob_templates.get(template_id)
 
+    def _index_rooms(self):
+        """Groups outdoor rooms by area and gives each area's rooms one shared character set."""
+        self.outdoor_rooms_by_area.clear()
+        self.characters_by_area.clear()
+        for room in self.rooms.values():
+            area_characters = self.characters_by_area.setdefault(room.area_id, set())
+            area_characters.update(room.characters)
+            room.area_characters = area_characters
+            if "OUTDOORS" in room.flags:
+                self.outdoor_rooms_by_area.setdefault(room.area_id, []).append(room)
+
+    def _index_ambient_scripts(self):
+        """
+        Precomputes the messages each room can draw from: the scripts whose room_id
+        is that room or whose area_id is its area, in script order. Rooms that no
+        script names share their area's list. Picking one is then a single uniform
+        choice from a ready list, as it was from the filtered scripts.
+        """
+        self.ambient_messages_by_area.clear()
+        self.ambient_messages_by_room.clear()
+        for script in self.ambient_scripts:
+            if script.get('area_id') is not None:
+                self.ambient_messages_by_area.setdefault(script['area_id'], []).append(
+                    f"<i>{script['script_text']}<x>")
+        named_rooms = {script['room_id'] for script in self.ambient_scripts if script.get('room_id') is not None}
+        for room_id in named_rooms:
+            if room := self.rooms.get(room_id):
+                self.ambient_messages_by_room[room_id] = [
+                    f"<i>{script['script_text']}<x>" for script in self.ambient_scripts
+                    if script.get('room_id') == room_id or script.get('area_id') == room.area_id]
+
+    def outdoor_characters(self, area_id: Optional[int] = None) -> List[Character]:
+        """Online characters standing outdoors, in one area or (by default) any area with outdoor rooms."""
+        area_ids = [area_id] if area_id is not None else list(self.outdoor_rooms_by_area)
+        return [c for a_id in area_ids for c in self.characters_by_area.get(a_id, ())
+                if c.location and "OUTDOORS" in c.location.flags]
+
     # --- Active Character Management ---
     def add_active_character(self, character: Character):
         self.active_characters[character.dbid] = character
+        if self.vitals is not None:
+            self.vitals.register(character)
 
     def remove_active_character(self, character_id: int) -> Optional[Character]:
-        return self.active_characters.pop(character_id, None)
+        character = self.active_characters.pop(character_id, None)
+        if character and self.vitals is not None:
+            self.vitals.release(character)
+        return character
     
     def get_active_character(self, character_id: int) -> Optional[Character]:
         return self.active_characters.get(character_id)
@@ -318,59 +386,56 @@ class World:
 
     # --- Ticker Callback Functions ---
     async def update_roundtimes(self, dt: float):
-        """Ticker: Decrements roundtimes and resolves casting for all participants."""
-        all_mobs = [mob for room in self.rooms.values() for mob in room.mobs]
-        participants: List[Union[Character, Mob]] = self.get_active_characters_list() + all_mobs
-
-        for p in participants:
-            rt_before = p.roundtime
-            if rt_before > 0:
-                p.roundtime = max(0.0, rt_before - dt)
-
-            if isinstance(p, Character):
-                # Clear invalid combat state
-                if p.is_fighting and (not p.target or not p.target.is_alive() or p.target.location != p.location):
-                    p.is_fighting = False
-                    p.target = None
-                
-                # Resolve finished casting
-                if rt_before > 0 and p.roundtime == 0.0 and p.casting_info:
-                    info = p.casting_info
-                    p.casting_info = None
-                    ability_key = info.get("key")
-                    ability_data = self.abilities.get(ability_key)
-
-                    if not ability_data:
-                        log.error("Finished casting unknown ability '%s' for %s.", ability_key, p.name)
-                        continue
-
-                    cost = ability_data.get("cost", 0)
-                    if p.essence >= cost:
-                        messages = ability_data.get("messages", {})
-                        target_name = info.get("target_name", "its target")
-
-                        if msg_self := messages.get("caster_self_complete"):
-                                await p.send(msg_self.format(caster_name=p.name, target_name=target_name))
-                            
-                            # Message to the room
-                        if msg_room := messages.get("room_complete"):
-                            if p.location:
-                                await p.location.broadcast(
-                                    f"\r\n{msg_room.format(caster_name=p.name, target_name=target_name)}\r\n",
-                                    exclude={p}
-                                    )
-                        p.essence -= cost
-                        try:
-                            await resolver.resolve_ability_effect(p, info.get("target_id"), info.get("target_type"), ability_data, self)
-                        except Exception:
-                            log.exception("Error resolving ability effect '%s' for %s", ability_key, p.name)
-                            await p.send("Something went wrong as your action finished.")
-                        
-                        base_rt = ability_data.get("roundtime", 1.0)
-                        rt_penalty = p.total_av * 0.05
-                        p.roundtime = base_rt + rt_penalty
-                    else:
-                        await p.send(f"<R>You lose focus ({ability_data.get('name', ability_key)}) - not enough essence!<x>")
+        """Ticker: Advances the roundtime clock and resolves casts whose roundtime just ended."""
+        for char in self.get_active_characters_list():
+            # Clear invalid combat state
+            if char.is_fighting and (not char.target or not char.target.is_alive() or char.target.location != char.location):
+                char.is_fighting = False
+                char.target = None
+
+        for p in self.roundtimes.advance(dt):
+            if isinstance(p, Character) and p.casting_info:
+                await self._complete_cast(p)
+            self.command_scheduler.wake(p)
+
+    async def _complete_cast(self, p: Character):
+        """Resolves a cast whose roundtime has run out."""
+        info = p.casting_info
+        p.casting_info = None
+        ability_key = info.get("key")
+        ability_data = self.abilities.get(ability_key)
+
+        if not ability_data:
+            log.error("Finished casting unknown ability '%s' for %s.", ability_key, p.name)
+            return
+
+        cost = ability_data.get("cost", 0)
+        if p.essence >= cost:
+            messages = ability_data.get("messages", {})
+            target_name = info.get("target_name", "its target")
+
+            if msg_self := messages.get("caster_self_complete"):
+                await p.send(msg_self.format(caster_name=p.name, target_name=target_name))
+
+            # Message to the room
+            if msg_room := messages.get("room_complete"):
+                if p.location:
+                    await p.location.broadcast(
+                        f"\r\n{msg_room.format(caster_name=p.name, target_name=target_name)}\r\n",
+                        exclude={p}
+                    )
+            p.essence -= cost
+            try:
+                await resolver.resolve_ability_effect(p, info.get("target_id"), info.get("target_type"), ability_data, self)
+            except Exception:
+                log.exception("Error resolving ability effect '%s' for %s", ability_key, p.name)
+                await p.send("Something went wrong as your action finished.")
+
+            base_rt = ability_data.get("roundtime", 1.0)
+            rt_penalty = p.total_av * 0.05
+            p.roundtime = base_rt + rt_penalty
+        else:
+            await p.send(f"<R>You lose focus ({ability_data.get('name', ability_key)}) - not enough essence!<x>")
 
     async def update_mob_ai(self, dt: float):
         tasks = [room.mob_ai_tick(dt, self) for room in self.rooms.values()]
@@ -506,12 +571,16 @@ class World:
             # --- Chance-based Status Effect Flags ---
             if "POISONOUS" in room_flags:
                 # Example: 10% chance per tick to be afflicted with a weak poison
-                if random.random() < 0.10 and not char.effects.get("RoomPoison"):
+                if self.rng.combat.random() < 0.10 and not char.effects.get("RoomPoison"):
                     poison_effect = {"name": "RoomPoison", "type": "poison", "duration": 10.0, "potency": 3}
                     await resolver.apply_effect(char, char, poison_effect, {"name": "a poisonous miasma"}, self)
 
     async def update_xp_absorption(self, dt: float):
         """Ticker: Processes XP pool absorption and checks for level advancement."""
+        if self.vitals is not None:
+            for char, message in self.vitals.tick_xp_absorption(dt):
+                await char.send(message)
+            return
         absorb_this_tick = config.XP_ABSORB_RATE_PER_SEC * dt
         for char in self.get_active_characters_list():
             if char.location and "NODE" in char.location.flags and char.xp_pool > 0:
@@ -532,75 +601,25 @@ class World:
                     char.can_advance_notified = True
     
     async def update_stealth_checks(self, dt: float):
-        """Ticker: Periodically allows observers to detect hidden characters and mobs."""
-        if random.random() > 0.20: # 10% chance per second
-            return
-        
-        # Find all hidden entities (characters and mobs)
-        hidden_chars = [c for c in self.get_active_characters_list() if c.is_hidden]
-        all_mobs = [m for r in self.rooms.values() for m in r.mobs]
-        hidden_mobs = [m for m in all_mobs if m.is_hidden and m.is_alive()]
-        
-        hidden_entities = hidden_chars + hidden_mobs
-        if not hidden_entities:
-            return
-
-        for hidden_entity in hidden_entities:
-            # Determine the stealth value (DC) of the hidden entity
-            if isinstance(hidden_entity, Character):
-                stealth_dc = hidden_entity.get_stealth_dc()
-            else: # It's a Mob
-                stealth_dc = hidden_entity.get_stealth_value()
-
-            # --- FIX: Filter observers to exclude self and group members ---
-            observers = []
-            for char in hidden_entity.location.characters:
-                # Must be alive and not the hider themselves
-                if not char.is_alive() or char == hidden_entity:
-                    continue
-                # If the hider is a character and is in a group, exclude group members
-                if isinstance(hidden_entity, Character) and hidden_entity.group and char in hidden_entity.group.members:
-                    continue
-                observers.append(char)
-            # -----------------------------------------------------------------
-            mobs_in_room = [m for m in hidden_entity.location.mobs if m.is_alive()]
-            for observer in observers:
-                # Mobs can't detect hidden players in this implementation yet, but players can detect mobs
-                if utils.skill_check(observer, "perception", dc=stealth_dc)['success']:
-                    hidden_entity.is_hidden = False
-                    
-                    if isinstance(hidden_entity, Character):
-                        await hidden_entity.send(f"<R>You have been spotted by {observer.name}!<x>")
-                    
-                    await observer.send(f"<Y>You spot {hidden_entity.name} hiding in the shadows!<x>")
-                    await observer.location.broadcast(
-                        f"\r\n{observer.name} spots {hidden_entity.name} hiding in the shadows!\r\n",
-                        exclude={observer, hidden_entity}
-                    )
-                    break # Stop checking once spotted
-            if isinstance(hidden_entity, Character):
-                for mob in mobs_in_room:
-                    # Mobs use their level * 2 as perception skill
-                    mob_perception = mob.level * 2
-                    roll = random.randint(1, 20)
-                    total = roll + mob_perception
-                    success = total >= stealth_dc
-                
-                    log.info(f"  -> Mob {mob.name} (Lvl {mob.level}) perception: Roll {roll} + {mob_perception} = {total} vs DC {stealth_dc} = {'SUCCESS' if success else 'FAIL'}")
-                
-                    if success:
-                        hidden_entity.is_hidden = False
-                        
-                        if isinstance(hidden_entity, Character):
-                            await hidden_entity.send(f"<R>{mob.name.capitalize()} spots you!<x>")
-                            await hidden_entity.location.broadcast(
-                                f"\r\n{mob.name.capitalize()} spots {hidden_entity.name}!\r\n",
-                                exclude={hidden_entity}
-                            )
-                        break
+        """Ticker: Runs the perception checks that are due (see game/perception.py)."""
+        scheduler = self.perception_checks
+        scheduler.advance(dt)
+        rolls = 0
+        while rolls < config.PERCEPTION_MAX_ROLLS_PER_TICK:
+            room = scheduler.pop_due()
+            if room is None:
+                break
+            room_rolls, still_relevant = await perception.check_room(room, self.rng.skill)
+            rolls += room_rolls
+            if still_relevant:
+                scheduler.notify(room, config.PERCEPTION_CHECK_INTERVAL_SECONDS)
 
     async def update_hunger_thirst(self, dt: float):
         """Ticker: Decreases hunger and thirst and notifies characters on status changes."""
+        if self.vitals is not None:
+            for char, message in self.vitals.tick_hunger_thirst(dt):
+                await char.send(message)
+            return
         for char in self.get_active_characters_list():
             # Store current status before changing values
             old_hunger_status = utils.format_hunger_status(char)
@@ -634,6 +653,9 @@ class World:
 
     async def update_regen(self, dt: float):
         """Ticker: Calls the regeneration logic for all active characters."""
+        if self.vitals is not None:
+            self.vitals.tick_regen(dt)
+            return
         for char in self.get_active_characters_list():
             is_in_node = char.location and "NODE" in char.location.flags
             char.update_regen(dt, is_in_node)
@@ -651,30 +673,19 @@ class World:
         
         self._last_decay_check_time = current_time
 
-        decay_threshold = config.ITEM_DECAY_TIME_SECONDS
-        items_to_delete = []
-
-        # 2. Efficiently find items eligible for decay (no database calls here)
-        for item in self._all_item_instances.values():
-            if item.room and item.has_flag("DECAYS"):
-                if item.last_moved_at:
-                    # Use the timestamp stored on the object itself
-                    age = time.time() - item.last_moved_at.timestamp()
-                    if age > decay_threshold:
-                        items_to_delete.append(item)
-        
+        # 2. Pop only the ground items whose decay time has passed (see game/decay.py)
+        items_to_delete = self.decay_index.pop_expired()
         if not items_to_delete:
             return
 
-        # 3. Delete the items
+        # 3. Remove them from world state, then from the database in one statement
         for item in items_to_delete:
-            # Remove from world state
-            del self._all_item_instances[item.id]
-            if item.room and item.id in item.room.item_instance_ids:
+            self._all_item_instances.pop(item.id, None)
+            if item.id in item.room.item_instance_ids:
                 item.room.item_instance_ids.remove(item.id)
-            
-            # Remove from database
-            await self.db_manager.delete_item_instance(item.id)
+            item.room = None
+
+        await self.db_manager.delete_item_instances([item.id for item in items_to_delete])
         
         log.info(f"Cleaned up {len(items_to_delete)} decayed items from the world.")
 
@@ -717,41 +728,22 @@ class World:
             return
 
         message = None
-        apply_dark = False
-        remove_dark = False
 
         if self.game_hour == calendar_defs.DAWN_HOUR:
             message = "{YThe sun crests the horizon, chasing away the shadows of the night.{x"
-            remove_dark = True
         elif self.game_hour == calendar_defs.DUSK_HOUR:
             message = "{yThe sun dips below the horizon, and darkness begins to fall.{x"
-            apply_dark = True
         elif self.game_hour == 0: # Midnight
             message = "{BThe moons hang high in the sky, marking the deepest point of the night.{x"
         elif self.game_hour == 12: # Noon
             message = "{CThe sun reaches its zenith in the sky.{x"
 
-        if message or apply_dark or remove_dark:
-            # Find all characters in outdoor rooms
-            outdoor_chars = [
-                char for char in self.get_active_characters_list()
-                if char.location and "OUTDOORS" in char.location.flags
-            ]
-            
-            # Send message to outdoor characters
-            if message:
-                tasks = [char.send(message) for char in outdoor_chars]
-                if tasks:
-                    await asyncio.gather(*tasks)
+        # Outdoor rooms read darkness from this when asked (see game/lighting.py)
+        self.night = self.is_night()
 
-            # Update room flags
-            for room in self.rooms.values():
-                if "OUTDOORS" in room.flags:
-                    # NEW: Add 'and "LIT" not in room.flags' to prevent lit rooms from getting dark
-                    if apply_dark and "LIT" not in room.flags:
-                        room.flags.add("DARK")
-                    elif remove_dark:
-                        room.flags.discard("DARK")
+        # Send message to outdoor characters
+        if message:
+            await broadcast.fan_out(self.outdoor_characters(), message)
 
 
     async def generate_loot_for_container(self, container: Item, loot_table_id: int, character: Character):
@@ -770,26 +762,27 @@ class World:
 
         for entry in entries:
             # Roll to see if this item/coin drop happens
-            if random.random() <= entry['drop_chance']:
+            if self.rng.loot.random() <= entry['drop_chance']:
                 # Handle Coinage
                 if entry['max_coinage'] > 0:
-                    coin_amount = random.randint(entry['min_coinage'], entry['max_coinage'])
+                    coin_amount = self.rng.loot.randint(entry['min_coinage'], entry['max_coinage'])
                     generated_coinage += coin_amount
 
                 # Handle Items
                 if item_template_id := entry.get('item_template_id'):
-                    quantity = random.randint(entry['min_quantity'], entry['max_quantity'])
+                    quantity = self.rng.loot.randint(entry['min_quantity'], entry['max_quantity'])
                     for _ in range(quantity):
                         new_instance_data = await self.db_manager.create_item_instance(
                             template_id=item_template_id,
-                            container_id=container.id  # This places the item inside the container
+                            container_id=container.id,  # This places the item inside the container
+                            rng=self.rng.loot
                         )
                         if new_instance_data:
                             template = self.get_item_template(item_template_id)
                             new_item = Item(new_instance_data, template)
                             # Add the new item to the world and container's in-memory state
                             self._all_item_instances[new_item.id] = new_item
-                            container.contents[new_item.id] = new_item
+                            container.add_content(new_item)
                             generated_items.append(new_item.name)
         
         # Add all generated coinage to the floor of the character's room and notify them.
@@ -815,86 +808,56 @@ class World:
                 continue
 
             conditions, weights = zip(*weather_table)
-            new_condition = random.choices(conditions, weights=weights, k=1)[0]
+            new_condition = self.rng.weather.choices(conditions, weights=weights, k=1)[0]
 
             old_condition = self.area_weather.get(area_id, {}).get("condition")
 
             # Store weather data
             self.area_weather[area_id] = {
                 "condition": new_condition,
-                "temperature": random.randint(30, 80)
+                "temperature": self.rng.weather.randint(30, 80)
             }
 
             # Apply weather flags to all outdoor rooms in this area
             weather_effect = weather_defs.WEATHER_EFFECTS.get(new_condition, {})
             new_flags = set(weather_effect.get("room_flags", []))
 
-            for room in self.rooms.values():
-                if room.area_id == area_id and "OUTDOORS" in room.flags:
-                    # remove old weather flags
-                    if old_condition:
-                        old_effect = weather_defs.WEATHER_EFFECTS.get(old_condition, {})
-                        old_flags = set(old_effect.get("room_flags", []))
-                        room.flags -= old_flags
-
-                    # add new weather flags
-                    room.flags.update(new_flags)
+            old_flags = set()
+            if old_condition:
+                old_effect = weather_defs.WEATHER_EFFECTS.get(old_condition, {})
+                old_flags = set(old_effect.get("room_flags", []))
+            for room in self.outdoor_rooms_by_area.get(area_id, ()):
+                # remove old weather flags, add new weather flags
+                room.flags -= old_flags
+                room.flags.update(new_flags)
 
             # Broadcast weather change to players (skip on initial build)
             if not is_initial_build and new_condition != old_condition:
                 message = f"<i>The weather in {area_data['name']} has changed to: {new_condition.lower()}.<x>"
-                chars_to_notify = [
-                    c for c in self.get_active_characters_list()
-                    if c.location and c.location.area_id == area_id and "OUTDOORS" in c.location.flags   
-                ]
-                tasks = [char.send(message) for char in chars_to_notify]
-                if tasks:
-                    await asyncio.gather(*tasks)
+                await broadcast.fan_out(self.outdoor_characters(area_id), message)
 
     async def update_ambient_scripts(self, dt: float):
         """Ticker: Periodically shows immersive messages to players."""
         # --- FIX: Use a configurable setting and more intuitive logic ---
         # This will run if a random number is LESS than your setting.
         # e.g., if the setting is 0.01, this block runs on a 1% chance.
-        if random.random() < config.AMBIENT_SCRIPT_CHANCE_PER_TICK:
-            active_chars = self.get_active_characters_list()
-            if not active_chars:
-                return
-
+        if self.rng.ambient.random() < config.AMBIENT_SCRIPT_CHANCE_PER_TICK:
             # Group players by location to avoid spam
-            active_chars.sort(key=lambda c: c.location.dbid if c.location else -1)
-
-            for room_id, chars_in_room_iter in groupby(active_chars, key=lambda c: c.location.dbid if c.location else -1):
-                if room_id == -1:
-                    continue
-
-                chars_in_room = list(chars_in_room_iter)
-                first_char = chars_in_room[0]
-                room = first_char.location
-
-                possible_scripts = [
-                    script for script in self.ambient_scripts
-                    if (script['room_id'] == room.dbid or
-                        script['area_id'] == room.area_id)
-                ]
-
-                if possible_scripts:
-                    chosen_script = random.choice(possible_scripts)
-                    message = f"<i>{chosen_script['script_text']}<x>"
-
-                    tasks = [char.send(message) for char in chars_in_room]
-                    if tasks:
-                        await asyncio.gather(*tasks, return_exceptions=True)
+            occupied_rooms: Dict[int, Room] = {}
+            for char in self.active_characters.values():
+                if char.location:
+                    occupied_rooms.setdefault(char.location.dbid, char.location)
+
+            # Rooms that drew the same message share one encoding of it
+            recipients: Dict[str, List[Character]] = {}
+            for room in occupied_rooms.values():
+                messages = (self.ambient_messages_by_room.get(room.dbid)
+                            or self.ambient_messages_by_area.get(room.area_id))
+                if messages:
+                    recipients.setdefault(self.rng.ambient.choice(messages), []).extend(room.characters)
+            if recipients:
+                await asyncio.gather(*(broadcast.fan_out(chars, message) for message, chars in recipients.items()))
 
     async def broadcast_to_all(self, message: str, exclude: set = None):
         """Sends a message to all active characters."""
-        if exclude is None:
-            exclude = set()
-        
-        tasks = []
-        for char in self.get_active_characters_list():
-            if char not in exclude:
-                tasks.append(char.send(message))
-        
-        if tasks:
-            await asyncio.gather(*tasks)
\ No newline at end of file
+        await broadcast.fan_out(list(self.active_characters.values()), message, exclude=exclude)
\ No newline at end of file
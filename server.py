@@ -5,24 +5,20 @@ Initializes the game world, starts the server, and handles graceful shutdown.
 """
 import asyncio
 import logging
+import time
 import config
+from collections import Counter
 from typing import Optional
 from game.database import db_manager # <-- Import the manager instance
 from game.world import World
-from game.handlers.connection import ConnectionHandler
+from game.handlers.connection import ConnectionHandler, ACTIVE_HANDLERS
 from game import ticker
+from game import logging_setup
+from game import metrics
+from game import diagnostics
+from game import capture
+from game import admission
 
-# --- Logging Setup ---
-log_format = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
-log_handlers = [
-    logging.FileHandler("server.log"),
-    logging.StreamHandler()
-]
-logging.basicConfig(
-    level=logging.INFO,
-    format=log_format,
-    handlers=log_handlers
-)
 log = logging.getLogger(__name__)
 
 # --- Global Game State ---
@@ -40,14 +36,24 @@ async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.Stream
 
     addr = writer.get_extra_info('peername', 'Unknown Address')
     log.info("Connection received from %s", addr)
+    metrics.CONNECTIONS_TOTAL.inc()
 
     if not world:
         log.error("Server not fully initialized. Refusing connection from %s.", addr)
         writer.close(); await writer.wait_closed()
         return
 
+    ip = addr[0] if isinstance(addr, tuple) else str(addr)
+    refusal = admission.control.check(ip)
+    if refusal:
+        log.info("Refusing connection from %s: %s.", addr, refusal)
+        await admission.refuse(writer, refusal)
+        return
+    admission.enable_keepalive(writer)
+
     # Pass the global world object to the handler
     handler = ConnectionHandler(reader, writer, world, db_manager)
+    admission.control.admit(handler)
     await handler.handle()
 
 async def _autosave_loop(world: World, interval_seconds: int):
@@ -58,7 +64,9 @@ async def _autosave_loop(world: World, interval_seconds: int):
             await asyncio.sleep(interval_seconds)
             log.info("Autosave: Starting periodic world state save....")
 
+            started_at = time.monotonic()
             await world.save_state()
+            metrics.AUTOSAVE_DURATION.observe(time.monotonic() - started_at)
 
         except asyncio.CancelledError:
             log.info("Autosave task cancelled.")
@@ -67,6 +75,71 @@ async def _autosave_loop(world: World, interval_seconds: int):
             log.exception("Autosave: Unexpected error in autosave loop.")
             await asyncio.sleep(60)
 
+def _register_metrics(world: World):
+    """Registers scrape-time collectors for connection, database and world state."""
+    def _connection_states():
+        counts = Counter(handler.state.name for handler in list(ACTIVE_HANDLERS))
+        for state, count in counts.items():
+            yield "chrozal_connections", {"state": state}, count
+
+    def _outbound_bytes():
+        total = 0
+        for handler in list(ACTIVE_HANDLERS):
+            transport = handler.writer.transport
+            if transport and not transport.is_closing():
+                total += transport.get_write_buffer_size()
+        yield "chrozal_outbound_buffered_bytes", {}, total
+
+    def _output_bytes():
+        handlers = list(ACTIVE_HANDLERS)
+        yield "chrozal_output_bytes", {"stage": "raw"}, sum(h.writer.raw_bytes for h in handlers)
+        yield "chrozal_output_bytes", {"stage": "wire"}, sum(h.writer.wire_bytes for h in handlers)
+
+    def _mccp_connections():
+        yield "chrozal_mccp_connections", {}, sum(h.writer.compressing for h in list(ACTIVE_HANDLERS))
+
+    def _db_pool():
+        pool = db_manager.pool
+        if pool is None:
+            return
+        size, idle = pool.get_size(), pool.get_idle_size()
+        yield "chrozal_db_pool_connections", {"state": "in_use"}, size - idle
+        yield "chrozal_db_pool_connections", {"state": "idle"}, idle
+        yield "chrozal_db_pool_connections", {"state": "max"}, pool.get_max_size()
+
+    def _admission():
+        yield "chrozal_pre_auth_sessions", {}, admission.control.pre_auth_sessions
+
+    def _refused():
+        for reason, count in admission.control.refused.items():
+            yield "chrozal_connections_refused_total", {"reason": reason}, count
+
+    def _reaped():
+        for reason, count in admission.control.reaped.items():
+            yield "chrozal_connections_reaped_total", {"reason": reason}, count
+
+    def _world_entities():
+        for kind, count in diagnostics.world_object_counts(world).items():
+            yield "chrozal_world_entities", {"kind": kind}, count
+        yield "chrozal_world_entities", {"kind": "Group"}, len(world.active_groups)
+
+    def _log_drops():
+        if logging_setup.queue_handler:
+            yield "chrozal_log_records_dropped_total", {"reason": "queue_full"}, logging_setup.queue_handler.dropped
+        if logging_setup.rate_limiter:
+            yield "chrozal_log_records_dropped_total", {"reason": "rate_limited"}, logging_setup.rate_limiter.suppressed
+
+    metrics.register_collector("chrozal_connections", "gauge", "Open client connections by state.", _connection_states)
+    metrics.register_collector("chrozal_outbound_buffered_bytes", "gauge", "Bytes queued in client transports awaiting send.", _outbound_bytes)
+    metrics.register_collector("chrozal_output_bytes", "gauge", "Bytes sent to open connections, before (raw) and after (wire) MCCP2.", _output_bytes)
+    metrics.register_collector("chrozal_mccp_connections", "gauge", "Open connections with MCCP2 compression on.", _mccp_connections)
+    metrics.register_collector("chrozal_db_pool_connections", "gauge", "asyncpg pool connections by state.", _db_pool)
+    metrics.register_collector("chrozal_pre_auth_sessions", "gauge", "Connections that have not logged in yet.", _admission)
+    metrics.register_collector("chrozal_connections_refused_total", "counter", "Connections refused by admission control.", _refused)
+    metrics.register_collector("chrozal_connections_reaped_total", "counter", "Connections closed by the reaper.", _reaped)
+    metrics.register_collector("chrozal_world_entities", "gauge", "Live world entities by kind.", _world_entities)
+    metrics.register_collector("chrozal_log_records_dropped_total", "counter", "Log records not written.", _log_drops)
+
 async def main():
     """Main server entry point."""
     global world
@@ -88,8 +161,17 @@ async def main():
     addr = server.sockets[0].getsockname()
     log.info(f"Server listening on {addr[0]}:{addr[1]}")
 
+    metrics_server = None
+    if config.METRICS_ENABLED:
+        _register_metrics(world)
+        metrics_server = await metrics.start_exporter(config.METRICS_HOST, config.METRICS_PORT)
+
+    if config.CAPTURE_ON_STARTUP:
+        capture.start_capture()
+
     # 3. Start background tasks AFTER the server is ready
     ticker_task = asyncio.create_task(ticker.start_ticker(config.TICKER_INTERVAL_SECONDS))
+    reaper_task = asyncio.create_task(admission.run_reaper())
     autosave_task = None
     if config.AUTOSAVE_INTERVAL_SECONDS > 0:
         autosave_task = asyncio.create_task(_autosave_loop(world, config.AUTOSAVE_INTERVAL_SECONDS))
@@ -103,8 +185,11 @@ async def main():
         log.info("Shutting down server...")
         if ticker_task: ticker_task.cancel()
         if autosave_task: autosave_task.cancel()
+        reaper_task.cancel()
         server.close()
         await server.wait_closed()
+        if metrics_server:
+            metrics_server.close()
 
         # --- NEW SHUTDOWN LOGIC ---
         # Wait for all client connection handlers to finish their cleanup.
@@ -118,12 +203,18 @@ async def main():
             log.info("Performing final world state save...")
             await world.save_state()
         
+        capture.stop_capture()
+
         # Finally, it is safe to close the database pool.
         await db_manager.close()
         log.info("Server shutdown complete.")
 
 if __name__ == "__main__":
+    # --- Logging Setup ---
+    logging_setup.setup_logging(logging.INFO)
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
-        log.info("Server stopped manually.")
\ No newline at end of file
+        log.info("Server stopped manually.")
+    finally:
+        logging_setup.stop_logging()
@@ -0,0 +1,31 @@
+# tests/test_command_handler.py
+import unittest
+
+from game.commands import handler
+
+
+class AbbreviationTest(unittest.TestCase):
+    def test_full_word_only_verbs_need_the_full_word(self):
+        for verb in sorted(handler.NO_ABBREV_CMDS):
+            with self.subTest(verb=verb):
+                self.assertIs(handler.find_command(verb).func, handler.COMMAND_MAP[verb])
+                for end in range(1, len(verb)):
+                    prefix = verb[:end]
+                    spec = handler.find_command(prefix)
+                    # A prefix may only run something if it is itself a registered verb ('l' is look)
+                    if spec is not None:
+                        self.assertIn(prefix, handler.COMMAND_MAP, f"{prefix!r} runs {spec.name}")
+
+    def test_item_and_money_abbreviations_do_nothing(self):
+        for typed in ("rel", "sel", "dep", "wit", "dro", "gi", "pu", "ea", "dri", "rep", "spe", "impr", "adv"):
+            with self.subTest(typed=typed):
+                self.assertIsNone(handler.find_command(typed))
+
+    def test_other_abbreviations_still_resolve(self):
+        for typed, name in (("whisp", "whisper"), ("att", "attack"), ("inven", "inventory"), ("exam", "examine")):
+            with self.subTest(typed=typed):
+                self.assertEqual(handler.find_command(typed).name, name)
+
+
+if __name__ == "__main__":
+    unittest.main()
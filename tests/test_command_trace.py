@@ -0,0 +1,61 @@
+# tests/test_command_trace.py
+import asyncio
+import time
+import unittest
+
+from game import command_trace
+
+DELAY = 0.05
+
+
+@command_trace.trace_db_methods
+class _FakeDatabase:
+    async def fetch(self):
+        await asyncio.sleep(DELAY)
+
+    async def save(self):
+        await self.fetch()
+        await self.fetch()
+
+
+class _FakeCharacter:
+    @command_trace.timed_send
+    async def send(self, message: str):
+        await asyncio.sleep(DELAY)
+
+
+class CommandTraceTest(unittest.IsolatedAsyncioTestCase):
+    async def _trace(self, make_awaitable):
+        """Runs make_awaitable() as a traced command; tasks it starts inherit the trace."""
+        token = command_trace.begin()
+        trace = command_trace._current.get()
+        started = time.perf_counter()
+        try:
+            await make_awaitable()
+        finally:
+            elapsed = time.perf_counter() - started
+            command_trace._current.reset(token)
+        return trace, elapsed
+
+    async def test_overlapping_db_calls_count_each_call_and_the_wall_time_once(self):
+        db = _FakeDatabase()
+        trace, elapsed = await self._trace(lambda: asyncio.gather(db.fetch(), db.fetch()))
+        self.assertEqual(trace.db.calls, 2)
+        self.assertGreaterEqual(trace.db.seconds, DELAY * 0.9)
+        self.assertLessEqual(trace.db.seconds, elapsed)
+
+    async def test_nested_db_calls_are_counted_once(self):
+        trace, elapsed = await self._trace(_FakeDatabase().save)
+        self.assertEqual(trace.db.calls, 1)
+        self.assertGreaterEqual(trace.db.seconds, 2 * DELAY * 0.9)
+        self.assertLessEqual(trace.db.seconds, elapsed)
+
+    async def test_concurrent_sends_never_exceed_the_command_time(self):
+        characters = [_FakeCharacter() for _ in range(5)]
+        trace, elapsed = await self._trace(lambda: asyncio.gather(*(c.send("hi") for c in characters)))
+        self.assertEqual(trace.send.calls, 5)
+        self.assertLessEqual(trace.send.seconds, elapsed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+# tests/test_logging_setup.py
+import logging
+import time
+import unittest
+
+import config
+from game import perception
+from game.character import Character
+from game.logging_setup import RateLimitFilter
+from game.memory_database import InMemoryDatabaseManager
+from game.world import World
+from tools import worldgen
+from tools.bench_ticks import _NullWriter
+
+
+class _Collect(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class PerceptionLogThrottleTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        db = InMemoryDatabaseManager(seed=1)
+        db.seed(worldgen.generate(worldgen.WorldScale(rooms=40, mobs=200, players=1, ground_items=0)))
+        await db.init_db()
+        self.world = World(db, rng_seed=1)
+        self.assertTrue(await self.world.build())
+        self.room = max(self.world.rooms.values(), key=lambda r: len(r.mobs))
+
+        self.hider = Character(_NullWriter(), dict(await db.load_character_data(1)), self.world)
+        await self.hider.load_related_data()
+        self.hider.update_location(self.room)
+        self.room.add_character(self.hider)
+        self.hider.get_stealth_dc = lambda: 10 ** 6  # Never spotted, so every check rolls for every mob
+
+        self.logger = logging.getLogger("game.perception")
+        self.old_level = self.logger.level
+        self.logger.setLevel(logging.DEBUG)
+        self.collect = _Collect()
+        self.throttle = RateLimitFilter(config.LOG_RATE_LIMITS)
+        self.collect.addFilter(self.throttle)
+        self.logger.addHandler(self.collect)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.collect)
+        self.logger.setLevel(self.old_level)
+
+    async def test_mob_perception_rolls_are_rate_limited(self):
+        rate = config.LOG_RATE_LIMITS["game.perception"]
+        self.hider.is_hidden = True
+        started = time.monotonic()
+        rolls = 0
+        while rolls < 10 * rate:
+            checked, still_relevant = await perception.check_room(self.room, self.world.rng.skill)
+            self.assertTrue(still_relevant)
+            rolls += checked
+        elapsed = time.monotonic() - started
+
+        self.assertGreaterEqual(len(self.collect.records) + self.throttle.suppressed, rolls)
+        self.assertLessEqual(len(self.collect.records), rate + rate * elapsed + 1)
+        self.assertGreater(self.throttle.suppressed, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+# tests/test_memory_database.py
+import ast
+import pathlib
+import re
+import unittest
+
+from game.character import Character
+from game.memory_database import InMemoryDatabaseManager, UnsupportedQueryError
+from game.world import World
+from tools import worldgen
+from tools.bench_ticks import _NullWriter
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+RAW_QUERY_METHODS = {"fetch_all_query", "fetch_one_query", "execute_query"}
+# DatabaseManager's own SQL is PostgreSQL-only; the in-memory manager replaces those methods natively.
+POSTGRES_ONLY = {"database.py", "memory_database.py"}
+
+
+def _raw_queries():
+    """Every literal SQL string the game passes to a raw query method, with where it appears."""
+    queries = []
+    for path in sorted((ROOT / "game").rglob("*.py")):
+        if path.name in POSTGRES_ONLY:
+            continue
+        for node in ast.walk(ast.parse(path.read_text(), str(path))):
+            if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                    and node.func.attr in RAW_QUERY_METHODS and node.args
+                    and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, str)):
+                queries.append((f"{path.relative_to(ROOT)}:{node.lineno}", node.func.attr, node.args[0].value))
+    return queries
+
+
+class MemoryDatabaseTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.db = InMemoryDatabaseManager(seed=1)
+        self.db.seed(worldgen.generate(worldgen.WorldScale(rooms=60, mobs=30, players=2, ground_items=30)))
+        await self.db.init_db()
+
+    async def test_every_raw_query_runs(self):
+        queries = _raw_queries()
+        # World.build's table loads alone are 16 statements; fewer means the scan missed them.
+        self.assertGreater(len(queries), 16)
+        for where, method, query in queries:
+            params = [1] * len(set(re.findall(r"\$\d+", query)))
+            with self.subTest(where=where):
+                await getattr(self.db, method)(query, *params)
+
+    async def test_unsupported_query_names_the_statement(self):
+        with self.assertRaisesRegex(UnsupportedQueryError, "JOIN"):
+            await self.db.fetch_all_query("SELECT * FROM rooms r JOIN exits e ON e.source_room_id = r.id")
+        with self.assertRaises(UnsupportedQueryError):
+            await self.db.fetch_all_query("SELECT * FROM rooms WHERE id > $1", 1)
+        with self.assertRaises(UnsupportedQueryError):
+            await self.db.execute_query("INSERT INTO rooms (id) VALUES ($1)", 99)
+
+    async def test_world_build_and_character_round_trip(self):
+        world = World(self.db, rng_seed=1)
+        self.assertTrue(await world.build())
+
+        character = Character(_NullWriter(), dict(await self.db.load_character_data(1)), world)
+        await character.load_related_data()
+        room = world.get_room(character.location_id)
+        character.update_location(room)
+        room.add_character(character)
+        world.add_active_character(character)
+
+        character.coinage = 1234
+        character.skills["bartering"] = 7
+        character.is_dirty = True
+        await character.save()
+        await room.save(self.db)
+        await self.db.update_character_playtime(character.dbid, 60)
+
+        reloaded = Character(_NullWriter(), dict(await self.db.load_character_data(1)), world)
+        await reloaded.load_related_data()
+        self.assertEqual(reloaded.coinage, 1234)
+        self.assertEqual(reloaded.skills.get("bartering"), 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
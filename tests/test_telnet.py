@@ -0,0 +1,29 @@
+# tests/test_telnet.py
+import unittest
+
+from game.telnet import IAC, NOP, TelnetParser
+
+
+class TruncationTest(unittest.TestCase):
+    def test_cut_drops_split_character(self):
+        # "é" is two bytes and "€" three, so a 6-byte limit lands inside a character.
+        for text in ("abcdé€", "abcd€", "abcde€"):
+            for packet in (text.encode() + b"\r\n", text.encode() + bytes((IAC, NOP)) + b"\n"):
+                with self.subTest(text=text, packet=packet):
+                    [(line, truncated)] = TelnetParser(len(text.encode()) - 1).feed(packet)
+                    self.assertTrue(truncated)
+                    self.assertEqual(line.decode("utf-8"), text[:-1])
+
+    def test_cut_on_boundary_keeps_whole_characters(self):
+        [(line, truncated)] = TelnetParser(5).feed("abcé€€".encode() + b"\n")
+        self.assertTrue(truncated)
+        self.assertEqual(line.decode("utf-8"), "abcé")
+
+    def test_short_line_is_untouched(self):
+        [(line, truncated)] = TelnetParser(16).feed("abcé€".encode() + b"\n")
+        self.assertFalse(truncated)
+        self.assertEqual(line.decode("utf-8"), "abcé€")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+# tests/test_world_ambient.py
+import unittest
+
+from game.room import Room
+from game.world import World
+
+
+def _room(dbid, area_id):
+    return Room({"id": dbid, "area_id": area_id, "name": f"Room {dbid}", "description": ""})
+
+
+class AmbientIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.world = World(None)
+        for dbid, area_id in ((1, 10), (2, 10), (3, 20), (4, 20)):
+            self.world.rooms[dbid] = _room(dbid, area_id)
+        self.world.ambient_scripts = [
+            {"room_id": None, "area_id": 10, "script_text": "area ten"},
+            {"room_id": 1, "area_id": 10, "script_text": "room one, area ten"},
+            {"room_id": 3, "area_id": 10, "script_text": "room three, area ten"},
+            {"room_id": 4, "area_id": None, "script_text": "room four"},
+            {"room_id": None, "area_id": 20, "script_text": "area twenty"},
+        ]
+        self.world._index_ambient_scripts()
+
+    def _messages(self, room):
+        return (self.world.ambient_messages_by_room.get(room.dbid)
+                or self.world.ambient_messages_by_area.get(room.area_id) or [])
+
+    def test_index_matches_unindexed_filter(self):
+        for room in self.world.rooms.values():
+            expected = [f"<i>{s['script_text']}<x>" for s in self.world.ambient_scripts
+                        if s["room_id"] == room.dbid or s["area_id"] == room.area_id]
+            self.assertEqual(self._messages(room), expected, f"room {room.dbid}")
+
+    def test_script_with_room_and_area_reaches_both(self):
+        shown = "<i>room three, area ten<x>"
+        self.assertIn(shown, self._messages(self.world.rooms[3]))
+        self.assertIn(shown, self._messages(self.world.rooms[1]))
+        self.assertIn(shown, self._messages(self.world.rooms[2]))
+        self.assertNotIn(shown, self._messages(self.world.rooms[4]))
+
+
+if __name__ == "__main__":
+    unittest.main()
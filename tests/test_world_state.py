@@ -0,0 +1,58 @@
+# tests/test_world_state.py
+import asyncio
+import unittest
+
+from game.roundtime import RoundtimeField
+from game.room import Room
+from game.world import World
+
+
+class _Entity:
+    roundtime = RoundtimeField()
+
+    def __init__(self, world):
+        self.world = world
+        self.roundtime = 0.0
+
+
+class WorldStateTest(unittest.TestCase):
+    """Two worlds in one process must not share schedulers, indexes or day/night state."""
+
+    def test_roundtime_follows_its_own_world_clock(self):
+        first, second = World(None), World(None)
+        entity = _Entity(first)
+        entity.roundtime = 2.0
+        self.assertEqual(second.roundtimes.advance(5.0), [])
+        self.assertEqual(entity.roundtime, 2.0)
+        self.assertEqual(first.roundtimes.advance(2.0), [entity])
+        self.assertEqual(entity.roundtime, 0.0)
+
+    def test_schedulers_and_indexes_are_per_world(self):
+        first, second = World(None), World(None)
+        for name in ("rng", "roundtimes", "decay_index", "perception_checks", "command_scheduler"):
+            self.assertIsNot(getattr(first, name), getattr(second, name), name)
+        room = Room({"id": 1, "area_id": 1, "name": "Field", "description": "", "flags": '["OUTDOORS"]'})
+        first.perception_checks.notify(room)
+        self.assertEqual(len(first.perception_checks), 1)
+        self.assertEqual(len(second.perception_checks), 0)
+
+    def test_night_is_per_world(self):
+        day, night = World(None), World(None)
+        night.night = True
+        room = Room({"id": 1, "area_id": 1, "name": "Field", "description": "", "flags": '["OUTDOORS"]'})
+        self.assertFalse(room.is_dark(day))
+        self.assertTrue(room.is_dark(night))
+
+    def test_command_slots_work_in_back_to_back_event_loops(self):
+        async def run_one_command():
+            world = World(None)
+            async with world.command_scheduler.slots():
+                await asyncio.sleep(0)
+            return True
+
+        self.assertTrue(asyncio.run(run_one_command()))
+        self.assertTrue(asyncio.run(run_one_command()))
+
+
+if __name__ == "__main__":
+    unittest.main()
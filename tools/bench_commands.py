@@ -0,0 +1,68 @@
+# tools/bench_commands.py
+"""
+Microbenchmark for commands/handler.process_command.
+Drives the dispatcher with a stub character (no sockets, no database) and
+reports commands per second for a few representative paths.
+
+Usage: python -m tools.bench_commands [iterations]
+"""
+import asyncio
+import dataclasses
+import sys
+import time
+
+from game.commands import handler
+
+
+class _StubCharacter:
+    """Just enough of Character for process_command's checks."""
+    def __init__(self):
+        self.name = "Bench"
+        self.status = "ALIVE"
+        self.roundtime = 0.0
+        self.is_admin = False
+        self.sent = 0
+
+    async def send(self, message: str, add_newline: bool = True):
+        self.sent += 1
+
+
+async def _noop_command(character, world, args_str: str) -> bool:
+    return True
+
+
+async def _run_case(label: str, character: _StubCharacter, line: str, iterations: int):
+    process = handler.process_command
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await process(character, None, line)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {iterations / elapsed:>12,.0f} cmds/sec  ({elapsed * 1e6 / iterations:.2f} us/cmd)")
+
+
+async def main(iterations: int):
+    # Point a real command's spec at a no-op so we measure the dispatcher, not a command body.
+    # Every verb and generated abbreviation of "whisper" shares that spec.
+    spec = handler.find_command("whisper")
+    noop_spec = dataclasses.replace(spec, func=_noop_command)
+    for verb, entry in list(handler.COMMAND_TABLE.items()):
+        if entry is spec:
+            handler.COMMAND_TABLE[verb] = noop_spec
+    # "whisp" is not in COMMAND_MAP; it resolves only as a compiled abbreviation.
+    assert "whisp" not in handler.COMMAND_MAP and handler.find_command("whisp") is noop_spec
+
+    char = _StubCharacter()
+    await _run_case("exact verb", char, "whisper some args", iterations)
+    await _run_case("abbreviated verb", char, "whisp some args", iterations)
+    await _run_case("unknown verb", char, "xyzzy", iterations)
+
+    char.roundtime = 3.0
+    await _run_case("roundtime rejection", char, "whisper", iterations)
+    char.roundtime = 0.0
+
+    char.status = "DEAD"
+    await _run_case("dead rejection", char, "whisper", iterations)
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    asyncio.run(main(count))
@@ -0,0 +1,165 @@
+# tools/bench_mccp.py
+"""
+MCCP2 output-compression benchmark.
+Builds a synthetic world (tools/worldgen.py) on the in-memory database,
+logs in simulated characters, and plays the same scripted command mix as
+tools/replay_ticks.py for N ticks while recording every message each
+character is sent: room descriptions, combat, broadcasts and prompts. It
+then pushes each character's messages through game.telnet.TelnetWriter,
+the writer a real connection uses, at each zlib level asked for, and
+reports bytes on the wire against uncompressed bytes, and the CPU time
+compression costs per message and per connection.
+
+Usage:
+    python -m tools.bench_mccp --players 200 --ticks 300
+    python -m tools.bench_mccp --levels 1,6,9 --project 2000 --json mccp.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from typing import Any, Dict, List
+
+import config
+from game import telnet
+from game import ticker
+from game.commands import handler
+from tools import worldgen
+from tools.bench_ticks import build_world, _git_revision
+from tools.replay_ticks import _scripted_command
+
+
+class _RecordingWriter:
+    """Client StreamWriter stand-in that keeps each write as one message."""
+    transport = None
+
+    def __init__(self):
+        self.messages: List[bytes] = []
+
+    def write(self, data: bytes):
+        self.messages.append(data)
+
+    async def drain(self):
+        return None
+
+    def is_closing(self) -> bool:
+        return False
+
+    def get_extra_info(self, name: str, default=None):
+        return default
+
+
+class _CountingWriter(_RecordingWriter):
+    def __init__(self):
+        super().__init__()
+        self.bytes = 0
+
+    def write(self, data: bytes):
+        self.bytes += len(data)
+
+
+async def record_output(args: argparse.Namespace) -> List[List[bytes]]:
+    """Plays the scripted mix and returns the messages sent to each character."""
+    random.seed(args.seed)
+    world = await build_world(worldgen.WorldScale(rooms=args.rooms, mobs=args.mobs, players=args.players,
+                                                  ground_items=args.items, seed=args.seed))
+    world.subscribe_to_ticker()
+    characters = sorted(world.get_active_characters_list(), key=lambda c: c.dbid)
+    for character in characters:
+        character.writer = _RecordingWriter()
+
+    script_rng = random.Random(f"{args.seed}:script")
+    for _ in range(args.ticks):
+        for character in characters:
+            if character.roundtime <= 0 and script_rng.random() < args.activity:
+                # The prompt the connection handler would send before reading the command
+                await character.send(f"<{int(character.hp)}/{int(character.max_hp)}hp "
+                                     f"{int(character.essence)}/{int(character.max_essence)}e | "
+                                     f"{character.stance}> ", add_newline=False)
+                await handler.process_command(character, world, _scripted_command(character, script_rng))
+        await ticker.run_tick(args.dt)
+    return [character.writer.messages for character in characters]
+
+
+def measure(streams: List[List[bytes]], level: int) -> Dict[str, float]:
+    """Compresses every stream as its own connection and totals bytes and CPU time."""
+    raw_bytes = wire_bytes = messages = 0
+    cpu_seconds = 0.0
+    for stream in streams:
+        sink = _CountingWriter()
+        writer = telnet.TelnetWriter(sink, compression_level=level)
+        writer.start_compression()
+        started = time.process_time()
+        for message in stream:
+            writer.write(message)
+        cpu_seconds += time.process_time() - started
+        raw_bytes += writer.raw_bytes
+        wire_bytes += sink.bytes
+        messages += len(stream)
+    return {"level": level, "raw_bytes": raw_bytes, "wire_bytes": wire_bytes,
+            "ratio": wire_bytes / raw_bytes if raw_bytes else 1.0,
+            "cpu_seconds": cpu_seconds, "messages": messages,
+            "cpu_us_per_message": 1e6 * cpu_seconds / messages if messages else 0.0}
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    streams = await record_output(args)
+    simulated_seconds = args.ticks * args.dt
+    connections = len(streams)
+    levels = []
+    for level in args.levels:
+        result = measure(streams, level)
+        result["cpu_ms_per_connection_minute"] = 60e3 * result["cpu_seconds"] / connections / simulated_seconds
+        result["wire_kbit_per_connection"] = 8 * result["wire_bytes"] / 1000 / connections / simulated_seconds
+        # Share of one core needed to compress for --project connections at the same rate.
+        result["projected_cpu_percent"] = 100.0 * result["cpu_seconds"] / simulated_seconds * args.project / connections
+        levels.append(result)
+    raw_bytes = sum(len(m) for s in streams for m in s)
+    return {
+        "revision": _git_revision(),
+        "connections": connections,
+        "simulated_seconds": simulated_seconds,
+        "raw_kbit_per_connection": 8 * raw_bytes / 1000 / connections / simulated_seconds,
+        "project": args.project,
+        "levels": levels,
+    }
+
+
+def _print_results(report: Dict[str, Any]):
+    print(f"\n=== MCCP2 @ {report['revision']}: {report['connections']} connections, "
+          f"{report['simulated_seconds']:.0f}s of play ===")
+    print(f"Uncompressed   : {report['raw_kbit_per_connection']:.2f} kbit/s per connection")
+    print(f"{'level':>5} {'wire/raw':>9} {'kbit/s/conn':>12} {'us/msg':>8} {'CPU ms/conn/min':>16} "
+          f"{'CPU % @' + str(report['project']):>12}")
+    for r in report["levels"]:
+        print(f"{r['level']:>5} {100 * r['ratio']:>8.1f}% {r['wire_kbit_per_connection']:>12.2f} "
+              f"{r['cpu_us_per_message']:>8.1f} {r['cpu_ms_per_connection_minute']:>16.1f} "
+              f"{r['projected_cpu_percent']:>12.2f}")
+    # zlib deflate state is about (1 << (windowBits + 2)) + (1 << (memLevel + 9)) bytes with the defaults
+    print("Memory per compressed connection: ~256 KiB of zlib state (wbits 15, memLevel 8).")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure MCCP2 bandwidth savings and CPU cost.")
+    parser.add_argument("--rooms", type=int, default=2000)
+    parser.add_argument("--mobs", type=int, default=4000)
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--ticks", type=int, default=120)
+    parser.add_argument("--dt", type=float, default=config.TICKER_INTERVAL_SECONDS)
+    parser.add_argument("--activity", type=float, default=0.3, help="chance per tick that a ready character acts")
+    parser.add_argument("--levels", type=lambda s: [int(v) for v in s.split(",")],
+                        default=[1, config.MCCP_COMPRESSION_LEVEL, 9], help="comma-separated zlib levels")
+    parser.add_argument("--project", type=int, default=1000, help="connection count for the CPU projection")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    report = asyncio.run(run_benchmark(args))
+    _print_results(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
@@ -0,0 +1,240 @@
+# tools/bench_ticks.py
+"""
+Tick-throughput benchmark.
+Builds a synthetic world (tools/worldgen.py) on the in-memory database, logs
+in simulated characters with null writers, then drives every ticker callback
+directly for N ticks. Callbacks run one after another rather than gathered,
+so each one's time and allocations can be attributed to it.
+
+Usage:
+    python -m tools.bench_ticks --rooms 10000 --mobs 20000 --players 500 --ticks 100
+    python -m tools.bench_ticks --alloc --json results.json
+    python -m tools.bench_ticks --compare main HEAD --threshold 10
+
+--compare checks out each revision into a temporary git worktree and runs
+this benchmark there with the same scale, then reports per-callback changes
+and exits non-zero if any callback regressed past the threshold. Both
+revisions must contain this tool.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List, Any
+
+import config
+from game import ticker
+from game.character import Character
+from game.memory_database import InMemoryDatabaseManager
+from game.world import World
+from tools import worldgen
+
+
+class _NullWriter:
+    """Stands in for a client StreamWriter; counts bytes instead of sending them."""
+    transport = None
+
+    def __init__(self):
+        self.bytes_written = 0
+
+    def write(self, data: bytes):
+        self.bytes_written += len(data)
+
+    async def drain(self):
+        return None
+
+    def is_closing(self) -> bool:
+        return False
+
+    def get_extra_info(self, name: str, default=None):
+        return default
+
+
+def _peak_rss_mib() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def build_world(scale: worldgen.WorldScale) -> World:
+    """Builds a synthetic world with logged-in characters; RNG streams are seeded from the scale."""
+    db = InMemoryDatabaseManager(seed=scale.seed)
+    db.seed(worldgen.generate(scale))
+    await db.init_db()
+    world = World(db, rng_seed=scale.seed)
+    if not await world.build():
+        raise RuntimeError("World build failed.")
+
+    for row in await db.fetch_all_query("SELECT * FROM characters ORDER BY id"):
+        character = Character(_NullWriter(), row, world)
+        await character.load_related_data()
+        room = world.get_room(character.location_id) or world.get_room(1)
+        character.update_location(room)
+        room.add_character(character)
+        world.add_active_character(character)
+    return world
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    random.seed(args.seed)
+    scale = worldgen.WorldScale(rooms=args.rooms, mobs=args.mobs, players=args.players,
+                                ground_items=args.items, seed=args.seed)
+    started = time.perf_counter()
+    world = await build_world(scale)
+    build_seconds = time.perf_counter() - started
+    rss_after_build = _peak_rss_mib()
+
+    world.subscribe_to_ticker()
+    callbacks = sorted(ticker.subscribers(), key=lambda cb: cb.__name__)
+    timings: Dict[str, List[float]] = {cb.__name__: [] for cb in callbacks}
+    alloc_net: Dict[str, int] = dict.fromkeys(timings, 0)
+    alloc_peak: Dict[str, int] = dict.fromkeys(timings, 0)
+
+    if args.alloc:
+        tracemalloc.start()
+    for _ in range(args.ticks):
+        for cb in callbacks:
+            if args.alloc:
+                before, _peak = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+            start = time.perf_counter()
+            await cb(args.dt)
+            timings[cb.__name__].append(time.perf_counter() - start)
+            if args.alloc:
+                after, peak = tracemalloc.get_traced_memory()
+                alloc_net[cb.__name__] += after - before
+                alloc_peak[cb.__name__] = max(alloc_peak[cb.__name__], peak - before)
+    if args.alloc:
+        tracemalloc.stop()
+
+    results = {}
+    for name, samples in timings.items():
+        ordered = sorted(samples)
+        results[name] = {
+            "mean_ms": 1000.0 * sum(ordered) / len(ordered),
+            "p95_ms": 1000.0 * ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+            "max_ms": 1000.0 * ordered[-1],
+        }
+        if args.alloc:
+            results[name]["net_alloc_kib"] = alloc_net[name] / 1024.0
+            results[name]["peak_alloc_kib"] = alloc_peak[name] / 1024.0
+
+    return {
+        "revision": _git_revision(),
+        "scale": vars(scale),
+        "ticks": args.ticks,
+        "build_seconds": build_seconds,
+        "rss_after_build_mib": rss_after_build,
+        "peak_rss_mib": _peak_rss_mib(),
+        "callbacks": results,
+    }
+
+
+def _print_results(report: Dict[str, Any]):
+    scale = report["scale"]
+    print(f"=== Tick benchmark @ {report['revision']}: {scale['rooms']} rooms, {scale['mobs']} mobs, "
+          f"{scale['players']} players, {report['ticks']} ticks ===")
+    print(f"World build {report['build_seconds']:.2f}s; RSS after build {report['rss_after_build_mib']:.0f} MiB, "
+          f"peak {report['peak_rss_mib']:.0f} MiB")
+    has_alloc = any("net_alloc_kib" in r for r in report["callbacks"].values())
+    header = f"{'callback':<26} {'mean ms':>9} {'p95 ms':>9} {'max ms':>9}"
+    if has_alloc:
+        header += f" {'net KiB':>10} {'peak KiB':>10}"
+    print(header)
+    ranked = sorted(report["callbacks"].items(), key=lambda kv: kv[1]["mean_ms"], reverse=True)
+    for name, r in ranked:
+        line = f"{name:<26} {r['mean_ms']:>9.3f} {r['p95_ms']:>9.3f} {r['max_ms']:>9.3f}"
+        if has_alloc:
+            line += f" {r['net_alloc_kib']:>10.1f} {r['peak_alloc_kib']:>10.1f}"
+        print(line)
+    total = sum(r["mean_ms"] for r in report["callbacks"].values())
+    print(f"{'TOTAL per tick':<26} {total:>9.3f}")
+
+
+def _bench_args(args: argparse.Namespace) -> List[str]:
+    argv = ["--rooms", str(args.rooms), "--mobs", str(args.mobs), "--players", str(args.players),
+            "--items", str(args.items), "--seed", str(args.seed), "--ticks", str(args.ticks), "--dt", str(args.dt)]
+    return argv + (["--alloc"] if args.alloc else [])
+
+
+def _run_at_revision(revision: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Runs the benchmark inside a temporary worktree checked out at revision."""
+    workdir = tempfile.mkdtemp(prefix="chrozal_bench_")
+    worktree = os.path.join(workdir, "tree")
+    out_path = os.path.join(workdir, "result.json")
+    subprocess.run(["git", "worktree", "add", "--detach", worktree, revision], check=True, capture_output=True)
+    try:
+        print(f"Running benchmark at {revision}...", flush=True)
+        subprocess.run([sys.executable, "-m", "tools.bench_ticks", *_bench_args(args), "--json", out_path],
+                       cwd=worktree, check=True, stdout=subprocess.DEVNULL)
+        with open(out_path) as f:
+            return json.load(f)
+    finally:
+        subprocess.run(["git", "worktree", "remove", "--force", worktree], capture_output=True)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def compare(base_rev: str, head_rev: str, args: argparse.Namespace) -> int:
+    """Prints per-callback deltas between two revisions. Returns the number of regressions."""
+    base, head = _run_at_revision(base_rev, args), _run_at_revision(head_rev, args)
+    print(f"\n=== {base_rev} ({base['revision']}) -> {head_rev} ({head['revision']}), mean ms per tick ===")
+    print(f"{'callback':<26} {'base':>9} {'head':>9} {'change':>8}")
+    regressions = 0
+    for name in sorted(set(base["callbacks"]) | set(head["callbacks"])):
+        before = base["callbacks"].get(name, {}).get("mean_ms")
+        after = head["callbacks"].get(name, {}).get("mean_ms")
+        if before is None or after is None:
+            print(f"{name:<26} {before if before is not None else '-':>9} {after if after is not None else '-':>9}")
+            continue
+        change = 100.0 * (after - before) / before if before else 0.0
+        flag = ""
+        if change > args.threshold and after - before > args.min_delta_ms:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{name:<26} {before:>9.3f} {after:>9.3f} {change:>+7.1f}%{flag}")
+    print(f"Peak RSS: {base['peak_rss_mib']:.0f} MiB -> {head['peak_rss_mib']:.0f} MiB")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark World ticker callbacks on a synthetic world.")
+    parser.add_argument("--rooms", type=int, default=worldgen.WorldScale.rooms)
+    parser.add_argument("--mobs", type=int, default=worldgen.WorldScale.mobs)
+    parser.add_argument("--players", type=int, default=worldgen.WorldScale.players)
+    parser.add_argument("--items", type=int, default=worldgen.WorldScale.ground_items)
+    parser.add_argument("--seed", type=int, default=worldgen.WorldScale.seed)
+    parser.add_argument("--ticks", type=int, default=100)
+    parser.add_argument("--dt", type=float, default=config.TICKER_INTERVAL_SECONDS, help="seconds per simulated tick")
+    parser.add_argument("--alloc", action="store_true", help="track allocations per callback (slower)")
+    parser.add_argument("--json", help="also write results to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "HEAD"), help="compare two git revisions")
+    parser.add_argument("--threshold", type=float, default=10.0, help="regression threshold in percent")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05, help="ignore changes smaller than this")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    if args.compare:
+        sys.exit(1 if compare(args.compare[0], args.compare[1], args) else 0)
+
+    report = asyncio.run(run_benchmark(args))
+    _print_results(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2, default=str)
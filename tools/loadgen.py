@@ -0,0 +1,309 @@
+# tools/loadgen.py
+"""
+Headless load generator for end-to-end capacity testing.
+Spawns N asyncio telnet bots against a running server. Each bot creates or
+logs into its own account, creates or picks a character, then plays a
+weighted mix of commands while we measure command round-trip latency
+(command sent -> next game prompt), throughput and error rates.
+
+Usage:
+    python -m tools.loadgen --bots 100 --duration 60
+    python -m tools.loadgen --bots 250 --ramp 30 --mix walk=5,look=3,attack=1,get=1,drop=1,say=2
+
+Run it against a server on a local Postgres, or against
+`python -m tools.run_offline_server` to take the database out of the picture.
+--mccp makes every bot accept MCCP2 compression and reports bytes received
+on the wire against bytes after decompression.
+"""
+import argparse
+import asyncio
+import random
+import re
+import string
+import time
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+ANSI_RE = re.compile(r"\x1b\[[0-9;]*m")
+# Unanchored: another player's broadcast can land right after the prompt.
+GAME_PROMPT_RE = re.compile(r"<\d+/\d+hp \d+/\d+e \| \w+> ")
+EXITS_RE = re.compile(r"\[Exits: ([^\]]*)\]")
+CREATURES_RE = re.compile(r"Visible Creatures: (.*)\.")
+GROUND_RE = re.compile(r"You see here: (.*)\.")
+SCORES_RE = re.compile(r"Available scores: \[ ([\d, ]+) \]\s*Assign a score to \w+:\s*$")
+COUNT_SUFFIX_RE = re.compile(r" \(x\d+\)$")
+
+MCCP_DO = bytes((255, 253, 86))           # IAC DO COMPRESS2
+MCCP_START = bytes((255, 250, 86, 255, 240))  # IAC SB COMPRESS2 IAC SE
+DEFAULT_MIX = "walk=5,look=3,attack=1,get=1,drop=1,say=2"
+DIRECTIONS = {"north", "south", "east", "west", "up", "down", "northeast", "northwest", "southeast", "southwest"}
+SAY_LINES = ["hello", "anyone around?", "nice weather", "lag check", "heading out"]
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _letters_for(index: int) -> str:
+    """Stable alphabetic suffix for character names, which must be letters only."""
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = string.ascii_lowercase[rem] + letters
+    return letters
+
+
+class Stats:
+    """Results shared by all bots."""
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.login_times: List[float] = []
+        self.wire_bytes = 0     # Bytes received from the server
+        self.output_bytes = 0   # The same after MCCP2 decompression
+        self.commands = 0
+        self.bots_playing = 0
+
+
+class Bot:
+    def __init__(self, index: int, args: argparse.Namespace, stats: Stats, mix: List[Tuple[str, int]]):
+        self.index = index
+        self.args = args
+        self.stats = stats
+        self.rng = random.Random(args.seed + index)
+        self.mix_actions = [name for name, _ in mix]
+        self.mix_weights = [weight for _, weight in mix]
+        self.username = f"{args.prefix}{index:05d}"
+        self.first_name = ("Bot" + _letters_for(index))[:15].capitalize()
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.buffer = ""
+        self._inflater = None
+        self.exits: List[str] = []
+        self.creatures: List[str] = []
+        self.ground: List[str] = []
+        self.carrying: List[str] = []
+
+    # --- I/O helpers ---
+    async def _send_line(self, line: str):
+        self.writer.write((line + "\r\n").encode("utf-8"))
+        await self.writer.drain()
+
+    async def _read_until(self, pattern: re.Pattern, timeout: float, through_last: bool = False) -> re.Match:
+        """
+        Reads until pattern matches the accumulated output, then consumes it up
+        to the end of the first match (or the last one, with through_last).
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            match = pattern.search(self.buffer)
+            if match:
+                if through_last:
+                    for match in pattern.finditer(self.buffer, match.start()):
+                        pass
+                consumed, self.buffer = self.buffer[:match.end()], self.buffer[match.end():]
+                self._observe(consumed)
+                return match
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise asyncio.TimeoutError
+            chunk = await asyncio.wait_for(self.reader.read(4096), timeout=remaining)
+            if not chunk:
+                raise ConnectionError("server closed connection")
+            self.buffer += ANSI_RE.sub("", self._inflate(chunk).decode("utf-8", errors="replace"))
+
+    async def _read_prompt(self, timeout: float) -> re.Match:
+        """Waits for the game prompt and consumes the output through the last prompt seen."""
+        return await self._read_until(GAME_PROMPT_RE, timeout, through_last=True)
+
+    def _inflate(self, chunk: bytes) -> bytes:
+        """Undoes MCCP2 compression once the server has started it."""
+        self.stats.wire_bytes += len(chunk)
+        if self._inflater is not None:
+            chunk = self._inflater.decompress(chunk)
+        elif getattr(self.args, "mccp", False) and MCCP_START in chunk:
+            head, _, tail = chunk.partition(MCCP_START)
+            self._inflater = zlib.decompressobj()
+            chunk = head + self._inflater.decompress(tail)
+        self.stats.output_bytes += len(chunk)
+        return chunk
+
+    async def _connect(self):
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(self.args.host, self.args.port), timeout=self.args.timeout)
+        if getattr(self.args, "mccp", False):
+            self.writer.write(MCCP_DO)
+
+    def _observe(self, text: str):
+        """Updates what the bot knows about its room from server output."""
+        if match := EXITS_RE.search(text):
+            exits = match.group(1).strip()
+            self.exits = [] if exits == "none" else [e.strip() for e in exits.split(",") if e.strip()]
+            self.creatures, self.ground = [], []
+        if match := CREATURES_RE.search(text):
+            self.creatures = [COUNT_SUFFIX_RE.sub("", c.strip()) for c in match.group(1).split(",")]
+        if match := GROUND_RE.search(text):
+            self.ground = [COUNT_SUFFIX_RE.sub("", g.strip()) for g in match.group(1).split(",")
+                           if "coin" not in g]
+        if "Huh?" in text:
+            self.stats.errors["unknown_command"] += 1
+
+    # --- Login / creation ---
+    async def _login(self):
+        password = self.args.password
+        # Order matters: more specific prompts first.
+        responses = [
+            (re.compile(r"Enter your account name: $"), lambda m: self.username),
+            (re.compile(r"Create it\? \(yes/no\): $"), lambda m: "yes"),
+            (re.compile(r"Enter your email address: $"), lambda m: f"{self.username}@loadtest.local"),
+            (re.compile(r"Choose a password \(min 6 characters\): $"), lambda m: password),
+            (re.compile(r"Confirm password: $"), lambda m: password),
+            (re.compile(r"Password for \S+: $"), lambda m: password),
+            (re.compile(r"Enter the number of a character, or type 'new':\s*$"), lambda m: "1"),
+            (re.compile(r"Enter character first name \(or 'quit'\): $"), lambda m: self.first_name),
+            (re.compile(r"Enter character last name \(or 'quit'\): $"), lambda m: "Loadtest"),
+            (re.compile(r"Enter choice \(m/f/t\): $"), lambda m: "t"),
+            (re.compile(r"Enter the number of your choice: $"), lambda m: "1"),
+            (re.compile(r"'reroll' to try again: $"), lambda m: "keep"),
+            (SCORES_RE, lambda m: m.group(1).split(",")[0].strip()),
+            (re.compile(r"Enter the number for your desired [\w ]+: $"), lambda m: "1"),
+        ]
+        any_prompt = re.compile("|".join(f"(?:{p.pattern})" for p, _ in responses) + f"|(?:{GAME_PROMPT_RE.pattern})")
+
+        while True:
+            match = await self._read_until(any_prompt, self.args.timeout)
+            text = match.group(0)
+            if GAME_PROMPT_RE.search(text):
+                return
+            for pattern, respond in responses:
+                if sub := pattern.search(text):
+                    await self._send_line(respond(sub))
+                    break
+
+    # --- Behaviour mix ---
+    def _next_command(self) -> Tuple[str, str]:
+        action = self.rng.choices(self.mix_actions, weights=self.mix_weights)[0]
+        if action == "walk" and self.exits:
+            exit_name = self.rng.choice(self.exits)
+            return action, exit_name if exit_name in DIRECTIONS else f"go {exit_name}"
+        if action == "attack" and self.creatures:
+            return action, f"attack {self.rng.choice(self.creatures).split()[-1].lower()}"
+        if action == "get" and self.ground:
+            item = self.rng.choice(self.ground).split()[-1].lower()
+            self.carrying.append(item)
+            return action, f"get {item}"
+        if action == "drop" and self.carrying:
+            return action, f"drop {self.carrying.pop()}"
+        if action == "say":
+            return action, f"say {self.rng.choice(SAY_LINES)}"
+        return "look", "look"
+
+    async def run(self, stop_at: float):
+        start = time.monotonic()
+        try:
+            await self._connect()
+            await self._login()
+        except (OSError, ConnectionError, asyncio.TimeoutError) as e:
+            self.stats.errors[f"login_{type(e).__name__}"] += 1
+            await self._close()
+            return
+
+        self.stats.login_times.append(time.monotonic() - start)
+        self.stats.bots_playing += 1
+        await self._send_line("look")
+        try:
+            await self._read_prompt(self.args.timeout)
+            while time.monotonic() < stop_at:
+                await asyncio.sleep(self.rng.uniform(0.5, 1.5) * self.args.think_ms / 1000.0)
+                action, line = self._next_command()
+                sent_at = time.monotonic()
+                await self._send_line(line)
+                await self._read_prompt(self.args.timeout)
+                self.stats.latencies[action].append(time.monotonic() - sent_at)
+                self.stats.commands += 1
+        except asyncio.TimeoutError:
+            self.stats.errors["command_timeout"] += 1
+        except (OSError, ConnectionError):
+            self.stats.errors["disconnected"] += 1
+        finally:
+            self.stats.bots_playing -= 1
+            await self._close()
+
+    async def _close(self):
+        if self.writer and not self.writer.is_closing():
+            try:
+                await self._send_line("quit")
+            except (OSError, ConnectionError):
+                pass
+            self.writer.close()
+
+
+def _parse_mix(mix: str) -> List[Tuple[str, int]]:
+    parsed = []
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        parsed.append((name.strip(), int(weight or 1)))
+    return parsed
+
+
+def _report(stats: Stats, elapsed: float, bots: int):
+    all_latencies = sorted(l for values in stats.latencies.values() for l in values)
+    print(f"\n=== Load test: {bots} bots, {elapsed:.1f}s ===")
+    print(f"Logged in      : {len(stats.login_times)}/{bots}"
+          f" (median login {_percentile(sorted(stats.login_times), 50) * 1000:.0f} ms)")
+    print(f"Commands       : {stats.commands} ({stats.commands / elapsed:.1f}/s)")
+    header = f"{'action':<10} {'count':>7} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+    print(header)
+    rows = sorted(stats.latencies.items()) + [("ALL", all_latencies)]
+    for action, values in rows:
+        values = sorted(values)
+        if not values:
+            continue
+        print(f"{action:<10} {len(values):>7} {_percentile(values, 50) * 1000:>8.1f} "
+              f"{_percentile(values, 90) * 1000:>8.1f} {_percentile(values, 99) * 1000:>8.1f} {values[-1] * 1000:>8.1f}")
+    if stats.wire_bytes != stats.output_bytes:
+        print(f"Bytes received : {stats.wire_bytes} on the wire for {stats.output_bytes} of output "
+              f"({100.0 * stats.wire_bytes / max(1, stats.output_bytes):.1f}%)")
+    total_errors = sum(stats.errors.values())
+    print(f"Errors         : {total_errors} ({100.0 * total_errors / max(1, stats.commands):.2f}% of commands)")
+    for kind, count in sorted(stats.errors.items()):
+        print(f"  {kind:<24} {count}")
+
+
+async def main(args: argparse.Namespace):
+    stats = Stats()
+    mix = _parse_mix(args.mix)
+    started = time.monotonic()
+    stop_at = started + args.ramp + args.duration
+
+    tasks = []
+    for i in range(args.bots):
+        bot = Bot(args.first + i, args, stats, mix)
+        tasks.append(asyncio.create_task(bot.run(stop_at)))
+        if args.ramp:
+            await asyncio.sleep(args.ramp / args.bots)
+    await asyncio.gather(*tasks)
+    _report(stats, time.monotonic() - started, args.bots)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Spawn telnet bots against a local Chrozal server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4000)
+    parser.add_argument("--bots", type=int, default=25, help="number of concurrent clients")
+    parser.add_argument("--first", type=int, default=0, help="index of the first bot account")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds of play after ramp-up")
+    parser.add_argument("--ramp", type=float, default=10.0, help="seconds over which bots connect")
+    parser.add_argument("--think-ms", type=float, default=1000.0, help="mean pause between commands")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="weighted actions: walk,look,attack,get,drop,say")
+    parser.add_argument("--prefix", default="loadbot", help="account name prefix")
+    parser.add_argument("--password", default="loadtest")
+    parser.add_argument("--timeout", type=float, default=15.0, help="seconds to wait for any expected prompt")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--mccp", action="store_true", help="accept MCCP2 compression from the server")
+    asyncio.run(main(parser.parse_args()))
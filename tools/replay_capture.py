@@ -0,0 +1,224 @@
+# tools/replay_capture.py
+"""
+Replays a client-input capture (see game/capture.py, @capture) against a
+running test server and measures how the build handles it.
+
+Every captured connection becomes a telnet client that connects at its
+captured offset, logs in to its own test account (captured login lines are
+never stored, so the tool answers the login and creation prompts itself, as
+tools/loadgen.py does), then sends its in-game lines on the captured
+schedule. --speed 10 replays ten times faster. Each command's latency is
+measured from send to the next game prompt; a client that is still waiting
+on a prompt when its next line is due sends it late, and that slip is
+reported too. Character creation input is not captured.
+
+Usage:
+    python -m tools.replay_capture diagnostics/capture_20250101_120000.jsonl.gz --speed 4 --json head.json
+    python -m tools.replay_capture --compare base.json head.json
+    python -m tools.replay_capture --check-anonymizer
+"""
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple, Any
+
+from game import capture
+from tools import loadgen
+
+@dataclass
+class CapturedConnection:
+    conn_id: int
+    opened_ms: int
+    lines: List[Tuple[int, str]] = field(default_factory=list)  # (offset ms, in-game line)
+    skipped: int = 0                                           # Lines typed before play; not stored
+
+
+def load_connections(path: str) -> Tuple[Dict[str, Any], List[CapturedConnection]]:
+    header: Dict[str, Any] = {}
+    connections: Dict[int, CapturedConnection] = {}
+    for entry in capture.load_capture(path):
+        if entry.get("type") == "header":
+            header = entry
+            continue
+        conn = connections.get(entry["c"])
+        if conn is None:
+            conn = connections[entry["c"]] = CapturedConnection(entry["c"], entry["t"])
+        if "l" in entry:
+            conn.lines.append((entry["t"], entry["l"]))
+        elif "n" in entry:
+            conn.skipped += 1
+    return header, sorted(connections.values(), key=lambda c: c.opened_ms)
+
+
+def _verb(line: str) -> str:
+    verb = line.split(" ", 1)[0].lower() if line else ""
+    return "walk" if verb in loadgen.DIRECTIONS or verb == "go" else (verb or "<blank>")
+
+
+class ReplayClient(loadgen.Bot):
+    """A loadgen bot that plays a captured connection instead of a random mix."""
+    def __init__(self, conn: CapturedConnection, args: argparse.Namespace, stats: loadgen.Stats, slips: List[float]):
+        super().__init__(args.first + conn.conn_id, args, stats, [("look", 1)])
+        self.conn = conn
+        self.slips = slips
+
+    async def replay(self, started: float):
+        speed = self.args.speed
+        await asyncio.sleep(max(0.0, started + self.conn.opened_ms / 1000.0 / speed - time.monotonic()))
+        try:
+            await self._connect()
+            login_started = time.monotonic()
+            await self._login()
+            self.stats.login_times.append(time.monotonic() - login_started)
+        except (OSError, ConnectionError, asyncio.TimeoutError) as e:
+            self.stats.errors[f"login_{type(e).__name__}"] += 1
+            await self._close()
+            return
+
+        self.stats.bots_playing += 1
+        # Login here need not take as long as it did live, so in-game lines keep their
+        # captured spacing from whichever is later: their captured start or our login.
+        first_ms = self.conn.lines[0][0] if self.conn.lines else 0
+        play_started = max(time.monotonic(), started + first_ms / 1000.0 / speed)
+        try:
+            for offset_ms, line in self.conn.lines:
+                due = play_started + (offset_ms - first_ms) / 1000.0 / speed
+                now = time.monotonic()
+                if due > now:
+                    await asyncio.sleep(due - now)
+                else:
+                    self.slips.append(now - due)
+                if line.lower() == "quit":
+                    break
+                sent_at = time.monotonic()
+                await self._send_line(line)
+                await self._read_prompt(self.args.timeout)
+                self.stats.latencies[_verb(line)].append(time.monotonic() - sent_at)
+                self.stats.commands += 1
+        except asyncio.TimeoutError:
+            self.stats.errors["command_timeout"] += 1
+        except (OSError, ConnectionError):
+            self.stats.errors["disconnected"] += 1
+        finally:
+            self.stats.bots_playing -= 1
+            await self._close()
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    values = sorted(values)
+    return {"count": len(values), "p50_ms": 1000.0 * loadgen._percentile(values, 50),
+            "p90_ms": 1000.0 * loadgen._percentile(values, 90),
+            "p99_ms": 1000.0 * loadgen._percentile(values, 99),
+            "max_ms": 1000.0 * values[-1] if values else 0.0}
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run_replay(args: argparse.Namespace) -> Dict[str, Any]:
+    header, connections = load_connections(args.path)
+    stats, slips = loadgen.Stats(), []
+    started = time.monotonic()
+    await asyncio.gather(*(ReplayClient(conn, args, stats, slips).replay(started) for conn in connections))
+    elapsed = time.monotonic() - started
+
+    all_latencies = [l for values in stats.latencies.values() for l in values]
+    return {
+        "revision": args.label or _git_revision(),
+        "capture": args.path,
+        "captured_at": header.get("started"),
+        "speed": args.speed,
+        "connections": len(connections),
+        "logged_in": len(stats.login_times),
+        "elapsed_seconds": elapsed,
+        "commands": stats.commands,
+        "commands_per_second": stats.commands / elapsed if elapsed else 0.0,
+        "login": _summary(stats.login_times),
+        "latency": {verb: _summary(values) for verb, values in sorted(stats.latencies.items())},
+        "all": _summary(all_latencies),
+        "slip": _summary(slips),
+        "errors": dict(stats.errors),
+    }
+
+
+def _print_report(report: Dict[str, Any], top: int):
+    print(f"\n=== Capture replay @ {report['revision']}: {report['capture']} at {report['speed']}x ===")
+    print(f"Connections    : {report['logged_in']}/{report['connections']} logged in"
+          f" (median login {report['login']['p50_ms']:.0f} ms)")
+    print(f"Commands       : {report['commands']} in {report['elapsed_seconds']:.1f}s "
+          f"({report['commands_per_second']:.1f}/s)")
+    print(f"Schedule slip  : {report['slip']['count']} late sends, p90 {report['slip']['p90_ms']:.0f} ms")
+    print(f"{'verb':<12} {'count':>7} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    ranked = sorted(report["latency"].items(), key=lambda kv: kv[1]["count"], reverse=True)[:top]
+    for verb, s in ranked + [("ALL", report["all"])]:
+        print(f"{verb:<12} {s['count']:>7} {s['p50_ms']:>8.1f} {s['p90_ms']:>8.1f} {s['p99_ms']:>8.1f} {s['max_ms']:>8.1f}")
+    for kind, count in sorted(report["errors"].items()):
+        print(f"  error {kind:<24} {count}")
+
+
+def compare(base_path: str, head_path: str, top: int):
+    with open(base_path) as f:
+        base = json.load(f)
+    with open(head_path) as f:
+        head = json.load(f)
+    if (base["capture"], base["speed"]) != (head["capture"], head["speed"]):
+        print("Warning: the two reports replayed different captures or speeds.")
+    print(f"=== {base['revision']} -> {head['revision']} ===")
+    print(f"Throughput     : {base['commands_per_second']:.1f}/s -> {head['commands_per_second']:.1f}/s")
+    print(f"Errors         : {sum(base['errors'].values())} -> {sum(head['errors'].values())}")
+    print(f"{'verb':<12} {'base p50':>9} {'head p50':>9} {'change':>8} {'base p99':>9} {'head p99':>9} {'change':>8}")
+    verbs = sorted(set(base["latency"]) & set(head["latency"]),
+                   key=lambda v: base["latency"][v]["count"], reverse=True)[:top]
+    for verb, b, h in [(v, base["latency"][v], head["latency"][v]) for v in verbs] + [("ALL", base["all"], head["all"])]:
+        cells = []
+        for key in ("p50_ms", "p99_ms"):
+            change = 100.0 * (h[key] - b[key]) / b[key] if b[key] else 0.0
+            cells.append(f"{b[key]:>9.1f} {h[key]:>9.1f} {change:>+7.1f}%")
+        print(f"{verb:<12} {' '.join(cells)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay captured client input against a running server.")
+    parser.add_argument("path", nargs="?", help="capture file written by @capture")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4000)
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier")
+    parser.add_argument("--first", type=int, default=0, help="offset added to account numbers")
+    parser.add_argument("--prefix", default="replay", help="account name prefix")
+    parser.add_argument("--password", default="replaytest")
+    parser.add_argument("--timeout", type=float, default=15.0, help="seconds to wait for any expected prompt")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--label", help="name for this build in reports (default: git revision)")
+    parser.add_argument("--json", help="also write the report to this file")
+    parser.add_argument("--top", type=int, default=20, help="verbs to show, by count")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "HEAD"), help="compare two --json reports")
+    parser.add_argument("--check-anonymizer", action="store_true",
+                        help="only check that every speech verb and abbreviation is masked in captures")
+    args = parser.parse_args()
+
+    if args.check_anonymizer:
+        problems = capture.check_anonymizer()
+        for problem in problems:
+            print(f"Leak: {problem}")
+        print(f"Anonymizer check: {len(problems)} problems.")
+        sys.exit(1 if problems else 0)
+    if args.compare:
+        compare(args.compare[0], args.compare[1], args.top)
+        sys.exit(0)
+    if not args.path:
+        parser.error("a capture file is required unless --compare is given")
+
+    report = asyncio.run(run_replay(args))
+    _print_report(report, args.top)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
@@ -0,0 +1,54 @@
+# tools/run_offline_server.py
+"""
+Runs the full server against the in-memory database instead of PostgreSQL.
+Useful for load tests (tools/loadgen.py) and profiling without a database;
+optional injected latency approximates a remote DB. Nothing is persisted.
+By default the world is the small fixture init_db seeds; --rooms seeds a
+synthetic world from tools/worldgen.py instead, so load tests can run at scale.
+
+Usage:
+    python -m tools.run_offline_server
+    python -m tools.run_offline_server --latency-ms 2 --jitter-ms 3
+    python -m tools.run_offline_server --rooms 10000 --mobs 20000 --items 5000
+"""
+import argparse
+import asyncio
+import logging
+
+import server
+from game import logging_setup
+from game.memory_database import InMemoryDatabaseManager
+from tools import worldgen
+
+log = logging.getLogger(__name__)
+
+
+def main(args: argparse.Namespace):
+    logging_setup.setup_logging(logging.INFO)
+    server.db_manager = InMemoryDatabaseManager(
+        latency=args.latency_ms / 1000.0, jitter=args.jitter_ms / 1000.0, seed=args.seed)
+    if args.rooms:
+        scale = worldgen.WorldScale(rooms=args.rooms, mobs=args.mobs, players=args.players,
+                                    ground_items=args.items, seed=args.world_seed)
+        server.db_manager.seed(worldgen.generate(scale))
+        log.info("Seeded synthetic world: %d rooms, %d mobs, %d ground items, %d characters.",
+                 scale.rooms, scale.mobs, scale.ground_items, scale.players)
+    try:
+        asyncio.run(server.main())
+    except KeyboardInterrupt:
+        log.info("Offline server stopped manually.")
+    finally:
+        logging_setup.stop_logging()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the Chrozal server on an in-memory database.")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="fixed delay added to every DB call")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="extra random delay, uniform in [0, jitter]")
+    parser.add_argument("--seed", type=int, default=None, help="seed for the latency jitter")
+    parser.add_argument("--rooms", type=int, default=0, help="seed a synthetic world of this many rooms (0: fixture)")
+    parser.add_argument("--mobs", type=int, default=worldgen.WorldScale.mobs)
+    parser.add_argument("--items", type=int, default=worldgen.WorldScale.ground_items)
+    parser.add_argument("--players", type=int, default=0, help="synthetic characters (offline; not logged in)")
+    parser.add_argument("--world-seed", type=int, default=worldgen.WorldScale.seed)
+    main(parser.parse_args())
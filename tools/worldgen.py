@@ -0,0 +1,174 @@
+# tools/worldgen.py
+"""
+Synthetic world generator for scale testing.
+Produces table rows (areas, rooms, exits, mob templates/attacks, spawners,
+ground items, ambient scripts, players and characters) in the shape the
+database returns them, ready for InMemoryDatabaseManager.seed(). The same
+seed and scale always produce the same world.
+
+Rooms are laid out on a square grid with cardinal exits between neighbours;
+each area is a contiguous block of the grid.
+
+Usage (prints a summary):
+    python -m tools.worldgen --rooms 10000 --mobs 20000 --players 500
+"""
+import argparse
+import json
+import math
+import random
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Any
+
+from game.definitions import slots
+
+
+@dataclass
+class WorldScale:
+    rooms: int = 10000
+    mobs: int = 20000
+    players: int = 500
+    ground_items: int = 5000
+    rooms_per_area: int = 250
+    outdoor_fraction: float = 0.4
+    seed: int = 1
+
+
+MOB_KINDS = [
+    # (name, level, max_hp, movement_chance, flags)
+    ("a giant rat", 1, 12, 0.02, []),
+    ("a feral dog", 2, 20, 0.05, ["AGGRESSIVE"]),
+    ("a forest wolf", 3, 30, 0.04, ["AGGRESSIVE"]),
+    ("a cave spider", 3, 25, 0.0, ["CAN_HIDE"]),
+    ("a bandit", 5, 45, 0.01, ["AGGRESSIVE"]),
+    ("a town guard", 8, 90, 0.0, ["STATIONARY"]),
+    ("a wandering merchant", 4, 35, 0.03, []),
+    ("an old hermit", 6, 40, 0.0, ["STATIONARY"]),
+]
+
+ITEM_KINDS = [
+    # (name, type, stats, flags)
+    ("a loaf of bread", "FOOD", {"weight": 1, "value": 2, "nourishment": 20}, ["DECAYS"]),
+    ("a waterskin", "DRINK", {"weight": 2, "value": 5, "hydration": 25}, []),
+    ("a rusty dagger", "WEAPON", {"weight": 2, "value": 10, "damage_base": 2, "damage_rng": 4, "speed": 2.0}, []),
+    ("a leather cap", "ARMOR", {"weight": 2, "value": 12, "armor": 1, "wear_location": "head"}, []),
+    ("a torch", "LIGHT_SOURCE", {"weight": 1, "value": 1}, ["DECAYS"]),
+    ("a pile of bones", "GENERAL", {"weight": 3, "value": 0}, ["DECAYS"]),
+]
+
+AMBIENT_LINES = [
+    "A cold wind stirs the dust.",
+    "Somewhere nearby, a bird calls out.",
+    "You hear distant footsteps.",
+    "Leaves rustle overhead.",
+]
+
+
+def generate(scale: WorldScale) -> Dict[str, List[Dict[str, Any]]]:
+    """Returns {table_name: [row, ...]} for a world of the requested scale."""
+    rng = random.Random(scale.seed)
+    tables: Dict[str, List[Dict[str, Any]]] = {name: [] for name in (
+        "areas", "rooms", "exits", "mob_templates", "mob_attacks", "item_templates", "item_instances",
+        "ambient_scripts", "players", "characters", "character_stats", "character_equipment")}
+
+    # --- Areas and rooms on a grid ---
+    width = max(1, math.ceil(math.sqrt(scale.rooms)))
+    area_count = max(1, math.ceil(scale.rooms / scale.rooms_per_area))
+    for area_id in range(1, area_count + 1):
+        tables["areas"].append({"id": area_id, "name": f"Synthetic Area {area_id}", "description": "Generated."})
+
+    for index in range(scale.rooms):
+        room_id = index + 1
+        flags = set()
+        if rng.random() < scale.outdoor_fraction:
+            flags.add("OUTDOORS")
+        elif rng.random() < 0.3:
+            flags.add("LIT")
+        if rng.random() < 0.01:
+            flags.add("NODE")
+        if room_id == 1:
+            flags.update(("NODE", "RESPAWN"))
+        tables["rooms"].append({
+            "id": room_id, "area_id": index // scale.rooms_per_area + 1,
+            "name": f"Room {room_id}", "description": "A generated room.",
+            "flags": json.dumps(sorted(flags)), "spawners": "{}",
+        })
+
+        col = index % width
+        neighbours = {"north": index - width, "south": index + width,
+                      "west": index - 1 if col > 0 else -1, "east": index + 1 if col < width - 1 else -1}
+        for direction, target in neighbours.items():
+            if 0 <= target < scale.rooms:
+                tables["exits"].append({"source_room_id": room_id, "direction": direction,
+                                        "destination_room_id": target + 1, "details": "{}", "is_hidden": False})
+
+    # --- Mob templates and spawners ---
+    for template_id, (name, level, max_hp, movement, flags) in enumerate(MOB_KINDS, start=1):
+        tables["mob_templates"].append({
+            "id": template_id, "name": name, "description": f"It is {name}.", "level": level, "max_hp": max_hp,
+            "stats": json.dumps({"might": 10 + level, "vitality": 10 + level, "agility": 10, "intellect": 6,
+                                 "aura": 6, "persona": 6}),
+            "flags": json.dumps(flags),
+            "movement_chance": movement, "respawn_delay_seconds": 60, "variance": json.dumps({"max_hp_pct": 10}),
+        })
+        tables["mob_attacks"].append({"mob_template_id": template_id, "name": "bite" if level < 3 else "strike",
+                                      "damage_base": level, "damage_rng": level + 2, "speed": 2.0})
+
+    spawners: Dict[int, Dict[int, Dict[str, int]]] = {}
+    for _ in range(scale.mobs):
+        room_index = rng.randrange(scale.rooms)
+        template_id = rng.randrange(len(MOB_KINDS)) + 1
+        room_spawners = spawners.setdefault(room_index, {})
+        room_spawners.setdefault(template_id, {"max_present": 0})["max_present"] += 1
+    for room_index, room_spawners in spawners.items():
+        tables["rooms"][room_index]["spawners"] = json.dumps({str(k): v for k, v in room_spawners.items()})
+
+    # --- Items on the ground ---
+    now = datetime.now(timezone.utc)
+    for template_id, (name, item_type, stats, flags) in enumerate(ITEM_KINDS, start=1):
+        tables["item_templates"].append({"id": template_id, "name": name, "type": item_type,
+                                         "description": f"It is {name}.", "stats": json.dumps(stats),
+                                         "flags": json.dumps(flags)})
+    for _ in range(scale.ground_items):
+        tables["item_instances"].append({
+            "id": str(uuid.UUID(int=rng.getrandbits(128))), "template_id": rng.randrange(len(ITEM_KINDS)) + 1,
+            "room_id": rng.randrange(scale.rooms) + 1, "instance_stats": "{}",
+            "last_moved_at": now - timedelta(seconds=rng.uniform(0, 7200)),
+        })
+
+    # --- Ambient scripts, one per area ---
+    for area_id in range(1, area_count + 1):
+        tables["ambient_scripts"].append({"area_id": area_id, "script_text": rng.choice(AMBIENT_LINES)})
+
+    # --- Players and their characters ---
+    for index in range(scale.players):
+        player_id = index + 1
+        tables["players"].append({"id": player_id, "username": f"synth{index:05d}", "hashed_password": "!",
+                                  "email": f"synth{index:05d}@example.invalid"})
+        tables["characters"].append({
+            "id": player_id, "player_id": player_id, "first_name": f"Synth{index}", "last_name": "Player",
+            "sex": "They/Them", "race_id": 1, "class_id": rng.randrange(10) + 1, "level": rng.randrange(1, 11),
+            "hp": 40.0, "max_hp": 50.0, "essence": 15.0, "max_essence": 20.0, "xp_pool": rng.uniform(0, 200),
+            "location_id": rng.randrange(scale.rooms) + 1, "coinage": 100,
+            "hunger": rng.randrange(20, 101), "thirst": rng.randrange(20, 101),
+        })
+        tables["character_stats"].append({"character_id": player_id, "might": 12, "vitality": 12, "agility": 12,
+                                          "intellect": 12, "aura": 12, "persona": 12})
+        tables["character_equipment"].append({"character_id": player_id, **{slot: None for slot in slots.ALL_SLOTS}})
+
+    return tables
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic Chrozal world and print its size.")
+    parser.add_argument("--rooms", type=int, default=WorldScale.rooms)
+    parser.add_argument("--mobs", type=int, default=WorldScale.mobs)
+    parser.add_argument("--players", type=int, default=WorldScale.players)
+    parser.add_argument("--items", type=int, default=WorldScale.ground_items)
+    parser.add_argument("--seed", type=int, default=WorldScale.seed)
+    args = parser.parse_args()
+    generated = generate(WorldScale(rooms=args.rooms, mobs=args.mobs, players=args.players,
+                                    ground_items=args.items, seed=args.seed))
+    for table, rows in generated.items():
+        print(f"{table:<22} {len(rows):>8}")